@@ -27,8 +27,9 @@ import os
 import sys
 import time
 import argparse
-import subprocess
 import serial
+from minitel import terminfo
+from minitel.terminfo import tput, seq_cup, seq_clear, seq_smso, seq_rmso, seq_el
 
 # CONFIG
 TERMNAME = os.environ.get('MINITEL_TERM', 'minitel')  # change if your terminfo entry has another name
@@ -37,17 +38,6 @@ BAUD = 4800
 COLS = 80
 LINES = 24
 
-# helper: get a terminfo control string via tput
-def tput(name, *args):
-    cmd = ['tput', '-T', TERMNAME, name]
-    if args:
-        cmd += [str(a) for a in args]
-    try:
-        out = subprocess.check_output(cmd)
-        return out
-    except subprocess.CalledProcessError:
-        return b''
-
 # low-level write to serial, ensure bytes
 def send(ser, b):
     if isinstance(b, str):
@@ -55,38 +45,6 @@ def send(ser, b):
     ser.write(b)
     ser.flush()
 
-# build commonly used sequences (fall back to simple ANSI-style if not in terminfo)
-def seq_cup(row, col):
-    s = tput('cup', row - 1, col - 1)
-    if s:
-        return s
-    # fallback: ANSI
-    return f"\x1b[{row};{col}H".encode()
-
-def seq_clear():
-    s = tput('clear')
-    if s:
-        return s
-    return b"\x1b[2J\x1b[H"
-
-def seq_smso():
-    s = tput('smso')
-    if s:
-        return s
-    return b"\x1b[7m"
-
-def seq_rmso():
-    s = tput('rmso')
-    if s:
-        return s
-    return b"\x1b[27m"
-
-def seq_el():
-    s = tput('el')
-    if s:
-        return s
-    return b"\x1b[K"
-
 # No real multi-level highlight on Minitel via text attributes.
 # Keep a helper for border-only standout.
 
@@ -215,6 +173,7 @@ def main():
     # set TERMNAME from arg or keep existing default
     if args.term:
         TERMNAME = args.term
+    terminfo.set_term(TERMNAME)
 
     # open serial
     ser = serial.Serial(
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark des écrans précompilés (minitel/assets.py).
+
+Pour chaque asset (art.txt, logos défilants, boot.txt, pages 2.txt à
+5.txt, mises en page menu et APOLLO), dans un processus neuf :
+  cold_ms   compilation, cache disque vide (terminfo, nettoyage, diff écran)
+  disk_ms   lecture du cache disque, processus suivant
+  memo_ms   appels suivants (mémoire)
+  bytes     taille du flot ; identical : gabarit rejoué == dessin direct
+
+Usage:
+  python bench/bench_assets.py --repeat 200
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+TEXTS = ['art.txt', 'logo.txt', '1.txt', 'boot.txt']
+PAGES = ['2.txt', '3.txt', '4.txt', '5.txt']
+
+
+def assets_of():
+    """(nom, fonction qui renvoie les octets de l'asset) pour ce processus."""
+    from minitel import assets
+    from minitel.supervisor import Context, build_parser
+    from minitel.scenes import boot, common, menu, apollo
+
+    args = build_parser('boot').parse_args([])
+    ctx = Context(None, args)
+    path = ctx.path
+
+    def layout(name, draw, module):
+        def run():
+            rec = assets.Recording(ctx)
+            assets.layout(rec, name, draw, [module.__file__])
+            return b''.join(data for _, data in rec.recording)
+        return run
+
+    out = []
+    out.append(('art.txt', lambda: assets.blob('art-art.txt', [path('art.txt')],
+                                               lambda: boot.art_bytes(path('art.txt')))))
+    for name in TEXTS[1:]:
+        p = path(name)
+        out.append((name, lambda p=p, name=name: b''.join(assets.frames(
+            'scroll-' + name, [p], lambda: common.scroll_frames(p, '')))))
+    for name in PAGES:
+        p = path(name)
+        out.append((name, lambda p=p: '\n'.join(assets.text_lines(p)).encode('latin-1')))
+    out.append(('layout-menu', layout('menu', menu.draw_layout, menu)))
+    out.append(('layout-apollo', layout('apollo', apollo.draw_layout, apollo)))
+    return out, ctx
+
+
+def direct(name, ctx):
+    """Même flot sans cache : dessin direct dans un écran vierge."""
+    from minitel import assets
+    from minitel.scenes import menu, apollo
+    draw = {'layout-menu': menu.draw_layout, 'layout-apollo': apollo.draw_layout}.get(name)
+    if draw is None:
+        return None
+    rec = assets.Recording(ctx)
+    draw(rec)
+    return b''.join(data for _, data in rec.recording)
+
+
+def child(repeat):
+    from minitel import assets
+    report = {}
+    items, ctx = assets_of()
+    for name, fn in items:
+        t0 = time.perf_counter()
+        data = fn()
+        first = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        memo = (time.perf_counter() - t0) * 1000 / repeat
+        row = {'first_ms': round(first, 3), 'memo_ms': round(memo, 4), 'bytes': len(data)}
+        ref = direct(name, ctx)
+        if ref is not None:
+            row['identical'] = ref == data
+        report[name] = row
+    report['_files'] = len(os.listdir(os.path.join(assets.CACHE_DIR, os.environ.get('MINITEL_TERM', 'minitel1b-80'))))
+    return report
+
+
+def run_child(cache, repeat):
+    env = dict(os.environ, MINITEL_ASSET_CACHE=cache, MINITEL_AUDIO='null')
+    out = subprocess.check_output([sys.executable, __file__, '--child', '--repeat', str(repeat)],
+                                  cwd=ROOT, env=env, text=True)
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Coût des écrans précompilés')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(child(args.repeat)))
+        return
+
+    cache = tempfile.mkdtemp()
+    cold = run_child(cache, args.repeat)
+    warm = run_child(cache, args.repeat)
+    files = cold.pop('_files'); warm.pop('_files')
+    report = {}
+    for name, row in cold.items():
+        report[name] = {'cold_ms': row['first_ms'], 'disk_ms': warm[name]['first_ms'],
+                        'memo_ms': warm[name]['memo_ms'], 'bytes': row['bytes']}
+        if 'identical' in row:
+            report[name]['identical'] = row['identical'] and warm[name]['identical']
+    print(json.dumps({'config': vars(args), 'cache_files': files, 'assets': report}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
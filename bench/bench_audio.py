@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark : démarrage / arrêt d'une boucle sonore, ancien LoopPlayer
+(un thread + un aplay par boucle) contre le moteur persistant de
+minitel/audio.py.
+
+Usage:
+  python bench/bench_audio.py --sink null --n 200
+  python bench/bench_audio.py --sink file:/tmp/out.wav
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import threading
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minitel import audio
+
+
+class LegacyLoopPlayer:
+    # copie conforme de l'ancien lecteur des scripts
+    def __init__(self, wav_path):
+        self.wav = wav_path
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+    def _run(self):
+        while not self.stop.is_set():
+            try:
+                p = subprocess.Popen(['aplay', '-q', self.wav])
+                while p.poll() is None and not self.stop.is_set():
+                    time.sleep(0.05)
+                if p.poll() is None and self.stop.is_set():
+                    p.terminate()
+            except FileNotFoundError:
+                break
+    def start(self): self.thread.start()
+    def stop_now(self):
+        self.stop.set()
+        self.thread.join(timeout=1.0)
+
+
+def measure(make, n, hold):
+    """Durées (ms) de start() et stop_now(), triées."""
+    starts, stops = [], []
+    for _ in range(n):
+        lp = make()
+        t = time.perf_counter(); lp.start(); starts.append(time.perf_counter() - t)
+        time.sleep(hold)
+        t = time.perf_counter(); lp.stop_now(); stops.append(time.perf_counter() - t)
+    return sorted(x * 1000 for x in starts), sorted(x * 1000 for x in stops)
+
+
+def report(name, starts, stops):
+    def pct(v, p):
+        return v[min(len(v) - 1, int(len(v) * p))]
+    print(f"{name:8s} start p50 {pct(starts, .5):8.3f} ms  p99 {pct(starts, .99):8.3f} ms   "
+          f"stop p50 {pct(stops, .5):8.3f} ms  p99 {pct(stops, .99):8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark audio')
+    parser.add_argument('--sink', default='null', help='aplay, null ou file:chemin')
+    parser.add_argument('--wav', default=os.path.join(ROOT, 'typing_long.wav'))
+    parser.add_argument('--n', type=int, default=100)
+    parser.add_argument('--hold', type=float, default=0.02, help='durée de chaque boucle (s)')
+    args = parser.parse_args()
+
+    audio.configure(args.sink)
+    t = time.perf_counter()
+    audio.preload([args.wav])
+    print(f"décodage {os.path.basename(args.wav)} : {(time.perf_counter() - t) * 1000:.1f} ms")
+    threads = threading.active_count()
+
+    report('moteur', *measure(lambda: audio.LoopPlayer(args.wav), args.n, args.hold))
+    print(f"threads créés pendant la mesure : {threading.active_count() - threads}")
+
+    if shutil.which('aplay'):
+        report('aplay', *measure(lambda: LegacyLoopPlayer(args.wav), min(args.n, 20), args.hold))
+    else:
+        print("aplay absent : ancien lecteur non mesuré")
+    audio.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark du codec minitel (minitel/codec.py) sur de longues réponses.
+
+Compare, en Mo/s de texte d'entrée :
+  legacy        ancien sanitize_text (remplacements successifs, NFKC,
+                générateur par caractère) + encode('latin-1')
+  sanitize      codec.sanitize (texte d'écran)
+  encode        'minitel' : texte -> octets, une seule table
+  encode_g2     'minitel-g2' (accents en séquences SS2)
+  incremental   encodeur incrémental, morceaux de --chunk caractères
+                (taille typique d'un token en flux)
+
+Usage:
+  python bench/bench_codec.py --kb 256 --repeat 20
+"""
+
+import os
+import sys
+import json
+import time
+import codecs
+import argparse
+import unicodedata
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minitel import codec
+
+SAMPLE = ("Rapport d'état : le réacteur « Bravo » fonctionne à 87 % — température "
+          "nominale, pression stable… L’équipe ‘Delta’ a signalé une anomalie près "
+          "du sas 3. Status report: all systems nominal; crew of 12 aboard.\n"
+          "Coût estimé : 1 250 £ ½ tonne d'œufs — naïveté ﬁnale.\n")
+
+
+def legacy(s):
+    for k, v in codec.TRANSLIT_MAP.items():
+        s = s.replace(k, v)
+    s = unicodedata.normalize('NFKC', s)
+    s = ''.join(ch if ch in '\r\n\t' or 32 <= ord(ch) <= 255 else '?' for ch in s)
+    return s.encode('latin-1', errors='replace')
+
+
+def incremental(s, chunk):
+    enc = codecs.getincrementalencoder('minitel')()
+    out = [enc.encode(s[i:i + chunk]) for i in range(0, len(s), chunk)]
+    out.append(enc.encode('', True))
+    return b''.join(out)
+
+
+def rate(fn, text, repeat):
+    fn(text)   # tables remplies
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    dt = (time.perf_counter() - t0) / repeat
+    return round(len(text) / dt / 1e6, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Débit du codec minitel')
+    parser.add_argument('--kb', type=int, default=256, help='taille du texte (Ko)')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--chunk', type=int, default=6)
+    args = parser.parse_args()
+
+    text = (SAMPLE * (args.kb * 1024 // len(SAMPLE) + 1))[:args.kb * 1024]
+    ascii_text = text.encode('ascii', 'ignore').decode()
+    report = {}
+    for label, t in (('mixed', text), ('ascii', ascii_text)):
+        report[label] = {
+            'legacy': rate(legacy, t, args.repeat),
+            'sanitize': rate(codec.sanitize, t, args.repeat),
+            'encode': rate(lambda s: s.encode('minitel'), t, args.repeat),
+            'encode_g2': rate(lambda s: s.encode('minitel-g2'), t, args.repeat),
+            'incremental': rate(lambda s: incremental(s, args.chunk), t, args.repeat),
+        }
+    check = incremental(text, args.chunk) == text.encode('minitel')
+    print(json.dumps({'config': vars(args), 'mb_per_s': report,
+                      'incremental_matches_oneshot': check}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark des réponses longues : découpe par le modèle contre pages locales.
+
+Avant, prompt.txt demandait au modèle de couper ses réponses à 15 lignes et
+d'afficher "CONTINUE? (Y/N)" : chaque page suivante était une nouvelle
+requête qui renvoyait tout l'historique. Maintenant la réponse arrive
+entière et APOLLO la découpe en pages (minitel/pager.py).
+
+Un modèle scripté rend, pour chacune des --questions questions, une réponse
+de --lines lignes (découpée en tranches de 15 si le prompt contient encore
+l'ancienne règle, le joueur répondant Y). ChatCore est le vrai (lore,
+historique borné, résumés), seul le client est remplacé. Compare :
+  before   ancien prompt : 15 lignes puis CONTINUE? (Y/N)
+  after    prompt.txt actuel : réponse complète, pages locales
+Par réponse : requêtes, résumés, tokens d'entrée (résumés compris) et de
+sortie, attente estimée du modèle (--latency par requête + sortie au débit
+--rate), et la taille des règles envoyées à chaque requête.
+
+Usage:
+  python bench/bench_continue.py --questions 10 --lines 40
+"""
+
+import io
+import os
+import sys
+import json
+import tempfile
+import argparse
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minitel import backends
+from minitel.chat import ChatCore, SUMMARY_PROMPT, count_tokens, message_tokens
+
+PAGE = 15
+CONTINUE = 'CONTINUE? (Y/N)'
+NEW_RULE = ("The terminal wraps and pages long replies itself: always give the complete "
+            "answer in one message, never split it or ask to continue.")
+OLD_RULES = ("Use an 80-column character encoding.\n"
+             "Each response should be formatted to **never exceed 15 lines**.\n"
+             "If a message HAD to exceeds this length, it must be split. Display the first "
+             "15 lines, then prompt the user with **\"CONTINUE? (Y/N)\"** to display the next part.")
+LINE = "{n:02d} SECTOR {n:02d} ........ SEALED, LIFE SUPPORT NOMINAL, LAST REPORT BEFORE EMP"
+
+
+class Scripted:
+    """Client factice : réponses longues, découpées si le prompt le demande."""
+
+    def __init__(self, lines):
+        self.lines = [LINE.format(n=i + 1) for i in range(lines)]
+        self.stats = {'requests': 0, 'folds': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model, messages, **kw):
+        if messages[0]['content'] == SUMMARY_PROMPT:
+            self.stats['folds'] += 1
+            text = "Players asked for sector status reports; all sectors sealed."
+        else:
+            self.stats['requests'] += 1
+            lines = self.lines
+            if CONTINUE in messages[0]['content']:
+                part = self._part(messages)
+                lines = lines[part * PAGE:(part + 1) * PAGE]
+                if (part + 1) * PAGE < len(self.lines):
+                    lines = lines + [CONTINUE]
+            text = '\n'.join(lines)
+        self.stats['prompt_tokens'] += message_tokens(messages)
+        self.stats['completion_tokens'] += count_tokens(text)
+        message = SimpleNamespace(role='assistant', content=text)
+        return SimpleNamespace(model=model, usage=None,
+                               choices=[SimpleNamespace(message=message, finish_reason='stop')])
+
+    @staticmethod
+    def _part(messages):
+        # Y suivant une page qui finit par CONTINUE : page suivante
+        turns = [m for m in messages if m['role'] != 'system']
+        part, i = 0, len(turns) - 1
+        while (i >= 2 and turns[i]['content'] == 'Y'
+               and turns[i - 1]['content'].endswith(CONTINUE)):
+            part, i = part + 1, i - 2
+        return part
+
+
+async def session(prompt_file, args):
+    client = Scripted(args.lines)
+    chat = ChatCore(model='bench', prompt_file=prompt_file, client=client,
+                    backend=backends.MockBackend(0, 1, 1))
+    for q in range(args.questions):
+        reply = await chat.ask(f"Status report for all sectors, part {q + 1}?")
+        while reply.endswith(CONTINUE):
+            reply = await chat.ask('Y')
+        if chat.folding is not None:
+            await chat.folding
+    stats = client.stats
+    model_s = stats['requests'] * args.latency + stats['completion_tokens'] / args.rate
+    per = lambda v: round(v / args.questions, 1)
+    rules = chat.index.core if chat.index is not None else chat.system
+    return {'requests': per(stats['requests']), 'folds': per(stats['folds']),
+            'prompt_tokens': per(stats['prompt_tokens']),
+            'completion_tokens': per(stats['completion_tokens']),
+            'model_wait_s': per(model_s), 'core_prompt_tokens': count_tokens(rules)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Réponses longues : CONTINUE? (Y/N) contre pages locales')
+    parser.add_argument('--questions', type=int, default=10)
+    parser.add_argument('--lines', type=int, default=40, help='lignes par réponse')
+    parser.add_argument('--latency', type=float, default=0.8, help='secondes avant le premier token')
+    parser.add_argument('--rate', type=float, default=40.0, help='tokens par seconde')
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, 'prompt.txt'), encoding='utf-8') as f:
+        prompt = f.read()
+    if NEW_RULE not in prompt:
+        raise SystemExit("prompt.txt modifie : regle de pagination introuvable")
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        before = os.path.join(tmp, 'prompt-before.txt')
+        with open(before, 'w', encoding='utf-8') as f:
+            f.write(prompt.replace(NEW_RULE, OLD_RULES))
+        with contextlib.redirect_stdout(io.StringIO()):   # journaux de ChatCore
+            report['before'] = asyncio.run(session(before, args))
+            report['after'] = asyncio.run(session(os.path.join(ROOT, 'prompt.txt'), args))
+    print(json.dumps({'config': vars(args), 'per_answer': report}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Benchmark de bout en bout : le vrai boot.py contre un faux Minitel (pty) et
+un faux serveur OpenAI local (bench/fake_openai.py).
+
+Le programme ouvre l'esclave du pty comme s'il s'agissait de /dev/ttyUSB0 ;
+le banc joue le Minitel côté maître : il compte les octets reçus, attend
+les écrans et tape les touches. Le débit de la ligne est celui que le
+programme s'impose (--baud, minitel/serial_writer.py).
+
+Parcours par débit : boot -> menu -> 2.txt page à page -> menu -> boot
+d'APOLLO -> question -> /exit -> menu. Mesures :
+  scenes    durée et octets reçus de chaque étape
+  echo_ms   délai touche -> écho sur la ligne de saisie d'APOLLO
+  ttfc_ms   ENVOI -> premier mot de la réponse à l'écran
+Résultat en JSON (stdout ou --out) pour comparer deux versions.
+
+--backend mock remplace le faux serveur par le fournisseur factice intégré
+(minitel/backends.py, mêmes --latency / --rate / --words) : parcours
+complet sans réseau.
+
+Usage:
+  python bench/bench_e2e.py --bauds 1200,4800,9600 --out bench.json
+  python bench/bench_e2e.py --bauds 4800 --stream --latency 0.8 --rate 30
+  python bench/bench_e2e.py --bauds 9600 --backend mock
+"""
+
+import os
+import re
+import sys
+import tty
+import json
+import time
+import select
+import signal
+import argparse
+import platform
+import threading
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from fake_openai import FakeOpenAI, FIRST_WORD
+
+QUERY = 'status report'
+TRANSITION = re.compile(r'\[SUPERVISEUR\] (\S+) -> (\S+) : premier octet (\d+) ms')
+
+
+class FakeMinitel:
+    """Côté maître d'un pty : ce que le programme écrit, ce que l'on tape."""
+
+    def __init__(self):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.path = os.ttyname(self.slave)
+        self.buf = bytearray()
+        self.origin = 0   # début de l'étape en cours
+        self.mark = 0     # début de la recherche des motifs
+        self.last_rx = time.monotonic()
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+    def _read(self, timeout):
+        r, _, _ = select.select([self.master], [], [], max(0.0, timeout))
+        if not r:
+            return False
+        try:
+            data = os.read(self.master, 4096)
+        except OSError:
+            return False
+        self.buf += data
+        self.last_rx = time.monotonic()
+        return True
+
+    def start(self):
+        """Début d'une étape : on ne cherche que dans ce qui arrive ensuite."""
+        self.origin = self.mark = len(self.buf)
+        return time.monotonic()
+
+    def seek(self):
+        """Même étape, mais les motifs déjà vus ne comptent plus (page suivante)."""
+        self.mark = len(self.buf)
+
+    def received(self):
+        return len(self.buf) - self.origin
+
+    def key(self, data):
+        os.write(self.master, data)
+
+    def wait_for(self, *patterns, timeout=60.0):
+        """Attend l'un des motifs, renvoie celui vu (None si délai dépassé).
+
+        Le motif None attend simplement un premier octet (renvoie True).
+        """
+        end = time.monotonic() + timeout
+        while True:
+            seen = bytes(self.buf[self.mark:])
+            for p in patterns:
+                if p is None and seen:
+                    return True
+                if p is not None and p in seen:
+                    return p
+            if time.monotonic() >= end:
+                return None
+            self._read(end - time.monotonic())
+
+    def wait_quiet(self, idle, timeout=60.0):
+        """Attend `idle` secondes sans octet, renvoie l'heure du dernier reçu."""
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            if not self._read(min(idle, end - time.monotonic())) and \
+                    time.monotonic() - self.last_rx >= idle:
+                break
+        return self.last_rx
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run_baud(baud, server, args):
+    term = FakeMinitel()
+    env = dict(os.environ, OPENAI_BASE_URL=server.base_url, OPENAI_API_KEY='bench',
+               MOCK_LATENCY=str(args.latency), MOCK_RATE=str(args.rate), MOCK_WORDS=str(args.words),
+               MINITEL_AUDIO='null', PYTHONUNBUFFERED='1')
+    cmd = [sys.executable, os.path.join(ROOT, 'boot.py'), '--device', term.path,
+           '--baud', str(baud), '--term', args.term, '--no-cache', '--no-transcript',
+           '--backend', args.backend]
+    if args.stream:
+        cmd.append('--stream')
+    log = []
+    t_launch = time.monotonic()
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True)
+    threading.Thread(target=lambda: log.extend(proc.stdout), daemon=True).start()
+
+    scenes = {}
+    result = {'baud': baud, 'scenes': scenes}
+
+    def step(name, keys, *patterns, quiet=True, t0=None):
+        # sans motif : premier octet puis silence (écran repeint par différence,
+        # un texte déjà présent au même endroit ne repasse pas sur la ligne)
+        t0 = t0 if t0 is not None else term.start()
+        if keys:
+            term.key(keys)
+        if not term.wait_for(*(patterns or (None,)), timeout=args.timeout):
+            raise TimeoutError(f"{name}: {patterns or 'aucun octet'} jamais reçu")
+        t_end = term.wait_quiet(args.idle, args.timeout) if quiet else time.monotonic()
+        scenes[name] = {'seconds': round(t_end - t0, 3), 'bytes': term.received()}
+
+    try:
+        term.start()
+        step('boot_prompt', None, b'BOOT ? (Y/N)', quiet=False, t0=t_launch)
+        step('boot_to_menu', b'Y\r', b'[ENTER QUERY]')
+
+        # 2.txt page à page, jusqu'au pied de page [FIN...]
+        t0 = term.start()
+        term.key(b'2\r')
+        pages = 1
+        while True:
+            if not term.wait_for(None, timeout=args.timeout):
+                raise TimeoutError('2.txt : page jamais reçue')
+            term.wait_quiet(args.idle, args.timeout)
+            if term.wait_for(b'FIN.', timeout=0) is not None:
+                break
+            pages += 1
+            term.seek()
+            term.key(b'\r')
+        scenes['page_2txt'] = {'seconds': round(term.last_rx - t0, 3), 'bytes': term.received(),
+                               'pages': pages}
+        step('back_to_menu', b'\r')
+
+        step('apollo_boot', b'1\r', b'LAUNCH ?', quiet=False)
+        step('apollo_launch', b'y\r', b'[ENTER QUERY]')
+
+        # écho des touches sur la ligne de saisie
+        echo = []
+        for ch in QUERY.encode():
+            term.start()
+            t = time.monotonic()
+            term.key(bytes([ch]))
+            # un espace sur une case vide n'est qu'un déplacement du curseur
+            if not term.wait_for(None, timeout=5.0):
+                raise TimeoutError('écho jamais reçu')
+            echo.append((time.monotonic() - t) * 1000)
+            term.wait_quiet(0.05, 1.0)
+        result['echo_ms'] = {'p50': round(percentile(echo, 0.5), 2),
+                             'p95': round(percentile(echo, 0.95), 2),
+                             'max': round(max(echo), 2)}
+
+        # question : premier mot, puis ENVOI tant qu'une page suit
+        # (ENVOI sur une ligne vide ne renvoie rien : réponse terminée)
+        t0 = term.start()
+        term.key(b'\r')
+        first = b'[MOCK]' if args.backend == 'mock' else FIRST_WORD.encode()
+        if term.wait_for(first, timeout=args.timeout) is None:
+            raise TimeoutError('réponse jamais reçue')
+        result['ttfc_ms'] = round((time.monotonic() - t0) * 1000, 1)
+        while True:
+            t_end = term.wait_quiet(args.idle, args.timeout)
+            term.seek()
+            term.key(b'\r')
+            if not term.wait_for(None, timeout=args.idle * 2):
+                break
+        scenes['answer'] = {'seconds': round(t_end - t0, 3), 'bytes': term.received()}
+
+        step('exit_to_menu', b'/exit\r')
+    except TimeoutError as e:
+        result['error'] = str(e)
+    finally:
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        term.close()
+
+    result['transitions_ms'] = [
+        {'from': m.group(1), 'to': m.group(2), 'first_byte': int(m.group(3))}
+        for m in map(TRANSITION.search, log) if m]
+    result['bytes_total'] = len(term.buf)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de bout en bout (pty + faux OpenAI)')
+    parser.add_argument('--bauds', default='1200,4800,9600')
+    parser.add_argument('--term', default='minitel1b-80')
+    parser.add_argument('--stream', action='store_true', help='lance APOLLO avec --stream')
+    parser.add_argument('--backend', default='openai', choices=('openai', 'mock'),
+                        help='openai : faux serveur HTTP ; mock : fournisseur factice intégré')
+    parser.add_argument('--latency', type=float, default=0.5, help='faux serveur : s avant le 1er token')
+    parser.add_argument('--rate', type=float, default=40.0, help='faux serveur : tokens/s')
+    parser.add_argument('--words', type=int, default=60, help='faux serveur : mots par réponse')
+    parser.add_argument('--idle', type=float, default=0.6, help='silence qui termine un écran (s)')
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--out', default=None, help='fichier JSON (sinon stdout)')
+    args = parser.parse_args()
+
+    server = FakeOpenAI(0, args.latency, args.rate, args.words).start()
+    runs = []
+    for baud in (int(b) for b in args.bauds.split(',')):
+        print(f"... {baud} bauds", file=sys.stderr)
+        runs.append(run_baud(baud, server, args))
+    server.shutdown()
+
+    try:
+        rev = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        rev = None
+    report = {
+        'revision': rev,
+        'python': platform.python_version(),
+        'config': {'backend': args.backend, 'stream': args.stream, 'latency': args.latency, 'rate': args.rate,
+                   'words': args.words, 'idle': args.idle, 'query': QUERY},
+        'api': server.stats(),
+        'runs': runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la relance vers un modèle de secours (ChatCore.hedge_model).
+
+Un faux serveur OpenAI (bench/fake_openai.py) répond après --latency
+secondes, et une requête sur --tail-rate attend --tail secondes de plus
+(latence de queue du fournisseur). --questions questions passent par
+ChatCore.ask_stream, sans puis avec relance après --hedge-after secondes.
+Mesure le délai jusqu'au premier token :
+  p50_ms / p95_ms / max_ms
+  hedge_rate       part des questions relancées
+  rescued          relances gagnées par le modèle de secours
+  extra_requests   requêtes en plus pour le fournisseur
+
+Usage:
+  python bench/bench_hedge.py --questions 60 --tail 2 --tail-rate 0.1
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from openai import AsyncOpenAI
+from fake_openai import FakeOpenAI
+from minitel.chat import ChatCore
+
+
+def quantile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def session(server, args, hedge_model):
+    client = AsyncOpenAI(base_url=server.base_url, api_key='bench', max_retries=0)
+    chat = ChatCore(model='primary', prompt_file=None, client=client,
+                    hedge_model=hedge_model, hedge_after=args.hedge_after)
+    before = server.requests
+    ttft = []
+    for i in range(args.questions):
+        t0 = time.perf_counter()
+        first = None
+        async for _ in chat.ask_stream(f"Question {i} : etat du pont ?"):
+            if first is None:
+                first = time.perf_counter() - t0
+        ttft.append(first)
+        chat.turns.clear()   # prompts de taille constante
+    await client.close()
+    return {'p50_ms': round(quantile(ttft, 0.5) * 1000),
+            'p95_ms': round(quantile(ttft, 0.95) * 1000),
+            'max_ms': round(max(ttft) * 1000),
+            'hedge_rate': round(chat.hedged / chat.requests, 3),
+            'rescued': chat.rescued,
+            'extra_requests': server.requests - before - args.questions}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Premier token avec et sans relance')
+    parser.add_argument('--questions', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--tail', type=float, default=2.0)
+    parser.add_argument('--tail-rate', type=float, default=0.1)
+    parser.add_argument('--hedge-after', type=float, default=0.4)
+    args = parser.parse_args()
+
+    report = {}
+    for label, hedge_model in (('no_hedge', None), ('hedge', 'fallback')):
+        # même graine : même suite de tirages (requêtes lentes)
+        server = FakeOpenAI(0, args.latency, 200.0, 8, args.tail, args.tail_rate).start()
+        with contextlib.redirect_stdout(io.StringIO()):   # journaux de ChatCore
+            report[label] = asyncio.run(session(server, args, hedge_model))
+        server.shutdown()
+    print(json.dumps({'config': vars(args), 'ttft': report}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark du hub : mémoire et CPU en fonction du nombre de terminaux.
+
+Lance hub.py avec N pty (écran de départ APOLLO) contre le faux serveur
+OpenAI, se connecte à chaque pty comme un terminal, puis mesure :
+  rss_mb        mémoire résidente du hub, terminaux connectés
+  idle_cpu_pct  CPU du hub pendant --idle-time secondes sans frappe
+  answered_s    délai jusqu'au premier mot de la dernière réponse quand les
+                N terminaux posent leur question en même temps (limité par
+                --concurrency)
+et, pour comparaison, la mémoire d'un apollo-gpt.py seul (un processus par
+terminal avant le hub).
+
+Usage:
+  python bench/bench_hub.py --terminals 1,2,4,8 --concurrency 4
+"""
+
+import os
+import re
+import sys
+import tty
+import json
+import time
+import signal
+import argparse
+import threading
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from fake_openai import FakeOpenAI, FIRST_WORD
+from bench_e2e import FakeMinitel
+
+PTY_LINE = re.compile(r'\[HUB\] (pty\d+) : (/dev/pts/\d+)')
+CLK = os.sysconf('SC_CLK_TCK')
+
+
+class PtyClient(FakeMinitel):
+    """Terminal branché sur l'esclave d'un pty ouvert par le hub."""
+
+    def __init__(self, path):
+        self.master = os.open(path, os.O_RDWR | os.O_NOCTTY)
+        tty.setraw(self.master)
+        self.slave = None
+        self.path = path
+        self.buf = bytearray()
+        self.origin = self.mark = 0
+        self.last_rx = time.monotonic()
+
+    def close(self):
+        os.close(self.master)
+
+
+def rss_mb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def cpu_seconds(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLK
+
+
+def launch(cmd, env):
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True)
+    log = []
+    threading.Thread(target=lambda: log.extend(proc.stdout), daemon=True).start()
+    return proc, log
+
+
+def stop(proc):
+    proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def run_hub(n, server, env, args):
+    cmd = [sys.executable, os.path.join(ROOT, 'hub.py'), '--pty', str(n), '--start', 'apollo',
+           '--baud', str(args.baud), '--no-cache', '--no-transcript', '--concurrency', str(args.concurrency)]
+    proc, log = launch(cmd, env)
+    clients = []
+    try:
+        deadline = time.monotonic() + 30
+        while len(clients) < n and time.monotonic() < deadline:
+            # lignes des threads du hub parfois entremêlées : on cherche partout
+            paths = [m.group(2) for m in PTY_LINE.finditer(''.join(log))]
+            for path in paths[len(clients):]:
+                clients.append(PtyClient(path))
+            time.sleep(0.05)
+        if len(clients) < n:
+            raise RuntimeError('pty du hub introuvables :\n' + ''.join(log))
+        for c in clients:
+            if c.wait_for(b'[ENTER QUERY]', timeout=args.timeout) is None:
+                raise TimeoutError(f"{c.path} : APOLLO jamais affiché")
+            c.wait_quiet(0.5, args.timeout)
+
+        rss = rss_mb(proc.pid)
+        cpu0, t0 = cpu_seconds(proc.pid), time.monotonic()
+        time.sleep(args.idle_time)
+        idle = (cpu_seconds(proc.pid) - cpu0) / (time.monotonic() - t0) * 100
+
+        # toutes les questions en même temps
+        t_ask = time.monotonic()
+        for c in clients:
+            c.start()
+            c.key(b'status\r')
+        for c in clients:
+            if c.wait_for(FIRST_WORD.encode(), timeout=args.timeout) is None:
+                raise TimeoutError(f"{c.path} : réponse jamais reçue")
+        return {'terminals': n, 'rss_mb': round(rss, 1),
+                'idle_cpu_pct': round(idle, 2),
+                'answered_s': round(time.monotonic() - t_ask, 2)}
+    finally:
+        stop(proc)
+        for c in clients:
+            c.close()
+
+
+def single_rss(env, args):
+    """Mémoire d'un apollo-gpt.py (un terminal, un processus)."""
+    term = FakeMinitel()
+    cmd = [sys.executable, os.path.join(ROOT, 'apollo-gpt.py'), '--device', term.path,
+           '--baud', str(args.baud), '--no-cache', '--no-transcript']
+    proc, _ = launch(cmd, env)
+    try:
+        term.wait_for(b'[ENTER QUERY]', timeout=args.timeout)
+        term.wait_quiet(0.5, args.timeout)
+        return round(rss_mb(proc.pid), 1)
+    finally:
+        stop(proc)
+        term.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mémoire et CPU du hub selon le nombre de terminaux')
+    parser.add_argument('--terminals', default='1,2,4,8')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--baud', type=int, default=9600)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--rate', type=float, default=40.0)
+    parser.add_argument('--idle-time', type=float, default=5.0)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    args = parser.parse_args()
+
+    server = FakeOpenAI(0, args.latency, args.rate, 40).start()
+    env = dict(os.environ, OPENAI_BASE_URL=server.base_url, OPENAI_API_KEY='bench',
+               MINITEL_AUDIO='null', PYTHONUNBUFFERED='1')
+    runs = []
+    for n in (int(x) for x in args.terminals.split(',')):
+        print(f"... {n} terminaux", file=sys.stderr)
+        runs.append(run_hub(n, server, env, args))
+    single = single_rss(env, args)
+    server.shutdown()
+
+    base = runs[0]
+    for r in runs[1:]:
+        extra = r['terminals'] - base['terminals']
+        r['rss_per_extra_terminal_mb'] = round((r['rss_mb'] - base['rss_mb']) / extra, 2)
+    print(json.dumps({'config': vars(args), 'api': server.stats(),
+                      'one_process_per_terminal_rss_mb': single, 'hub': runs}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark du clavier au repos : CPU et réveils quand personne ne tape.
+
+Lance boot.py sur un faux Minitel, attend l'invite BOOT ? puis le menu,
+et apollo-gpt.py (APOLLO), puis mesure pendant --seconds secondes :
+  cpu_pct      CPU du processus (tous threads)
+  wakeups_s    changements de contexte par seconde (tous threads)
+
+Usage:
+  python bench/bench_idle.py --seconds 10
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from fake_openai import FakeOpenAI
+from bench_e2e import FakeMinitel
+from bench_hub import cpu_seconds, launch, stop
+
+
+def switches(pid):
+    total = 0
+    for path in glob.glob(f'/proc/{pid}/task/*/status'):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(('voluntary_ctxt_switches', 'nonvoluntary_ctxt_switches')):
+                        total += int(line.split()[1])
+        except OSError:
+            pass
+    return total
+
+
+def idle(pid, seconds):
+    cpu0, sw0, t0 = cpu_seconds(pid), switches(pid), time.monotonic()
+    time.sleep(seconds)
+    dt = time.monotonic() - t0
+    return {'cpu_pct': round((cpu_seconds(pid) - cpu0) / dt * 100, 2),
+            'wakeups_s': round((switches(pid) - sw0) / dt, 1)}
+
+
+def screen(script, waits, env, args):
+    term = FakeMinitel()
+    cmd = [sys.executable, os.path.join(ROOT, script), '--device', term.path,
+           '--baud', str(args.baud), '--no-cache', '--no-transcript']
+    proc, log = launch(cmd, env)
+    out = {}
+    try:
+        for name, marker, keys in waits:
+            if term.wait_for(marker, timeout=args.timeout) is None:
+                raise TimeoutError(f"{script} : {marker!r} jamais affiché\n" + ''.join(log))
+            term.wait_quiet(0.5, args.timeout)
+            out[name] = idle(proc.pid, args.seconds)
+            if keys:
+                term.start()
+                term.key(keys)
+    finally:
+        stop(proc)
+        term.close()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CPU au repos des écrans en attente de frappe')
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--baud', type=int, default=9600)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    server = FakeOpenAI(0, 0.1, 200.0, 10).start()
+    env = dict(os.environ, OPENAI_BASE_URL=server.base_url, OPENAI_API_KEY='bench',
+               MINITEL_AUDIO='null', PYTHONUNBUFFERED='1')
+    report = screen('boot.py', [('boot_prompt', b'BOOT ?', b'Y\r'),
+                                ('menu', b'[ENTER QUERY]', None)], env, args)
+    report.update(screen('apollo-gpt.py', [('apollo', b'[ENTER QUERY]', None)], env, args))
+    server.shutdown()
+    print(json.dumps({'config': vars(args), 'idle': report}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
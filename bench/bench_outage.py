@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark d'une panne de l'API : échéance, disjoncteur, réponses hors ligne.
+
+Un faux serveur OpenAI (bench/fake_openai.py) passe par trois phases de
+--questions questions chacune : sain, muet (accepte la connexion mais ne
+répond pas) puis de nouveau sain après le délai du disjoncteur. Compare :
+  before   ancien ChatCore : pas d'échéance ni de disjoncteur (une question
+           muette est comptée à --cap secondes, le plafond du benchmark)
+  after    échéance --deadline, relances, disjoncteur, hors ligne
+Par phase : délai de réponse p50 / max (ms), réponses hors ligne, requêtes
+reçues par le serveur. Affiche aussi les métriques du disjoncteur.
+
+Usage:
+  python bench/bench_outage.py --questions 10 --deadline 2
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from openai import AsyncOpenAI
+from fake_openai import FakeOpenAI
+from minitel import breaker, tracing
+from minitel.chat import ChatCore
+from minitel.offline import OfflineReplies
+
+HUNG = 3600.0   # latence du serveur muet
+
+
+async def phase(chat, server, args):
+    before = server.requests
+    served = chat.offline.served
+    times = []
+    for i in range(args.questions):
+        t0 = time.perf_counter()
+        try:
+            await asyncio.wait_for(chat.ask(f"Question {i} ?"), args.cap)
+        except asyncio.TimeoutError:
+            pass
+        times.append(time.perf_counter() - t0)
+        chat.turns.clear()
+    times.sort()
+    return {'p50_ms': round(times[len(times) // 2] * 1000), 'max_ms': round(times[-1] * 1000),
+            'offline': chat.offline.served - served, 'requests': server.requests - before}
+
+
+async def run(server, args, chat_kw):
+    client = AsyncOpenAI(base_url=server.base_url, api_key='bench', max_retries=0)
+    chat = ChatCore(model='primary', prompt_file=None, client=client,
+                    offline=OfflineReplies(os.path.join(os.path.dirname(HERE), 'offline.txt')),
+                    **chat_kw)
+    report = {}
+    server.latency = 0.05
+    report['healthy'] = await phase(chat, server, args)
+    server.latency = HUNG
+    report['outage'] = await phase(chat, server, args)
+    server.latency = 0.05
+    await asyncio.sleep(args.cooldown)
+    report['recovered'] = await phase(chat, server, args)
+    await client.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Panne de l'API : avant / après")
+    parser.add_argument('--questions', type=int, default=10)
+    parser.add_argument('--deadline', type=float, default=2.0)
+    parser.add_argument('--cooldown', type=float, default=2.0)
+    parser.add_argument('--cap', type=float, default=10.0, help='plafond par question (avant)')
+    args = parser.parse_args()
+
+    tracing.enabled = True   # métriques en mémoire, sans fichier ni serveur
+    server = FakeOpenAI(0, 0.05, 500.0, 8).start()
+    report = {}
+    with contextlib.redirect_stdout(io.StringIO()):   # journaux de ChatCore
+        report['before'] = asyncio.run(run(server, args, {'deadline': float('inf'), 'attempts': 1}))
+        shared = breaker.shared(cooldown=args.cooldown)
+        report['after'] = asyncio.run(run(server, args, {'deadline': args.deadline,
+                                                          'breaker': shared}))
+    server.shutdown()
+    metrics = [line for line in tracing.metrics_text().splitlines()
+               if line.startswith('minitel_breaker')]
+    print(json.dumps({'config': vars(args), 'phases': report, 'metrics': metrics}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
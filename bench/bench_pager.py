@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la pagination (minitel/pager.py) sur les documents du menu.
+
+Parcours : toutes les pages en avant, retour à la première (RETOUR), puis
+de nouveau en avant. Pour chaque document :
+  bytes_forward   octets du premier passage (diff ligne à ligne)
+  back_before     octets moyens pour revoir la page précédente avant le
+                  pager (pas de RETOUR) : rouvrir le document, avancer
+  back_after      octets moyens d'un RETOUR
+  render_us_miss  temps moyen d'un changement de page calculé
+  render_us_hit   temps moyen d'un changement de page rejoué du cache
+  same_frames     trames du cache identiques à un calcul sans cache
+
+Usage:
+  python bench/bench_pager.py
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minitel.pager import Pager
+from minitel.screen import Screen
+from minitel.terminfo import COLS
+from minitel.text import read_text_lines, safe_line
+
+
+def walk(pager, screen, order, cached=True):
+    out, times = [], []
+    for n in order:
+        if not cached:
+            pager.cache.clear()
+        hits = pager.hits
+        t0 = time.perf_counter()
+        frames = pager.render(screen, n)
+        times.append((time.perf_counter() - t0, pager.hits > hits))
+        out.append(b''.join(frames))
+    return out, times
+
+
+def fresh(lines):
+    screen = Screen()
+    screen.flush()   # fenêtre connue, vide
+    return Pager(lines, 4, 23, 1, COLS), screen
+
+
+def run(lines):
+    pager, screen = fresh(lines)
+    last = len(pager) - 1
+    forward = list(range(len(pager)))
+    back = list(range(last - 1, -1, -1))
+    order = forward + back + forward[1:]
+    frames, times = walk(pager, screen, order)
+    ref, _ = walk(*fresh(lines), order, cached=False)
+    # avant : revoir la page k-1 depuis la page k = rouvrir, pages 0..k-1
+    sizes = [len(f) for f in frames[:len(forward)]]
+    before = [sum(sizes[:k]) for k in range(1, len(sizes))]
+
+    miss = [t for t, hit in times if not hit]
+    hit = [t for t, h in times if h]
+    return {'pages': len(pager),
+            'bytes_forward': sum(len(f) for f in frames[:len(forward)]),
+            'back_before': round(sum(before) / len(before)) if before else None,
+            'back_after': round(sum(len(f) for f in frames[len(forward):len(forward) + len(back)])
+                                / len(back)) if back else None,
+            'cache_hits': pager.hits,
+            'render_us_miss': round(sum(miss) / len(miss) * 1e6, 1) if miss else None,
+            'render_us_hit': round(sum(hit) / len(hit) * 1e6, 1) if hit else None,
+            'same_frames': frames == ref}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pagination : octets et cache')
+    parser.add_argument('--files', nargs='*', default=['2.txt', '3.txt', '4.txt', '5.txt', '6.txt'])
+    args = parser.parse_args()
+
+    docs = {name: [safe_line(l) for l in read_text_lines(os.path.join(ROOT, name))]
+            for name in args.files if os.path.exists(os.path.join(ROOT, name))}
+    docs['long'] = [f"LIGNE {i:03d} " + 'x' * (i % 60) for i in range(400)]
+    run(docs['long'])   # séquences terminfo en cache (repli tput)
+    print(json.dumps({'docs': {name: run(lines) for name, lines in docs.items()}}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark du défilement (minitel/scroll.py) : octets par ligne défilée.
+
+Pour logo.txt, logo-weyland.txt, boot.txt (1.txt s'il existe) et un long
+texte, compare l'ancien défilement (dl1 : cup + dl1 + cup + el par ligne)
+à la méthode choisie pour le terminal (--term), et vérifie sur un petit
+émulateur de terminal que l'écran final est identique.
+
+Usage:
+  python bench/bench_scroll.py --term minitel1b-80
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minitel import codec, terminfo
+from minitel.text import read_text_lines, safe_line
+
+ROWS, COLS = terminfo.LINES, terminfo.COLS
+CSI = re.compile(rb'\x1b\[([0-9;]*)([A-Za-z])')
+
+
+class Vt:
+    """Émulateur minimal : texte, CR, LF, cup, el, dl1, cuu, csr, ind, nel."""
+
+    def __init__(self):
+        self.grid = [[' '] * COLS for _ in range(ROWS)]
+        self.r = self.c = 0
+        self.top, self.bottom = 0, ROWS - 1
+
+    def lines(self):
+        return [''.join(row).rstrip() for row in self.grid]
+
+    def _scroll(self):
+        del self.grid[self.top]
+        self.grid.insert(self.bottom, [' '] * COLS)
+
+    def _down(self):
+        if self.r == self.bottom:
+            self._scroll()
+        elif self.r < ROWS - 1:
+            self.r += 1
+
+    def feed(self, data):
+        i = 0
+        while i < len(data):
+            b = data[i]
+            if b == 0x1b:
+                m = CSI.match(data, i)
+                if m:
+                    self._csi(m.group(1), m.group(2))
+                    i = m.end()
+                    continue
+                op = data[i + 1:i + 2]
+                if op == b'D':
+                    self._down()
+                elif op == b'E':
+                    self.c = 0
+                    self._down()
+                i += 2
+                continue
+            if b == 0x0d:
+                self.c = 0
+            elif b == 0x0a:
+                self._down()
+            elif b == 0x08:
+                self.c = max(0, self.c - 1)
+            elif b >= 0x20:
+                self.grid[self.r][min(self.c, COLS - 1)] = chr(b)
+                self.c = min(self.c + 1, COLS)
+            i += 1
+
+    def _csi(self, params, op):
+        args = [int(p) for p in params.split(b';') if p] if params else []
+        n = args[0] if args else 1
+        if op == b'H':
+            self.r, self.c = (args[0] - 1 if args else 0), (args[1] - 1 if len(args) > 1 else 0)
+        elif op == b'K':
+            for c in range(self.c, COLS):
+                self.grid[self.r][c] = ' '
+        elif op == b'J':
+            self.grid = [[' '] * COLS for _ in range(ROWS)]
+        elif op == b'M':
+            for _ in range(n):
+                del self.grid[self.r]
+                self.grid.insert(self.bottom, [' '] * COLS)
+        elif op == b'A':
+            self.r = max(self.top, self.r - n)
+        elif op == b'B':
+            self.r = min(self.bottom, self.r + n)
+        elif op == b'r':
+            self.top = (args[0] - 1) if args else 0
+            self.bottom = (args[1] - 1) if len(args) > 1 else ROWS - 1
+            self.r = self.c = 0
+
+
+def run(lines, method):
+    from minitel.scroll import Scroller
+    scroller = Scroller(1, ROWS - 1, method)
+    vt = Vt()
+    total = len(scroller.start())
+    vt.feed(scroller.start())
+    window = ROWS - 1
+    scrolled = 0
+    for i, ln in enumerate(lines):
+        frame = scroller.line(codec.encode(safe_line(ln)[:COLS]))
+        vt.feed(frame)
+        total += len(frame)
+        if i >= window:
+            scrolled += len(frame) - len(codec.encode(safe_line(ln)[:COLS]))
+    end = scroller.end()
+    vt.feed(end)
+    total += len(end)
+    n = max(0, len(lines) - window)
+    return scroller.method, vt.lines(), total, (scrolled / n if n else 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Octets par ligne défilée, avant/après')
+    parser.add_argument('--term', default=terminfo.TERMNAME)
+    args = parser.parse_args()
+    terminfo.set_term(args.term)
+
+    texts = {name: read_text_lines(os.path.join(ROOT, name))
+             for name in ('logo.txt', 'logo-weyland.txt', 'boot.txt', '1.txt')
+             if os.path.exists(os.path.join(ROOT, name))}
+    texts['long'] = [f"LIGNE {i:03d} " + 'x' * (i % 60) for i in range(200)]
+    report = {}
+    for name, lines in texts.items():
+        _, screen_old, bytes_old, per_old = run(lines, 'dl1')
+        method, screen_new, bytes_new, per_new = run(lines, None)
+        report[name] = {'lines': len(lines), 'method': method,
+                        'bytes_before': bytes_old, 'bytes_after': bytes_new,
+                        'overhead_per_scrolled_line_before': round(per_old, 1),
+                        'overhead_per_scrolled_line_after': round(per_new, 1),
+                        'same_screen': screen_old == screen_new}
+    print(json.dumps({'term': args.term, 'texts': report}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark : séquences par seconde, ancien helper `tput` (un fork par
+séquence) contre le cache terminfo de minitel/terminfo.py.
+
+Usage:
+  python bench/bench_terminfo.py --term minitel1b-80 --seconds 2
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minitel import terminfo
+
+# mélange typique d'une ligne de show_paged / render_layout
+MIX = [('cup', 8, 1), ('el',), ('smso',), ('rmso',), ('dl1',)]
+
+
+def legacy_tput(term, name, *args):
+    # copie conforme de l'ancien helper des scripts
+    cmd = ['tput', '-T', term, name]
+    if args:
+        cmd += [str(a) for a in args]
+    try:
+        return subprocess.check_output(cmd)
+    except subprocess.CalledProcessError:
+        return b''
+
+
+def run(fn, seconds):
+    n = 0
+    start = time.perf_counter()
+    while True:
+        for cap in MIX:
+            fn(*cap)
+            n += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark terminfo')
+    parser.add_argument('--term', default=terminfo.TERMNAME)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    terminfo.set_term(args.term)
+    ti = terminfo.caps()
+
+    legacy = run(lambda name, *a: legacy_tput(args.term, name, *a), args.seconds)
+    cached = run(lambda name, *a: ti.cup(a[0], a[1]) if a else ti.seq(name), args.seconds)
+
+    print(f"terminfo: {args.term} ({'curses' if ti.native else 'tput memoise'})")
+    print(f"tput()    : {legacy:12.0f} seq/s")
+    print(f"cache     : {cached:12.0f} seq/s")
+    print(f"gain      : x{cached / legacy:.0f}")
+
+
+if __name__ == '__main__':
+    main()
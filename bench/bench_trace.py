@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark : coût d'un span de minitel/tracing.py, traces désactivées
+(le cas normal), en mémoire seule (--metrics-port) et avec journal JSONL.
+
+Usage:
+  python bench/bench_trace.py --n 200000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minitel import tracing
+
+
+def per_call(n, body):
+    t = time.perf_counter()
+    body(n)
+    return (time.perf_counter() - t) / n * 1e9
+
+
+def bare(n):
+    for _ in range(n):
+        pass
+
+
+def spans(n):
+    span = tracing.span
+    for _ in range(n):
+        with span('bench.step'):
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Coût des spans de tracing')
+    parser.add_argument('--n', type=int, default=200000)
+    args = parser.parse_args()
+
+    loop = per_call(args.n, bare)
+    off = per_call(args.n, spans) - loop
+
+    # en mémoire : histogrammes seuls
+    tracing.enabled = True
+    memory = per_call(args.n, spans) - loop
+
+    # avec le journal JSONL
+    with tempfile.TemporaryDirectory() as tmp:
+        tracing._file = open(os.path.join(tmp, 'spans.jsonl'), 'a', encoding='utf-8', buffering=1)
+        jsonl = per_call(args.n, spans) - loop
+        tracing._file.close()
+        tracing._file = None
+    tracing.enabled = False
+
+    print(f"span desactive : {off:8.0f} ns")
+    print(f"span memoire   : {memory:8.0f} ns")
+    print(f"span JSONL     : {jsonl:8.0f} ns")
+    # une question APOLLO ouvre une vingtaine de spans (plus un par touche)
+    print(f"20 spans desactives : {off * 20 / 1000:.1f} us par question")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark du journal des conversations (minitel/transcript.py).
+
+Construit un journal de --exchanges échanges (un résumé toutes les
+--fold questions, comme le résumé glissant de ChatCore), puis mesure :
+  append_us       ajout d'un échange (écriture + index)
+  resume_ms       ouverture + reprise du contexte via l'index
+  full_parse_ms   reprise naïve : relire et décoder tout le journal
+  rebuild_ms      index perdu : reconstruction complète (cas rare)
+  history_ms      /history : les 50 derniers échanges depuis le disque
+
+Usage:
+  python bench/bench_transcript.py --exchanges 100000
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from minitel.transcript import Transcript
+
+ANSWER = "INTERFACE 2037 READY. " + "Status nominal, all decks reporting. " * 8
+
+
+def ms(t0):
+    return round((time.perf_counter() - t0) * 1000, 2)
+
+
+def full_parse(path):
+    summary, turns = '', []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            rec = json.loads(line)
+            if 'summary' in rec:
+                summary, turns = rec['summary'], turns[-4:]
+            elif 'q' in rec:
+                turns.append((rec['q'], rec['a']))
+            elif rec.get('reset'):
+                summary, turns = '', []
+    return summary, turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reprise du journal : index contre relecture')
+    parser.add_argument('--exchanges', type=int, default=100000)
+    parser.add_argument('--fold', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'transcript.jsonl')
+        log = Transcript(path)
+        t0 = time.perf_counter()
+        for i in range(args.exchanges):
+            log.add(f"Question {i} : etat du pont {i % 7} ?", ANSWER)
+            if i % args.fold == args.fold - 1:
+                log.fold(f"Resume jusqu'a la question {i}.", 4)
+        append_us = round((time.perf_counter() - t0) / args.exchanges * 1e6, 1)
+        log.close()
+
+        t0 = time.perf_counter()
+        log = Transcript(path)
+        summary, exchanges = log.context()
+        turns = list(exchanges)
+        resume = ms(t0)
+
+        t0 = time.perf_counter()
+        history = [pair for _, pair in zip(range(50), log.exchanges())]
+        history_ms = ms(t0)
+        log.close()
+
+        t0 = time.perf_counter()
+        naive = full_parse(path)
+        full = ms(t0)
+
+        os.remove(path + '.idx')
+        t0 = time.perf_counter()
+        Transcript(path).close()
+        rebuild = ms(t0)
+
+        report = {'exchanges': args.exchanges, 'log_mb': round(os.path.getsize(path) / 1e6, 1),
+                  'append_us': append_us, 'resume_ms': resume, 'full_parse_ms': full,
+                  'rebuild_ms': rebuild, 'history_ms': history_ms,
+                  'resumed_turns': len(turns), 'history': len(history),
+                  'same_context': (summary, turns[::-1]) == naive}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
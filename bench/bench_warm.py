@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark du préchauffage d'APOLLO : la première question coûte-t-elle
+plus que les suivantes ?
+
+Lance apollo-boot.py (LAUNCH ? -> y -> chargement -> APOLLO) sur un faux
+Minitel contre le faux serveur OpenAI, pose --questions questions et lit
+les spans de minitel/tracing.py (MINITEL_TRACE) :
+  ask_ms     chat.ask (ou chat.request en --stream) de chaque question
+  answer_ms  apollo.answer : ENVOI -> réponse affichée
+  warm       spans warm.* du préchauffage
+pour trois configurations : --no-warm, préchauffage, --prime.
+
+Usage:
+  python bench/bench_warm.py --questions 3 --baud 9600
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import tempfile
+import threading
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from fake_openai import FakeOpenAI
+from bench_e2e import FakeMinitel
+
+MODES = {'cold': ['--no-warm'], 'warm': [], 'prime': ['--prime']}
+
+
+def spans(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def count(path, name):
+    return sum(1 for s in spans(path) if s['span'] == name)
+
+
+def run_mode(mode, server, args):
+    term = FakeMinitel()
+    trace = os.path.join(tempfile.mkdtemp(), 'spans.jsonl')
+    env = dict(os.environ, OPENAI_BASE_URL=server.base_url, OPENAI_API_KEY='bench',
+               MINITEL_AUDIO='null', MINITEL_TRACE=trace, PYTHONUNBUFFERED='1')
+    cmd = [sys.executable, os.path.join(ROOT, 'apollo-boot.py'), '--device', term.path,
+           '--baud', str(args.baud), '--no-cache', '--no-transcript'] + MODES[mode]
+    if args.stream:
+        cmd.append('--stream')
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True)
+    log = []
+    threading.Thread(target=lambda: log.extend(proc.stdout), daemon=True).start()
+    try:
+        if term.wait_for(b'LAUNCH ?', timeout=args.timeout) is None:
+            raise TimeoutError('LAUNCH ? jamais affiché')
+        term.wait_quiet(0.3, args.timeout)
+        term.start()
+        term.key(b'y\r')
+        if term.wait_for(b'[ENTER QUERY]', timeout=args.timeout) is None:
+            raise TimeoutError('APOLLO jamais affiché')
+        term.wait_quiet(0.5, args.timeout)
+        for i in range(1, args.questions + 1):
+            term.key(f'status report {i}\r'.encode())
+            # fin de réponse : span apollo.answer écrit (réponse sur une page)
+            end = time.monotonic() + args.timeout
+            while count(trace, 'apollo.answer') < i:
+                if time.monotonic() > end:
+                    raise TimeoutError(f'question {i} sans réponse')
+                term.wait_quiet(0.1, 0.2)
+            term.wait_quiet(0.3, args.timeout)
+    finally:
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        term.close()
+
+    rows = spans(trace)
+    ask = 'chat.request' if args.stream else 'chat.ask'
+    return {
+        'ask_ms': [round(s['ms'], 1) for s in rows if s['span'] == ask],
+        'answer_ms': [round(s['ms'], 1) for s in rows if s['span'] == 'apollo.answer'],
+        'warm': {s['span']: round(s['ms'], 1) for s in rows if s['span'].startswith('warm.')},
+        'log': [line.strip() for line in log if 'prechauffage' in line],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Coût de la première question, avec et sans préchauffage')
+    parser.add_argument('--questions', type=int, default=3)
+    parser.add_argument('--baud', type=int, default=9600)
+    parser.add_argument('--stream', action='store_true')
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--rate', type=float, default=200.0)
+    parser.add_argument('--words', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    args = parser.parse_args()
+
+    server = FakeOpenAI(0, args.latency, args.rate, args.words).start()
+    report = {'config': vars(args), 'modes': {}}
+    for mode in MODES:
+        print(f"... {mode}", file=sys.stderr)
+        report['modes'][mode] = run_mode(mode, server, args)
+    server.shutdown()
+    report['api'] = server.stats()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
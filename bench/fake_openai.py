@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Faux serveur OpenAI local (POST /v1/chat/completions) pour les benchmarks.
+
+Réponse déterministe de --words mots, en flux SSE ou d'un bloc, après
+--latency secondes puis au débit de --rate tokens/s (un mot = un token).
+Latence de queue : une requête sur --tail-rate (tirage à graine fixe)
+attend --tail secondes de plus avant son premier token.
+Compte les requêtes et la taille des prompts reçus (GET /stats).
+GET /v1/models/<id> répond aussi (préchauffage de la connexion).
+
+Usage:
+  python bench/fake_openai.py --port 8001 --latency 0.8 --rate 30
+  OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=bench python boot.py ...
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIRST_WORD = 'ACKNOWLEDGED'
+WORDS = ('REACTOR NOMINAL CLIMBER DOCKED SUBLEVEL SEALED CANYON DOORS CLOSED '
+         'CONTAINMENT ACTIVE POWER STABLE SENSORS OFFLINE').split()
+
+
+def reply_words(n, shift=0):
+    # décalé à chaque requête : deux réponses ne s'affichent pas à l'identique
+    return [FIRST_WORD] + [WORDS[(i + shift) % len(WORDS)] for i in range(n - 1)]
+
+
+class FakeOpenAI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.5, rate=40.0, words=60, tail=0.0, tail_rate=0.0, seed=1):
+        super().__init__(('127.0.0.1', port), Handler)
+        self.latency = latency
+        self.rate = rate
+        self.words = words
+        self.tail = tail
+        self.tail_rate = tail_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.prompt_chars = 0
+        self.models = {}      # modèle -> requêtes reçues
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stats(self):
+        return {'requests': self.requests, 'prompt_chars': self.prompt_chars, 'models': self.models}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/stats'):
+            self._json(200, self.server.stats())
+        elif '/models/' in self.path:
+            self._json(200, {'id': self.path.rsplit('/', 1)[1], 'object': 'model',
+                             'created': 0, 'owned_by': 'bench'})
+        else:
+            self._json(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._json(404, {'error': {'message': 'not found'}})
+            return
+        server = self.server
+        prompt = sum(len(m.get('content') or '') for m in body.get('messages', []))
+        model = body.get('model', 'fake')
+        with server.lock:
+            server.requests += 1
+            server.prompt_chars += prompt
+            server.models[model] = server.models.get(model, 0) + 1
+            shift = server.requests
+            slow = server.random.random() < server.tail_rate
+        usage = {'prompt_tokens': prompt // 4, 'completion_tokens': server.words,
+                 'total_tokens': prompt // 4 + server.words,
+                 'prompt_tokens_details': {'cached_tokens': 0}}
+        words = reply_words(server.words, shift)
+        time.sleep(server.latency + (server.tail if slow else 0.0))
+        if not body.get('stream'):
+            time.sleep(len(words) / server.rate)
+            self._json(200, {
+                'id': 'chatcmpl-bench', 'object': 'chat.completion', 'created': int(time.time()),
+                'model': model, 'usage': usage,
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': ' '.join(words)}}],
+            })
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for i, word in enumerate(words):
+                self._event(self._chunk(model, {'content': word if i == 0 else ' ' + word}))
+                time.sleep(1.0 / server.rate)
+            self._event(self._chunk(model, {}, finish='stop'))
+            if (body.get('stream_options') or {}).get('include_usage'):
+                self._event({'id': 'chatcmpl-bench', 'object': 'chat.completion.chunk',
+                             'created': int(time.time()), 'model': model, 'choices': [], 'usage': usage})
+            self._write(b'data: [DONE]\n\n')
+            self._write(b'')
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # client parti (ANNULATION, Q)
+
+    @staticmethod
+    def _chunk(model, delta, finish=None):
+        return {'id': 'chatcmpl-bench', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                'model': model, 'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish}]}
+
+    def _event(self, obj):
+        self._write(b'data: ' + json.dumps(obj).encode() + b'\n\n')
+
+    def _write(self, data):
+        # encodage chunked
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+
+    def _json(self, status, obj):
+        data = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # client parti (échéance dépassée)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Faux serveur OpenAI')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.5, help='secondes avant le premier token')
+    parser.add_argument('--rate', type=float, default=40.0, help='tokens par seconde')
+    parser.add_argument('--words', type=int, default=60, help='longueur de la réponse')
+    parser.add_argument('--tail', type=float, default=0.0, help='secondes de retard des requêtes lentes')
+    parser.add_argument('--tail-rate', type=float, default=0.0, help='part des requêtes lentes (0-1)')
+    args = parser.parse_args()
+    server = FakeOpenAI(args.port, args.latency, args.rate, args.words, args.tail, args.tail_rate)
+    print(f"fake OpenAI sur {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+# -*- coding: latin-1 -*-
+"""
+Hub : plusieurs Minitels (et terminaux pty / TCP) servis par un seul processus.
+
+Usage:
+  python hub.py --serial /dev/ttyUSB0 --serial /dev/ttyUSB1 --baud 4800
+  python hub.py --pty 2 --listen 0.0.0.0:2323 --concurrency 3
+"""
+
+from minitel import hub
+
+if __name__ == '__main__':
+    hub.main()
@@ -0,0 +1,4 @@
+"""
+Briques partagées par les scripts Minitel (boot.py, terminal.py,
+apollo-boot.py, apollo-gpt.py, apollo.py).
+"""
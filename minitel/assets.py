@@ -0,0 +1,169 @@
+"""
+Écrans et textes précompilés en octets prêts à envoyer.
+
+Les textes fixes (art.txt, logo.txt, boot.txt, 1.txt, 2.txt à 5.txt) et
+les mises en page d'en-tête (menu SEEGSON, APOLLO) ne changent pas d'une
+visite à l'autre : ils sont compilés une fois en flots Latin-1 exacts pour
+le terminal courant, puis rejoués tels quels.
+
+  frames(name, sources, build)   liste de trames (défilement : une par ligne,
+                                 envoyée au rythme du son)
+  text_lines(path)               lignes nettoyées (safe_line, tabulations)
+  layout(ctx, name, draw, src)   premier affichage d'une mise en page :
+                                 segments (son, octets) + état de l'écran
+                                 virtuel final, rejoués sans recalcul
+
+Cache disque dans .minitel_cache/<TERMNAME>/ (MINITEL_ASSET_CACHE pour un
+autre dossier), une entrée JSON par asset. La clé couvre le nom, mtime et
+taille des sources, TERMNAME, --accents et VERSION : modifier un .txt ou
+le .py d'une scène, ou changer de --term, recompile. Un cache illisible est ignoré.
+"""
+
+import os
+import json
+import hashlib
+import threading
+
+from minitel import codec, terminfo, tracing
+from minitel.screen import Screen
+from minitel.text import safe_line, read_text_lines
+
+VERSION = 3   # à incrémenter si le format ou la compilation change
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get('MINITEL_ASSET_CACHE', os.path.join(ROOT, '.minitel_cache'))
+
+_memo = {}                 # clé -> asset décodé
+_lock = threading.Lock()   # hub : plusieurs terminaux compilent en même temps
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None        # source absente : l'asset contient le message d'erreur
+    return st.st_mtime_ns, st.st_size
+
+
+def _key(name, sources):
+    h = hashlib.sha1()
+    h.update(repr((VERSION, terminfo.TERMNAME, codec.ACCENTS, name,
+                   [(os.path.abspath(p), _stamp(p)) for p in sources])).encode())
+    return h.hexdigest()[:16]
+
+
+def _file(name, key):
+    safe = ''.join(c if c.isalnum() or c in '._-' else '_' for c in name)
+    return os.path.join(CACHE_DIR, terminfo.TERMNAME, f"{safe}.{key}.json")
+
+
+def _load(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _store(path, data):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # anciennes versions du même asset
+        folder = os.path.dirname(path)
+        prefix = os.path.basename(path).rsplit('.', 2)[0] + '.'
+        for old in os.listdir(folder):
+            if old.startswith(prefix) and old[len(prefix):].count('.') == 1:
+                os.unlink(os.path.join(folder, old))
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[ASSETS] cache non écrit ({e})")
+
+
+def cached(name, sources, build):
+    """Asset JSON `name` : mémoire, sinon disque, sinon build() puis cache."""
+    key = _key(name, sources)
+    with _lock:
+        data = _memo.get(key)
+        if data is not None:
+            return data
+        path = _file(name, key)
+        data = _load(path)
+        if data is None:
+            with tracing.span('assets.build', asset=name):
+                data = build()
+            _store(path, data)
+        _memo[key] = data
+        return data
+
+
+# ----- flots d'octets -----
+
+def _bytes(data):
+    if isinstance(data, str):
+        data = data.encode('latin-1', errors='ignore')
+    return bytes(data)
+
+
+def frames(name, sources, build):
+    """Trames (bytes) compilées par build() -> liste de bytes/str."""
+    # JSON : octets gardés en texte Latin-1 (aller-retour exact)
+    data = cached(name, sources, lambda: [_bytes(f).decode('latin-1') for f in build()])
+    return [f.encode('latin-1') for f in data]
+
+
+def blob(name, sources, build):
+    """Un seul flot, envoyé en une écriture."""
+    return b''.join(frames(name, sources, build))
+
+
+def text_lines(path):
+    """Lignes d'un fichier à paginer, déjà nettoyées. OSError si absent."""
+    if _stamp(path) is None:
+        raise FileNotFoundError(path)
+    return cached('lines-' + os.path.basename(path), [path],
+                  lambda: [safe_line(ln).expandtabs(8) for ln in read_text_lines(path)])
+
+
+def read_or(path, not_found_msg):
+    try:
+        return read_text_lines(path)
+    except Exception:
+        return [not_found_msg]
+
+
+# ----- mises en page -----
+
+class Recording:
+    """Contexte de scène qui n'envoie rien : paint/emit enregistrent."""
+
+    def __init__(self, ctx):
+        self.args = ctx.args
+        self.path = ctx.path
+        self.ser = None
+        self.screen = Screen()
+        self.recording = []
+
+
+def layout(ctx, name, draw, sources):
+    """draw(ctx), rejoué depuis un gabarit si l'état du Minitel est inconnu.
+
+    Sinon (retour d'une autre mise en page), draw() passe par le
+    réaffichage différentiel habituel.
+    """
+    if ctx.screen.have is not None:
+        draw(ctx)
+        return
+
+    def build():
+        rec = Recording(ctx)
+        draw(rec)
+        return {'segments': [[wav, data.decode('latin-1')] for wav, data in rec.recording],
+                'screen': rec.screen.snapshot()}
+
+    from minitel.scenes.common import emit   # scenes importe assets
+    template = cached('layout-' + name, sources, build)
+    for wav, data in template['segments']:
+        emit(ctx, data.encode('latin-1'), wav)
+    ctx.screen.restore(template['screen'])
@@ -0,0 +1,314 @@
+"""
+Moteur audio persistant : sons préchargés, une seule sortie ouverte.
+
+Les .wav sont décodés une fois en PCM (mono, 16 bits, RATE Hz) et gardés
+en mémoire. Un thread de mixage unique alimente une sortie persistante :
+  aplay   un seul processus `aplay` lisant du PCM brut sur stdin (défaut)
+  null    rien n'est joué (machine sans carte son), le rythme est gardé
+  file:x  tout ce qui est joué est écrit dans le fichier WAV x (tests)
+
+Démarrer ou couper une boucle ne fait que modifier la liste des voix sous
+un verrou : ni thread ni processus créé, retour en quelques microsecondes.
+Le mixeur écrit par blocs de PERIOD secondes avec au plus LEAD d'avance,
+c'est le délai maximum avant qu'un arrêt s'entende. Sans voix active, il
+dort (aucun réveil périodique).
+
+Usage:
+  configure('null')             # avant le premier son (sinon aplay)
+  preload(['typing_long.wav'])
+  lp = LoopPlayer('typing_long.wav'); lp.start(); ...; lp.stop_now()
+  play_once('horn.wav')         # bloque jusqu'à la fin du son
+"""
+
+import os
+import sys
+import time
+import wave
+import array
+import threading
+import subprocess
+
+from minitel import tracing
+
+RATE = 22050          # Hz, la plupart des sons du projet
+PERIOD = 0.010        # s par bloc mixé
+LEAD = 0.030          # s d'avance maximum sur l'horloge
+APLAY = ['aplay', '-q', '-t', 'raw', '-f', 'S16_LE', '-c', '1', '-r', str(RATE),
+         '--buffer-time=40000', '-']
+
+
+# ----- décodage -----
+
+def decode_wav(path, rate=RATE):
+    """PCM mono 16 bits à `rate` Hz (bytes) depuis un .wav 8/16 bits."""
+    with wave.open(path, 'rb') as w:
+        channels, width, src_rate = w.getnchannels(), w.getsampwidth(), w.getframerate()
+        raw = w.readframes(w.getnframes())
+    if width == 2:
+        samples = array.array('h', raw)
+        if sys.byteorder == 'big':
+            samples.byteswap()
+    elif width == 1:
+        samples = array.array('h', ((b - 128) << 8 for b in raw))
+    else:
+        raise ValueError(f"{path}: {width * 8} bits non supporté")
+    if channels > 1:
+        samples = array.array('h', (sum(samples[i:i + channels]) // channels
+                                    for i in range(0, len(samples), channels)))
+    if src_rate != rate:
+        # plus proche voisin : suffisant pour des bruits de frappe
+        n = len(samples) * rate // src_rate
+        step = src_rate / rate
+        samples = array.array('h', (samples[int(i * step)] for i in range(n)))
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    return samples.tobytes()
+
+
+# ----- sorties -----
+
+class NullSink:
+    def write(self, data):
+        pass
+
+    def close(self):
+        pass
+
+
+class PipeSink:
+    """Un processus de lecture persistant nourri en PCM brut sur stdin."""
+
+    def __init__(self, cmd=APLAY):
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def write(self, data):
+        self.proc.stdin.write(data)
+        self.proc.stdin.flush()
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        self.proc.wait(timeout=1.0)
+
+
+class FileSink:
+    """Enregistre la sortie dans un WAV (les pauses sans son ne sont pas écrites)."""
+
+    def __init__(self, path, rate=RATE):
+        self.w = wave.open(path, 'wb')
+        self.w.setnchannels(1)
+        self.w.setsampwidth(2)
+        self.w.setframerate(rate)
+
+    def write(self, data):
+        self.w.writeframes(data)
+
+    def close(self):
+        self.w.close()
+
+
+def open_sink(spec):
+    """'aplay' (repli sur null si aplay est absent), 'null' ou 'file:chemin'."""
+    if spec == 'null':
+        return NullSink()
+    if spec.startswith('file:'):
+        return FileSink(spec[len('file:'):])
+    try:
+        return PipeSink()
+    except OSError:
+        return NullSink()
+
+
+# ----- moteur -----
+
+class Voice:
+    """Un son en cours de lecture (stop() pour le couper)."""
+
+    def __init__(self, engine, pcm, loop):
+        self.engine = engine
+        self.pcm = memoryview(pcm)
+        self.loop = loop
+        self.pos = 0
+        self.done = threading.Event()
+
+    def stop(self):
+        self.engine._remove(self)
+
+    def wait(self):
+        self.done.wait()
+
+    def _take(self, n):
+        """Jusqu'à n octets suivants (vide quand le son est fini)."""
+        if self.pos >= len(self.pcm):
+            if not self.loop or not self.pcm:
+                return b''
+            self.pos = 0
+        data = self.pcm[self.pos:self.pos + n]
+        self.pos += len(data)
+        return data
+
+
+class AudioEngine:
+    def __init__(self, sink, rate=RATE):
+        self.sink = sink
+        self.rate = rate
+        self.block = int(rate * PERIOD) * 2          # octets par bloc
+        self.silence = bytes(self.block)
+        self.sounds = {}                             # chemin -> PCM (None si illisible)
+        self.voices = []
+        self.closed = False
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, daemon=True, name='audio-mixer')
+        self.thread.start()
+
+    def load(self, path):
+        pcm = self.sounds.get(path, False)
+        if pcm is False:
+            try:
+                with tracing.span('audio.decode', wav=os.path.basename(path)):
+                    pcm = decode_wav(path, self.rate)
+            except (OSError, EOFError, wave.Error, ValueError):
+                pcm = None   # son absent : silence, comme aplay sans fichier
+            self.sounds[path] = pcm
+        return pcm
+
+    def play(self, path, loop=False):
+        """Démarre un son, renvoie sa Voice (None si le son est illisible)."""
+        with tracing.span('audio.play'):
+            pcm = self.load(path)
+            if not pcm:
+                return None
+            voice = Voice(self, pcm, loop)
+            with self.cond:
+                self.voices.append(voice)
+                self.cond.notify()
+        return voice
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            for v in self.voices:
+                v.done.set()
+            self.voices = []
+            self.cond.notify()
+        self.thread.join(timeout=1.0)
+        self.sink.close()
+
+    def _remove(self, voice):
+        with self.cond:
+            if voice in self.voices:
+                self.voices.remove(voice)
+        voice.done.set()
+
+    # ----- thread de mixage -----
+
+    def _run(self):
+        t0, written = time.monotonic(), 0
+        while True:
+            with self.cond:
+                if not self.voices and not self.closed:
+                    self.cond.wait()
+                    # reprise après un silence : l'horloge repart de maintenant
+                    t0, written = time.monotonic(), 0
+                if self.closed:
+                    return
+                data = self._mix()
+            try:
+                self.sink.write(data)
+            except (OSError, ValueError):
+                # sortie perdue (aplay tué...) : on continue en silence
+                self.sink = NullSink()
+            written += len(data) // 2
+            ahead = written / self.rate - (time.monotonic() - t0)
+            if ahead > LEAD:
+                time.sleep(ahead - LEAD)
+            elif ahead < -LEAD:
+                t0, written = time.monotonic(), 0   # retard (sortie bloquée) : pas de rattrapage
+
+    def _mix(self):
+        """Bloc suivant (appelé sous le verrou)."""
+        parts = []
+        for v in list(self.voices):
+            data = v._take(self.block)
+            if len(data) < self.block and v.loop and len(v.pcm):
+                data = bytes(data) + bytes(v._take(self.block - len(data)))
+            if not data:
+                self.voices.remove(v)
+                v.done.set()
+                continue
+            parts.append(data)
+        if not parts:
+            return self.silence
+        if len(parts) == 1:
+            data = parts[0]
+            return data if len(data) == self.block else bytes(data) + self.silence[len(data):]
+        # plusieurs voix : somme écrêtée
+        out = array.array('h', self.silence)
+        for data in parts:
+            samples = array.array('h', bytes(data))
+            for i, s in enumerate(samples):
+                out[i] = max(-32768, min(32767, out[i] + s))
+        return out.tobytes()
+
+
+_engine = None
+_sink_spec = os.environ.get('MINITEL_AUDIO', 'aplay')
+_lock = threading.Lock()
+
+
+def configure(spec):
+    """Choisit la sortie ('aplay', 'null', 'file:chemin') avant le premier son."""
+    global _sink_spec
+    _sink_spec = spec
+
+
+def engine():
+    """Le moteur du processus (démarré au premier son)."""
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = AudioEngine(open_sink(_sink_spec))
+    return _engine
+
+
+def preload(paths):
+    """Décode d'avance, pour que le premier son d'une scène parte tout de suite."""
+    e = engine()
+    for path in paths:
+        e.load(path)
+
+
+def shutdown():
+    global _engine
+    with _lock:
+        if _engine is not None:
+            _engine.close()
+            _engine = None
+
+
+# Gestion du son
+class LoopPlayer:
+    """Un son en boucle sur le moteur (interface de l'ancien lecteur aplay)."""
+
+    def __init__(self, wav_path):
+        self.wav = wav_path
+        self.voice = None
+
+    def start(self):
+        self.voice = engine().play(self.wav, loop=True)
+
+    def stop_now(self):
+        if self.voice is not None:
+            self.voice.stop()
+            self.voice = None
+
+
+def play_once(wav_path):
+    """Joue un son et attend sa fin."""
+    voice = engine().play(wav_path)
+    if voice is not None:
+        voice.wait()
@@ -0,0 +1,253 @@
+"""
+Fournisseurs de réponses de ChatCore, choisis dans `.env`.
+
+  APOLLO_BACKEND=openai   API OpenAI publique (OPENAI_API_KEY)
+  APOLLO_BACKEND=local    serveur local compatible OpenAI (llama.cpp
+                          server, Ollama, vLLM...) : LOCAL_BASE_URL,
+                          LOCAL_MODEL, LOCAL_API_KEY (souvent inutile)
+  APOLLO_BACKEND=mock     réponses fabriquées sur place, sans réseau : toute
+                          l'interface tourne sans clé ni serveur (essais,
+                          démonstrations) ; MOCK_LATENCY, MOCK_RATE, MOCK_WORDS
+
+--backend remplace APOLLO_BACKEND. Chaque fournisseur rend un client
+(interface de AsyncOpenAI : chat.completions.create, models.retrieve) et
+déclare ses capacités :
+  streaming    réponses en flux (sinon --stream et la relance sont coupés)
+  stream_usage tokens consommés en fin de flux (stream_options)
+  max_tokens   nom du paramètre de longueur maximale, et plafond éventuel
+  tools        appels d'outils (function calling)
+
+price(model) donne le prix en $ par million de tokens (entrée, entrée en
+cache, sortie) pour les comptes de minitel/budget.py : None si inconnu,
+zéro pour un serveur local ou le factice. reserve(model) donne les tokens
+ajoutés au plafond d'écran pour le raisonnement caché du modèle.
+
+Un serveur local peut ne pas tout savoir faire : LOCAL_STREAM=0,
+LOCAL_STREAM_USAGE=0, LOCAL_TOOLS=1, LOCAL_MAX_TOKENS=512 ajustent ses
+capacités.
+
+Usage:
+  backend = from_env()
+  chat = ChatCore(model=backend.model(args.model), backend=backend, ...)
+"""
+
+import os
+import time
+import asyncio
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+load_dotenv()
+
+OPENAI_MODEL = 'gpt-5-mini'
+LOCAL_URL = 'http://127.0.0.1:8080/v1'
+REASONING_RESERVE = 2048   # tokens de raisonnement des modèles gpt-5 / o*
+REASONING_MODELS = ('gpt-5', 'o1', 'o3', 'o4')
+
+# $ par million de tokens : entrée, entrée en cache, sortie (préfixe le plus long)
+OPENAI_PRICES = {
+    'gpt-5': (1.25, 0.125, 10.0),
+    'gpt-5-mini': (0.25, 0.025, 2.0),
+    'gpt-5-nano': (0.05, 0.005, 0.4),
+    'gpt-4.1': (2.0, 0.5, 8.0),
+    'gpt-4.1-mini': (0.4, 0.1, 1.6),
+    'gpt-4.1-nano': (0.1, 0.025, 0.4),
+    'gpt-4o': (2.5, 1.25, 10.0),
+    'gpt-4o-mini': (0.15, 0.075, 0.6),
+}
+
+
+class Capabilities:
+    def __init__(self, streaming=True, stream_usage=True, tools=False,
+                 max_tokens_param='max_tokens', max_tokens=0):
+        self.streaming = streaming
+        self.stream_usage = stream_usage
+        self.tools = tools
+        self.max_tokens_param = max_tokens_param
+        self.max_tokens = max_tokens      # plafond du fournisseur (0 = aucun)
+
+
+def flag(name, default):
+    value = os.environ.get(name)
+    if value is None or value == '':
+        return default
+    return value.lower() not in ('0', 'no', 'non', 'false', 'off')
+
+
+class Backend:
+    name = ''
+    default_model = ''
+    caps = Capabilities()
+
+    def client(self):
+        raise NotImplementedError
+
+    def model(self, requested=None):
+        """Modèle demandé (--model), sinon celui du fournisseur."""
+        return requested or self.default_model
+
+    def price(self, model):
+        return (0.0, 0.0, 0.0)
+
+    def reserve(self, model):
+        """Tokens de raisonnement caché à ajouter au plafond de model."""
+        return 0
+
+    def limit(self, max_tokens):
+        """Paramètre de longueur maximale pour create() (vide si aucune)."""
+        cap = self.caps.max_tokens
+        n = min(max_tokens, cap) if max_tokens and cap else max_tokens or cap
+        return {self.caps.max_tokens_param: n} if n else {}
+
+    def describe(self):
+        caps = self.caps
+        yes = lambda b: 'oui' if b else 'non'
+        return (f"{self.name}, flux {yes(caps.streaming)}, outils {yes(caps.tools)}, "
+                f"max_tokens {caps.max_tokens or 'libre'}")
+
+
+class OpenAIBackend(Backend):
+    name = 'openai'
+    default_model = OPENAI_MODEL
+    # les modèles de raisonnement refusent max_tokens
+    caps = Capabilities(streaming=True, stream_usage=True, tools=True,
+                        max_tokens_param='max_completion_tokens')
+
+    def client(self):
+        from openai import AsyncOpenAI
+        # relances faites par ChatCore, dans son échéance : pas celles du client
+        return AsyncOpenAI(max_retries=0)   # lit OPENAI_API_KEY
+
+    def price(self, model):
+        # gpt-5-mini-2025-08-07 -> gpt-5-mini
+        known = [name for name in OPENAI_PRICES if model.startswith(name)]
+        return OPENAI_PRICES[max(known, key=len)] if known else None
+
+    def reserve(self, model):
+        return REASONING_RESERVE if model.startswith(REASONING_MODELS) else 0
+
+
+class LocalBackend(Backend):
+    name = 'local'
+
+    def __init__(self):
+        self.base_url = os.environ.get('LOCAL_BASE_URL') or LOCAL_URL
+        self.default_model = os.environ.get('LOCAL_MODEL') or 'local'
+        self.caps = Capabilities(streaming=flag('LOCAL_STREAM', True),
+                                 stream_usage=flag('LOCAL_STREAM_USAGE', True),
+                                 tools=flag('LOCAL_TOOLS', False),
+                                 max_tokens_param='max_tokens',
+                                 max_tokens=int(os.environ.get('LOCAL_MAX_TOKENS') or 0))
+
+    def client(self):
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(base_url=self.base_url, max_retries=0,
+                           api_key=os.environ.get('LOCAL_API_KEY') or 'local')
+
+    def describe(self):
+        return super().describe() + f" ({self.base_url})"
+
+
+class MockBackend(Backend):
+    name = 'mock'
+    default_model = 'mock'
+    caps = Capabilities(streaming=True, stream_usage=True, tools=False)
+
+    def __init__(self, latency=None, rate=None, words=None):
+        env = os.environ.get
+        self.latency = latency if latency is not None else float(env('MOCK_LATENCY') or 0.3)
+        self.rate = rate if rate is not None else float(env('MOCK_RATE') or 40)
+        self.words = words if words is not None else int(env('MOCK_WORDS') or 40)
+
+    def client(self):
+        return MockClient(self)
+
+
+BACKENDS = {'openai': OpenAIBackend, 'local': LocalBackend, 'mock': MockBackend}
+
+
+def from_env(name=None):
+    """Fournisseur nommé (--backend), sinon APOLLO_BACKEND, sinon openai."""
+    name = (name or os.environ.get('APOLLO_BACKEND') or 'openai').lower()
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise SystemExit(f"backend inconnu : {name} (choix : {', '.join(BACKENDS)})")
+
+
+# ----- client factice (mock) -----
+
+MOCK_WORDS = ('REACTOR NOMINAL. CLIMBER DOCKED. SUBLEVEL SEALED. CANYON DOORS CLOSED. '
+              'CONTAINMENT ACTIVE. POWER STABLE. SENSORS OFFLINE.').split()
+
+
+class MockClient:
+    """Même interface qu'AsyncOpenAI pour ce que ChatCore utilise."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.requests = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.models = SimpleNamespace(retrieve=self._retrieve)
+
+    async def _retrieve(self, model):
+        return SimpleNamespace(id=model)
+
+    async def close(self):
+        pass
+
+    async def _create(self, model, messages, stream=False, **kw):
+        self.requests += 1
+        backend = self.backend
+        question = next((m['content'] for m in reversed(messages) if m['role'] == 'user'), '')
+        words = [f"[{model.upper()}]", 'QUERY', f"'{question[:40].upper()}'", 'RECEIVED.']
+        words += [MOCK_WORDS[(i + self.requests) % len(MOCK_WORDS)]
+                  for i in range(max(0, backend.words - len(words)))]
+        limit = kw.get('max_tokens') or kw.get('max_completion_tokens')
+        finish = 'length' if limit and len(words) > limit else 'stop'
+        if limit:
+            words = words[:limit]
+        prompt = sum(len(m['content']) for m in messages) // 4
+        usage = SimpleNamespace(prompt_tokens=prompt, completion_tokens=len(words),
+                                total_tokens=prompt + len(words),
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=0))
+        await asyncio.sleep(backend.latency)
+        if not stream:
+            await asyncio.sleep(len(words) / backend.rate)
+            message = SimpleNamespace(role='assistant', content=' '.join(words))
+            return SimpleNamespace(model=model, usage=usage,
+                                   choices=[SimpleNamespace(message=message, finish_reason=finish)])
+        return MockStream(model, words, backend.rate, finish,
+                          usage if (kw.get('stream_options') or {}).get('include_usage') else None)
+
+
+class MockStream:
+    def __init__(self, model, words, rate, finish, usage):
+        self.chunks = iter([(' ' if i else '') + w for i, w in enumerate(words)])
+        self.model = model
+        self.rate = rate
+        self.finish = finish
+        self.usage = usage
+        self.t_next = time.monotonic()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        for text in self.chunks:
+            self.t_next += 1.0 / self.rate
+            await asyncio.sleep(max(0.0, self.t_next - time.monotonic()))
+            delta = SimpleNamespace(content=text)
+            return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=delta, finish_reason=None)])
+        if self.finish is not None:
+            finish, self.finish = self.finish, None
+            delta = SimpleNamespace(content=None)
+            return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=delta, finish_reason=finish)])
+        if self.usage is not None:
+            usage, self.usage = self.usage, None
+            return SimpleNamespace(usage=usage, choices=[])
+        raise StopAsyncIteration
+
+    async def close(self):
+        self.chunks = iter(())
+        self.finish = self.usage = None
@@ -0,0 +1,157 @@
+"""
+Appels API bornés dans le temps : échéance, relances, disjoncteur.
+
+retrying() relance un appel jusqu'à son échéance : chaque essai dispose de
+tout le temps restant (une réponse longue mais saine n'est jamais coupée
+puis relancée, ce qui ferait payer ses tokens deux fois), et seules les
+erreurs passagères (réseau, 429, 5xx) arrivées vite, en moins de
+FAST_FAILURE secondes, sont relancées. Entre deux essais on attend un
+délai exponentiel tiré au hasard (full jitter) pour ne pas relancer tous
+les terminaux en même temps. Les autres erreurs (4xx : modèle inconnu,
+clé refusée...) ne sont pas relancées et ne comptent pas comme une panne.
+
+CircuitBreaker compte les essais en échec consécutifs. Au-delà de
+`failures`, il s'ouvre : plus aucune requête pendant `cooldown` secondes
+(APOLLO répond hors ligne, minitel/offline.py), puis une seule requête
+d'essai passe (demi-ouvert) ; si elle réussit, il se referme. Un seul
+disjoncteur par processus (shared()), commun aux terminaux du hub. Son état
+est exposé dans les métriques (minitel_breaker_state : 0 fermé,
+1 demi-ouvert, 2 ouvert).
+
+Usage:
+  breaker = shared()
+  if breaker.allow():
+      resp = await retrying(lambda: client.chat.completions.create(...),
+                            deadline=15.0, retryable=RETRYABLE, breaker=breaker)
+"""
+
+import time
+import random
+import asyncio
+import threading
+
+from minitel import tracing
+
+FAILURES = 3        # essais en échec consécutifs avant ouverture
+COOLDOWN = 30.0     # secondes ouvert avant une requête d'essai
+ATTEMPTS = 3        # essais au plus par requête
+BACKOFF = 0.5       # secondes, premier délai entre essais (doublé ensuite)
+BACKOFF_CAP = 4.0
+FAST_FAILURE = 5.0  # secondes : échec plus lent que ça (ou échéance) -> pas de relance
+
+CLOSED, HALF_OPEN, OPEN = 'closed', 'half_open', 'open'
+STATES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    def __init__(self, failures=FAILURES, cooldown=COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.count = 0        # échecs consécutifs
+        self.opened = 0.0     # instant d'ouverture (monotonic)
+        self.probing = False  # requête d'essai en vol (demi-ouvert)
+        self.trips = 0        # ouvertures depuis le démarrage
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """La requête peut-elle partir ? (sinon : réponse hors ligne)"""
+        with self.lock:
+            if self.state == OPEN and time.monotonic() - self.opened >= self.cooldown:
+                self.state, self.probing = HALF_OPEN, False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def success(self):
+        with self.lock:
+            if self.state != CLOSED:
+                print("[API] disjoncteur referme", flush=True)
+            self.state, self.count, self.probing = CLOSED, 0, False
+
+    def failure(self):
+        with self.lock:
+            self.count += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.count >= self.failures):
+                self.state, self.opened, self.probing = OPEN, time.monotonic(), False
+                self.trips += 1
+                print(f"[API] disjoncteur ouvert ({self.count} echecs), "
+                      f"essai dans {self.cooldown:.0f} s", flush=True)
+
+    def abandon(self):
+        """Requête annulée (ANNULATION) : pas un échec, l'essai est rendu."""
+        with self.lock:
+            self.probing = False
+
+    def retry_in(self):
+        """Secondes avant la prochaine requête d'essai (0 si fermé)."""
+        with self.lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self.opened))
+
+    def stats(self):
+        state = {CLOSED: 'ferme', HALF_OPEN: 'demi-ouvert', OPEN: 'ouvert'}[self.state]
+        return f"disjoncteur {state}, {self.count} echecs, {self.trips} ouvertures"
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared(failures=FAILURES, cooldown=COOLDOWN):
+    """Le disjoncteur du processus (créé au premier appel)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = CircuitBreaker(failures, cooldown)
+            tracing.gauge('breaker_state', lambda: STATES[_shared.state],
+                          'API circuit breaker: 0 closed, 1 half-open, 2 open.')
+            tracing.gauge('breaker_trips', lambda: _shared.trips,
+                          'Times the API circuit breaker opened.')
+        return _shared
+
+
+def backoff(n, base=BACKOFF, cap=BACKOFF_CAP):
+    """Délai avant l'essai n+1 (full jitter)."""
+    return random.uniform(0, min(cap, base * 2 ** n))
+
+
+async def retrying(call, deadline, retryable, attempts=ATTEMPTS, breaker=None):
+    """Résultat de `await call()`, relancé sur erreur passagère tant que
+    l'échéance (secondes depuis maintenant) et le disjoncteur le permettent."""
+    end = time.monotonic() + deadline
+    for n in range(attempts):
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(call(), end - start)
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.abandon()
+            raise
+        except retryable as e:
+            if breaker is not None:
+                breaker.failure()
+            now = time.monotonic()
+            delay = backoff(n)
+            stop = (n == attempts - 1 or now - start > FAST_FAILURE or delay >= end - now or
+                    (breaker is not None and breaker.state == OPEN))
+            print(f"[API] essai {n + 1}/{attempts} en echec ({e.__class__.__name__})"
+                  + ('' if stop else f", nouvel essai dans {delay:.1f} s"), flush=True)
+            if stop:
+                raise
+            with tracing.span('api.backoff', attempt=n + 1):
+                await asyncio.sleep(delay)
+            continue
+        except Exception:
+            # erreur de requête (4xx) : le point d'accès répond, pas une panne ;
+            # l'appelant la journalise comme erreur de configuration
+            if breaker is not None:
+                breaker.success()
+            raise
+        if breaker is not None:
+            breaker.success()
+        return result
@@ -0,0 +1,162 @@
+"""
+Longueur des réponses d'APOLLO et comptes de tokens.
+
+OutputBudget décrit la zone de réponse (`rows` lignes x `width` colonnes)
+et le débit du port (10 bits par caractère : start, 7 bits + parité ou 8
+bits, stop) : il estime le temps d'affichage d'une réponse. Avec `pages`
+(optionnel, 0 = longueur libre), il en tire aussi un max_tokens : ce que
+l'écran montre en `pages` pages et que la ligne affiche en `max_render`
+secondes, avec une marge. Ce plafond coupe la réponse, il n'est pas
+annoncé au modèle (prompt.txt ne porte pas de règle de longueur).
+
+Ledger tient les comptes d'un ChatCore, par requête et pour la session :
+tokens d'entrée (dont en cache), de sortie (dont raisonnement), coût
+estimé (prix du fournisseur en $ par million de tokens, minitel/backends.py,
+ou --price) et temps d'affichage estimé de la réponse. Sans décompte du
+fournisseur (serveur local sans stream_usage), les tokens sont estimés.
+
+Usage:
+  output = OutputBudget(15, 78, pages=3, baud=4800)
+  output.max_tokens()                 # 0 sans pages
+  ledger = Ledger(backend.price, output)
+  ledger.add(model, usage)            # décompte rendu par l'API
+  ledger.reply(text)                  # temps d'affichage
+  ledger.report()                     # lignes du rapport de fin de session
+"""
+
+import math
+
+from minitel.text import wrap_lines
+
+MAX_RENDER = 60.0       # secondes d'affichage au plus par réponse
+BITS_PER_CHAR = 10
+LINE_OVERHEAD = 4       # octets de positionnement du curseur par ligne
+FILL = 0.75             # remplissage moyen d'une ligne après retour à la ligne
+CHARS_PER_TOKEN = 4.0   # anglais, estimation
+MARGIN = 1.25           # max_tokens au-dessus de la cible : pas de coupure en fin de phrase
+
+
+class OutputBudget:
+    def __init__(self, rows, width, pages=0, baud=0, max_render=MAX_RENDER):
+        self.rows = rows
+        self.width = width
+        self.pages = pages
+        self.baud = baud
+        self.max_render = max_render
+
+    def line_bytes(self):
+        return self.width * FILL + LINE_OVERHEAD
+
+    def lines(self):
+        """Longueur cible d'une réponse, en lignes d'écran."""
+        lines = self.rows * self.pages
+        if self.baud and self.max_render:
+            shown = self.baud / BITS_PER_CHAR * self.max_render / self.line_bytes()
+            lines = min(lines, int(shown))
+        return max(1, lines)
+
+    def max_tokens(self):
+        """Plafond d'une réponse (0 : longueur libre)."""
+        if not self.pages:
+            return 0
+        return math.ceil(self.lines() * self.width * FILL / CHARS_PER_TOKEN * MARGIN)
+
+    def render_seconds(self, text):
+        """Temps d'affichage de text au débit du port (0 si inconnu)."""
+        if not self.baud:
+            return 0.0
+        sent = sum(len(line) + LINE_OVERHEAD for line in wrap_lines(text, self.width))
+        return sent * BITS_PER_CHAR / self.baud
+
+    def describe(self):
+        if not self.pages:
+            return "libre"
+        return (f"{self.lines()} lignes ({self.pages} pages de {self.rows}x{self.width}"
+                + (f", {self.max_render:.0f} s a {self.baud} bauds)" if self.baud else ")")
+                + f", max_tokens {self.max_tokens()}")
+
+
+def parse_price(text):
+    """--price IN,CACHED,OUT ($ par million de tokens) -> tuple."""
+    values = tuple(float(v) for v in text.split(','))
+    if len(values) != 3:
+        raise ValueError(f"prix attendu IN,CACHED,OUT : {text}")
+    return values
+
+
+class Ledger:
+    def __init__(self, price, output=None):
+        self.price = price      # modèle -> (entrée, en cache, sortie) $/Mtok, ou None
+        self.output = output    # OutputBudget ou None (pas de temps d'affichage)
+        self.requests = 0
+        self.folds = 0
+        self.prompt = 0
+        self.cached = 0
+        self.completion = 0
+        self.reasoning = 0
+        self.estimated = 0      # requêtes sans décompte du fournisseur
+        self.truncated = 0      # réponses coupées par max_tokens
+        self.cost = 0.0
+        self.unpriced = set()   # modèles sans prix connu
+        self.replies = 0
+        self.render = 0.0
+
+    def add(self, model, usage=None, prompt=0, completion=0, fold=False):
+        """Compte une requête : usage de l'API, sinon estimation prompt/completion."""
+        if usage is not None:
+            prompt, completion = usage.prompt_tokens or 0, usage.completion_tokens or 0
+            cached = getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', None) or 0
+            reasoning = getattr(getattr(usage, 'completion_tokens_details', None), 'reasoning_tokens', None) or 0
+        else:
+            cached = reasoning = 0
+            self.estimated += 1
+        if fold:
+            self.folds += 1
+        else:
+            self.requests += 1
+        self.prompt += prompt
+        self.cached += cached
+        self.completion += completion
+        self.reasoning += reasoning
+        cost = 0.0
+        price = self.price(model)
+        if price is None:
+            self.unpriced.add(model)
+        else:
+            cost = ((prompt - cached) * price[0] + cached * price[1] + completion * price[2]) / 1e6
+            self.cost += cost
+        return cost
+
+    def reply(self, text):
+        """Réponse affichée : temps d'affichage estimé (secondes)."""
+        seconds = self.output.render_seconds(text) if self.output is not None else 0.0
+        self.replies += 1
+        self.render += seconds
+        return seconds
+
+    def _cost(self):
+        cost = f"${self.cost:.4f}"
+        if self.unpriced:
+            cost += f" (sans prix : {', '.join(sorted(self.unpriced))})"
+        return cost
+
+    def stats(self):
+        """Une ligne, pour la ligne de statut (/usage)."""
+        return (f"{self.requests} req, {self.prompt} tok entree, {self.completion} sortie, "
+                f"{self._cost()}, affichage {self.render:.0f} s")
+
+    def report(self):
+        """Rapport de fin de session (console)."""
+        avg = self.render / self.replies if self.replies else 0.0
+        lines = [
+            f"requetes {self.requests} (+{self.folds} resumes), "
+            f"{self.estimated} estimees, {self.truncated} coupees a max_tokens",
+            f"tokens entree {self.prompt} (cache {self.cached}), "
+            f"sortie {self.completion} (raisonnement {self.reasoning})",
+            f"cout estime {self._cost()}",
+            f"affichage estime {self.render:.0f} s pour {self.replies} reponses "
+            f"(moyenne {avg:.1f} s)",
+        ]
+        if self.output is not None:
+            lines.append(f"longueur maximale {self.output.describe()}")
+        return lines
@@ -0,0 +1,158 @@
+"""
+Cache disque des réponses d'APOLLO.
+
+Les joueurs reposent souvent les mêmes questions ("What's the story
+Mother?", "status"...). La clé combine la question normalisée (casse,
+accents, ponctuation, blancs), l'empreinte du prompt système et le modèle :
+changer prompt.txt ou --model invalide naturellement les anciennes entrées.
+
+- TTL : une entrée plus vieille que `ttl` secondes n'est plus servie.
+- LRU : au-delà de `size` entrées, les moins récemment servies partent.
+- Approché (optionnel) : si `fuzzy` > 0, une question dont la similarité
+  en trigrammes (Jaccard) avec une entrée atteint ce seuil est servie.
+
+Le fichier est un JSON réécrit atomiquement à chaque ajout. Un même cache
+peut servir plusieurs terminaux (hub) : les accès sont sous verrou.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import unicodedata
+
+TTL = 7 * 24 * 3600   # secondes
+SIZE = 500            # entrées
+
+
+def normalize(text):
+    """'What's the  story, Mother ?' -> 'whats the story mother'."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = ''.join(ch if ch.isalnum() or ch.isspace() else '' if ch == "'" else ' ' for ch in text)
+    return ' '.join(text.split())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def digest(*parts):
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+
+class ResponseCache:
+    def __init__(self, path, ttl=TTL, size=SIZE, fuzzy=0.0):
+        self.path = path
+        self.ttl = ttl
+        self.size = size
+        self.fuzzy = fuzzy
+        self.entries = {}     # clé -> {query, scope, reply, created, used}
+        self.grams = {}       # clé -> trigrammes de la question (approché)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._load()
+
+    # ----- recherche / ajout -----
+
+    def get(self, query, system, model):
+        """Réponse en cache (ou None) et score de similarité (1.0 = exacte)."""
+        with self.lock:
+            return self._get(query, system, model)
+
+    def _get(self, query, system, model):
+        norm = normalize(query)
+        scope = digest(system, model)
+        now = time.time()
+        key = digest(scope, norm)
+        entry = self.entries.get(key)
+        score = 1.0
+        if entry is None and self.fuzzy > 0 and norm:
+            key, score = self._closest(norm, scope, now)
+            entry = self.entries.get(key)
+        if entry is None or now - entry['created'] > self.ttl:
+            self.misses += 1
+            return None, 0.0
+        entry['used'] = now
+        self.hits += 1
+        return entry['reply'], score
+
+    def put(self, query, system, model, reply):
+        norm = normalize(query)
+        if not norm or not reply:
+            return
+        scope = digest(system, model)
+        key = digest(scope, norm)
+        now = time.time()
+        with self.lock:
+            self.entries[key] = {'query': norm, 'scope': scope, 'reply': reply,
+                                 'created': now, 'used': now}
+            self.grams[key] = trigrams(norm)
+            self._evict(now)
+            self._save()
+
+    def clear(self):
+        """Commande MJ : tout oublier."""
+        with self.lock:
+            self.entries.clear()
+            self.grams.clear()
+            self._save()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return (f"{len(self.entries)} entrees, {self.hits}/{self.hits + self.misses} "
+                f"reponses servies ({self.hit_rate:.0%})")
+
+    # ----- interne -----
+
+    def _closest(self, norm, scope, now):
+        grams = trigrams(norm)
+        best, best_score = None, 0.0
+        for key, entry in self.entries.items():
+            if entry['scope'] != scope or now - entry['created'] > self.ttl:
+                continue
+            score = similarity(grams, self.grams[key])
+            if score > best_score:
+                best, best_score = key, score
+        if best_score >= self.fuzzy:
+            return best, best_score
+        return None, 0.0
+
+    def _evict(self, now):
+        for key in [k for k, e in self.entries.items() if now - e['created'] > self.ttl]:
+            del self.entries[key]
+            del self.grams[key]
+        if len(self.entries) > self.size:
+            for key in sorted(self.entries, key=lambda k: self.entries[k]['used'])[:len(self.entries) - self.size]:
+                del self.entries[key]
+                del self.grams[key]
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.grams = {k: trigrams(e['query']) for k, e in self.entries.items()}
+
+    def _save(self):
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[CACHE] ecriture impossible: {e}", flush=True)
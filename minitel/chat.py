@@ -0,0 +1,598 @@
+"""
+Noyau conversationnel d'APOLLO.
+
+Créé une seule fois par le superviseur : l'historique et le client HTTP
+(avec ses connexions) survivent aux allers-retours menu <-> APOLLO.
+
+Mémoire bornée en tokens : les échanges récents sont renvoyés tels quels
+tant qu'ils tiennent dans `budget` tokens. Au-delà, après une réponse, les
+plus anciens sont résumés en tâche de fond et remplacés par un résumé
+glissant. Les messages partent dans un ordre stable
+  prompt système | résumé | échanges récents | question
+pour que le cache de prompt du fournisseur retrouve le préfixe (le prompt
+système, puis le résumé tant qu'il ne change pas).
+
+Avec un LoreIndex (minitel/lore.py), le prompt système est réduit à son
+noyau et seules les sections de lore utiles à la question partent, juste
+avant elle (le préfixe reste ainsi stable d'une question à l'autre).
+
+Avec un ResponseCache (minitel/cache.py), une question déjà posée est
+servie depuis le disque sans appel API.
+
+Avec un Transcript (minitel/transcript.py), chaque échange et chaque résumé
+sont ajoutés au journal sur disque ; à la création, le résumé et les
+échanges récents de la dernière conversation en sont repris.
+
+Relance (optionnelle, hedge_model) : si le modèle principal n'a rendu
+aucun token après hedge_after secondes, la même requête part vers le
+modèle de secours ; le premier des deux qui rend un token gagne, l'autre
+est annulé (flux HTTP fermé). La requête passe alors toujours en flux,
+même pour ask(), puisque la décision se prend au premier token.
+
+Chaque requête a une échéance (deadline, secondes jusqu'au premier token
+ou jusqu'à la réponse entière sans flux, puis entre deux morceaux du flux),
+avec relances espacées au hasard dans ce délai et un disjoncteur commun
+(minitel/breaker.py). Si l'API ne répond pas, ou tant que le disjoncteur est
+ouvert, APOLLO répond tout de suite hors ligne, dans le personnage
+(minitel/offline.py) ; ces réponses ne vont ni dans l'historique, ni dans le
+cache, ni dans le journal.
+
+Le fournisseur (minitel/backends.py : API OpenAI, serveur local compatible,
+ou factice) donne le client et ses capacités : sans flux, ask_stream rend la
+réponse d'un bloc et la relance est coupée ; max_tokens passe sous le nom de
+paramètre du fournisseur.
+
+Avec un OutputBudget (minitel/budget.py) qui a un nombre de pages, le
+max_tokens suit l'écran et le débit (sauf max_tokens explicite), plus la
+réserve de raisonnement caché du modèle interrogé (backend.reserve). Une
+réponse coupée par ce plafond s'affiche mais ne va ni dans le cache, ni
+dans le journal ; une réponse vide (plafond pris par le raisonnement caché)
+est un échec, servi hors ligne. Le Ledger compte tokens, coût et temps
+d'affichage de chaque requête et de la session.
+
+Le hub (minitel/hub.py) crée un ChatCore par terminal avec le client
+partagé de minitel/pool.py ; l'index du lore est commun aux sessions.
+"""
+
+import time
+import asyncio
+import functools
+from pathlib import Path
+from openai import APIConnectionError, RateLimitError, InternalServerError
+from dotenv import load_dotenv
+from minitel import backends, tracing
+from minitel.breaker import retrying, ATTEMPTS
+from minitel.budget import Ledger
+from minitel.lore import LoreIndex, TOP_K
+from minitel.offline import OfflineReplies
+load_dotenv()
+
+try:
+    import tiktoken
+except ImportError:   # optionnel : estimation à ~4 caractères par token
+    tiktoken = None
+
+HISTORY_BUDGET = 2000   # tokens d'échanges récents renvoyés à chaque requête
+KEEP_RATIO = 0.5        # après un résumé, on garde la moitié du budget en clair
+HARD_LIMIT = 3          # x budget : si le résumé échoue, on coupe les plus anciens
+HEDGE_AFTER = 1.5       # secondes sans premier token avant la relance
+DEADLINE = 60.0         # secondes par requête, relances comprises
+# erreurs passagères, relancées (APITimeoutError dérive d'APIConnectionError)
+RETRYABLE = (asyncio.TimeoutError, APIConnectionError, RateLimitError, InternalServerError)
+
+SUMMARY_PROMPT = (
+    "You maintain the memory of an onboard computer talking with players. "
+    "Merge the previous summary and the new exchanges into one short factual "
+    "summary (at most 150 words): questions asked, facts given, decisions, "
+    "names and numbers. No commentary."
+)
+
+_encoding = None
+
+
+def count_tokens(text):
+    """Tokens de text (tiktoken si disponible, sinon estimation)."""
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding('o200k_base')
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def message_tokens(messages):
+    # ~4 tokens d'enveloppe par message
+    return sum(count_tokens(m["content"]) + 4 for m in messages)
+
+
+@functools.lru_cache(maxsize=4)
+def lore_index(system, k):
+    # en lecture seule après construction : partagé entre sessions
+    return LoreIndex(system, k=k)
+
+
+class ChatCore:
+    def __init__(self, model, prompt_file, budget=HISTORY_BUDGET, summary_model=None, cache=None,
+                 lore_k=TOP_K, lore_debug=False, client=None, transcript=None,
+                 hedge_model=None, hedge_after=HEDGE_AFTER, deadline=DEADLINE,
+                 attempts=ATTEMPTS, breaker=None, offline=None, backend=None, max_tokens=0,
+                 output=None, price=None):
+        self.backend = backend or backends.from_env()
+        self.client = client or self.backend.client()
+        self.system = Path(prompt_file).read_text(encoding='utf-8').strip() if prompt_file and Path(prompt_file).exists() else ""
+        self.model = model
+        self.summary_model = summary_model or model
+        self.budget = budget
+        self.summary = ""     # résumé glissant des échanges repliés
+        self.turns = []       # échanges récents (user / assistant)
+        self.folding = None   # tâche de résumé en cours
+        self.cache = cache    # ResponseCache ou None
+        # lore_k = 0 : prompt complet à chaque requête
+        self.index = lore_index(self.system, lore_k) if self.system and lore_k > 0 else None
+        self.core = self.index.core if self.index is not None else self.system
+        self.output = output            # OutputBudget ou None
+        self.fitted = False             # max_tokens tiré de l'écran : raisonnement caché en plus
+        if not max_tokens and output is not None and output.max_tokens():
+            max_tokens, self.fitted = output.max_tokens(), True
+        self.ledger = Ledger((lambda model: price) if price else self.backend.price, output)
+        self.sent = 0                   # tokens d'entrée estimés de la requête en cours
+        self.counted = False            # ... décomptés par le fournisseur
+        self.cut = False                # ... réponse coupée par max_tokens
+        self.lore_debug = lore_debug
+        self.transcript = transcript   # Transcript ou None
+        if hedge_model and not self.backend.caps.streaming:
+            print(f"[APOLLO] relance impossible sans flux ({self.backend.name})", flush=True)
+            hedge_model = None
+        self.hedge_model = hedge_model  # modèle de secours (None : pas de relance)
+        self.max_tokens = max_tokens    # longueur maximale d'une réponse (0 = libre)
+        self.hedge_after = hedge_after
+        self.requests = 0     # requêtes de réponse envoyées au modèle principal
+        self.hedged = 0       # ... relancées vers le secours
+        self.rescued = 0      # ... gagnées par le secours
+        self.deadline = deadline
+        self.attempts = attempts
+        self.breaker = breaker          # CircuitBreaker ou None
+        self.offline = offline or OfflineReplies()
+        if transcript is not None:
+            self.resume()
+
+    def messages(self):
+        """Messages de la requête, préfixe stable d'abord."""
+        msgs = []
+        if self.core:
+            msgs.append({"role": "system", "content": self.core})
+        if self.summary:
+            msgs.append({"role": "system", "content": "Summary of the earlier conversation: " + self.summary})
+        msgs.extend(self.turns[:-1])
+        lore = self._lore()
+        if lore:
+            msgs.append({"role": "system", "content": "Campaign data relevant to the question:\n\n" + lore})
+        msgs.extend(self.turns[-1:])
+        return msgs
+
+    def _lore(self):
+        """Sections pour la question (et la précédente, pour les relances)."""
+        asked = [m["content"] for m in self.turns if m["role"] == "user"][-2:]
+        if self.index is None or not asked:
+            return ''
+        with tracing.span('chat.lore') as sp:
+            hits = self.index.search(asked[-1], ' '.join(asked[:-1]))
+            sp.set(sections=len(hits))
+        if self.lore_debug:
+            picked = ', '.join(f"{s.title} ({score:.1f})" for score, s in hits)
+            print(f"[LORE] {picked or 'aucune section'}", flush=True)
+        return '\n\n'.join(s.text for _, s in hits)
+
+    def resume(self):
+        """Reprend la dernière conversation du journal (redémarrage)."""
+        t0 = time.perf_counter()
+        with tracing.span('chat.resume') as sp:
+            summary, exchanges = self.transcript.context()
+            turns = []
+            for question, reply in exchanges:
+                pair = [{"role": "user", "content": question},
+                        {"role": "assistant", "content": reply}]
+                if turns and message_tokens(pair + turns) > HARD_LIMIT * self.budget:
+                    break
+                turns[:0] = pair
+            self.summary, self.turns = summary, turns
+            sp.set(turns=len(turns) // 2)
+        if turns or summary:
+            print(f"[APOLLO] conversation reprise : {len(turns) // 2} echanges, "
+                  f"resume {count_tokens(summary)} tokens, "
+                  f"{(time.perf_counter() - t0) * 1000:.1f} ms", flush=True)
+
+    def reset(self):
+        """Commande MJ : nouvelle conversation, historique oublié."""
+        self.summary, self.turns = "", []
+        if self.transcript is not None:
+            self.transcript.reset()
+
+    async def warm(self, prime=False):
+        """Avant la première question : tokenizer, ressources du client, connexion.
+
+        prime : mini-requête avec le même préfixe système que les vraies,
+        qui ouvre la connexion et amorce le cache de prompt du fournisseur.
+        Sinon un GET /models (gratuit) suffit à ouvrir la connexion.
+        """
+        message_tokens(self.messages())
+        completions = self.client.chat.completions   # ressources créées à la demande
+        if prime:
+            msgs = [m for m in self.messages()[:1] if m["role"] == "system"]
+            await completions.create(model=self.model, **self.backend.limit(16),
+                                     messages=msgs + [{"role": "user", "content": "ping"}])
+        elif hasattr(self.client, 'models'):
+            await self.client.models.retrieve(self.model)
+        # (client du hub : connexions déjà ouvertes par les autres terminaux)
+
+    async def ask(self, user_text):
+        # mémorise
+        self.turns.append({"role": "user", "content": user_text})
+        cached = self._lookup(user_text)
+        if cached is not None:
+            self.ledger.reply(cached)
+            self._remember(cached)
+            self._journal(user_text, cached)
+            return cached
+        if not self._allowed():
+            self._forget(user_text)
+            return self._offline()
+        try:
+            reply = ((await self._complete()) or '').strip()
+        except asyncio.CancelledError:
+            self._forget(user_text)
+            raise
+        except Exception as e:
+            self._forget(user_text)
+            return self._offline(e)
+        self._charge(reply)
+        if not reply:
+            return self._empty(user_text)
+        self._rendered(reply)
+        self._remember(reply)
+        self._keep(user_text, reply)
+        return reply
+
+    async def ask_stream(self, user_text):
+        """Comme ask, mais rend les morceaux de texte au fil de l'eau."""
+        self.turns.append({"role": "user", "content": user_text})
+        parts = []
+        stream = None
+        try:
+            cached = self._lookup(user_text)
+            if cached is not None:
+                parts.append(cached)
+                yield cached
+            elif not self._allowed():
+                self._forget(user_text)
+                yield self._offline()
+                return
+            else:
+                stream = self._stream()
+                async for delta in stream:
+                    parts.append(delta)
+                    yield delta
+        except (asyncio.CancelledError, GeneratorExit):
+            self._forget(user_text)
+            if stream is not None:
+                # ferme la réponse HTTP maintenant, pas au ramasse-miettes
+                await stream.aclose()
+            raise
+        except Exception as e:
+            # panne avant le premier token, ou en plein flux
+            self._forget(user_text)
+            if parts and isinstance(e, RETRYABLE) and self.breaker is not None:
+                self.breaker.failure()
+            yield '\n\n' + self.offline.interrupted() if parts else self._offline(e)
+            return
+        reply = ''.join(parts).strip()
+        if cached is not None:
+            self.ledger.reply(reply)
+            self._remember(reply)
+            self._journal(user_text, reply)
+            return
+        self._charge(reply)
+        if not reply:
+            yield self._empty(user_text)
+            return
+        self._rendered(reply)
+        self._remember(reply)
+        self._keep(user_text, reply)
+
+    async def _complete(self):
+        """Réponse entière à la question en cours."""
+        if self.hedge_model:
+            # la relance se décide au premier token : requête en flux
+            return ''.join([delta async for delta in self._stream()])
+        # Vous pouvez utiliser soit Chat Completions soit Responses.
+        # Version Chat Completions (simple et stable) :
+        messages = self._request()
+        with tracing.span('chat.ask', model=self.model):
+            resp = await retrying(lambda: self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                **self._limit(self.model),
+            ), self.deadline, RETRYABLE, self.attempts, self.breaker)  # API doc: chat.completions.create :contentReference[oaicite:2]{index=2}
+        self._log_usage(self.model, resp.usage)
+        self._finished(resp.choices[0].finish_reason)
+        return resp.choices[0].message.content
+
+    async def _stream(self):
+        if not self.backend.caps.streaming:
+            # fournisseur sans flux : la réponse d'un bloc
+            yield await self._complete()
+            return
+        t0 = time.perf_counter()
+        messages = self._request()
+        if self.hedge_model:
+            opening = lambda: self._hedged(messages)
+        else:
+            opening = lambda: self._first(self.model, messages)
+        model, chunks, first = await retrying(opening, self.deadline, RETRYABLE,
+                                              self.attempts, self.breaker)
+        tracing.record('chat.first_token', time.perf_counter() - t0, model=model)
+        try:
+            if first:
+                yield first
+            while True:
+                # flux bloqué plus de `deadline` secondes : panne
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), self.deadline)
+                except StopAsyncIteration:
+                    break
+                delta = self._delta(chunk)
+                if delta:
+                    yield delta
+        finally:
+            # annulation ou fin : ferme la réponse HTTP tout de suite
+            await chunks.aclose()
+            tracing.record('chat.stream', time.perf_counter() - t0, model=model)
+
+    async def _first(self, model, messages):
+        """Ouvre le flux de model et le lit jusqu'au premier texte :
+        (model, suite du flux, premier morceau)."""
+        # jusqu'aux en-têtes de la réponse ; le flux entier est chat.stream
+        with tracing.span('chat.request', model=model):
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                **self._stream_options(model),
+            )
+        chunks = self._chunks(stream)
+        try:
+            async for chunk in chunks:
+                delta = self._delta(chunk)
+                if delta:
+                    return model, chunks, delta
+        except BaseException:
+            await chunks.aclose()
+            raise
+        return model, chunks, ''   # réponse vide
+
+    def _limit(self, model):
+        # réserve par modèle : principal et secours peuvent différer
+        n = self.max_tokens
+        if self.fitted:
+            n += self.backend.reserve(model)
+        return self.backend.limit(n)
+
+    def _stream_options(self, model):
+        kw = self._limit(model)
+        if self.backend.caps.stream_usage:
+            kw['stream_options'] = {"include_usage": True}
+        return kw
+
+    async def _chunks(self, stream):
+        # un seul itérateur du début à la fin, fermé avec la réponse HTTP
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.close()
+
+    def _delta(self, chunk):
+        if getattr(chunk, 'usage', None):
+            # dernier morceau, sans choices
+            self._log_usage(getattr(chunk, 'model', None) or self.model, chunk.usage)
+        if not chunk.choices:
+            return None
+        self._finished(chunk.choices[0].finish_reason)
+        return chunk.choices[0].delta.content
+
+    async def _hedged(self, messages):
+        """Premier token du modèle principal, ou du secours s'il arrive
+        avant : relance après hedge_after secondes de silence."""
+        primary = asyncio.ensure_future(self._first(self.model, messages))
+        racers = {primary}
+        try:
+            done, _ = await asyncio.wait(racers, timeout=self.hedge_after)
+            if not done:
+                self.hedged += 1
+                print(f"[APOLLO] pas de token apres {self.hedge_after:.1f} s, "
+                      f"relance sur {self.hedge_model}", flush=True)
+                racers.add(asyncio.ensure_future(self._first(self.hedge_model, messages)))
+            error = None
+            while racers:
+                done, racers = await asyncio.wait(racers, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    if task is not primary:
+                        self.rescued += 1
+                    winner = task.result()
+                    for other in done - {task}:
+                        if other.exception() is None:
+                            await other.result()[1].aclose()   # arrivé ex aequo
+                    return winner
+            raise error
+        finally:
+            # le perdant (ou les deux, si on est annulé) : flux fermé
+            for task in racers:
+                task.cancel()
+
+    # ----- hors ligne -----
+
+    def _allowed(self):
+        return self.breaker is None or self.breaker.allow()
+
+    def _offline(self, error=None):
+        """Réponse immédiate dans le personnage, API indisponible."""
+        if isinstance(error, RETRYABLE):
+            print(f"[APOLLO] API indisponible ({error.__class__.__name__}: {error})", flush=True)
+        elif error is not None:
+            # 4xx... : la réponse hors ligne garde le personnage, la console dit quoi corriger
+            print(f"[APOLLO] requete refusee par l'API, verifier la configuration "
+                  f"({error.__class__.__name__}: {error})", flush=True)
+        retry = self.breaker.retry_in() if self.breaker is not None else 0.0
+        tracing.record('chat.offline', 0.0)
+        return self.offline.reply(retry)
+
+    def hedge_stats(self):
+        if not self.hedge_model:
+            return "relance desactivee"
+        rate = self.hedged / self.requests if self.requests else 0.0
+        return (f"{self.hedged}/{self.requests} requetes relancees ({rate:.0%}), "
+                f"{self.rescued} gagnees par {self.hedge_model}")
+
+    # ----- cache de réponses -----
+
+    def _lookup(self, user_text):
+        if self.cache is None:
+            return None
+        t = time.perf_counter()
+        with tracing.span('chat.cache') as sp:
+            reply, score = self.cache.get(user_text, self.system, self.model)
+            sp.set(hit=reply is not None)
+        if reply is not None:
+            print(f"[CACHE] reponse servie en {(time.perf_counter() - t) * 1000:.1f} ms "
+                  f"(similarite {score:.2f}), {self.cache.stats()}", flush=True)
+        return reply
+
+    def _store(self, user_text, reply):
+        if self.cache is not None:
+            self.cache.put(user_text, self.system, self.model, reply)
+
+    def _forget(self, user_text):
+        # requête annulée : pas de question orpheline dans l'historique
+        if self.turns and self.turns[-1] == {"role": "user", "content": user_text}:
+            self.turns.pop()
+
+    def _keep(self, user_text, reply):
+        # réponse coupée par max_tokens : affichée, pas servie à nouveau ni journalisée
+        if not self.cut:
+            self._store(user_text, reply)
+            self._journal(user_text, reply)
+
+    def _journal(self, user_text, reply):
+        if self.transcript is not None:
+            self.transcript.add(user_text, reply)
+
+    def _remember(self, reply):
+        # mémorise la réponse
+        self.turns.append({"role": "assistant", "content": reply})
+        # au-delà du budget : résumé des plus anciens en tâche de fond
+        if message_tokens(self.turns) > self.budget and self.folding is None:
+            self.folding = asyncio.ensure_future(self._fold())
+
+    # ----- comptes -----
+
+    def _request(self):
+        """Messages d'une nouvelle requête de réponse, comptée."""
+        self.requests += 1
+        messages = self.messages()
+        self.sent, self.counted, self.cut = message_tokens(messages), False, False
+        return messages
+
+    def _finished(self, reason):
+        if reason == 'length':
+            self.cut = True
+            self.ledger.truncated += 1
+            print(f"[APOLLO] reponse coupee a max_tokens ({self.max_tokens})", flush=True)
+
+    def _log_usage(self, model, usage):
+        if usage is None:
+            return
+        self.counted = True
+        cost = self.ledger.add(model, usage)
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached = getattr(details, 'cached_tokens', None) or 0
+        print(f"[APOLLO] tokens entree {usage.prompt_tokens} (cache {cached}), "
+              f"sortie {usage.completion_tokens}, ${cost:.4f}, "
+              f"historique {message_tokens(self.turns)}/{self.budget}, "
+              f"resume {count_tokens(self.summary)}", flush=True)
+
+    def _charge(self, reply):
+        """Réponse reçue : tokens estimés si le fournisseur ne les a pas donnés."""
+        if not self.counted:
+            self.counted = True
+            self.ledger.add(self.model, prompt=self.sent, completion=count_tokens(reply))
+
+    def _empty(self, user_text):
+        """Réponse vide : un échec (plafond pris par le raisonnement caché...)."""
+        self._forget(user_text)
+        print("[APOLLO] reponse vide" + (f", max_tokens {self.max_tokens} atteint" if self.cut else ''),
+              flush=True)
+        return self._offline()
+
+    def _rendered(self, reply):
+        seconds = self.ledger.reply(reply)
+        if seconds:
+            print(f"[APOLLO] affichage estime {seconds:.1f} s", flush=True)
+
+    def usage_report(self, name=None):
+        """Rapport de fin de session (console), name : terminal du hub."""
+        who = f" {name}" if name else ''
+        for line in self.ledger.report():
+            print(f"[COMPTES{who}] {line}", flush=True)
+
+    # ----- résumé glissant -----
+
+    def _oldest(self):
+        """Nombre d'échanges les plus anciens à replier (paires entières)."""
+        keep = self.budget * KEEP_RATIO
+        n = 0
+        while n + 2 <= len(self.turns) - 2 and message_tokens(self.turns[n:]) > keep:
+            n += 2
+        return n
+
+    async def _fold(self):
+        try:
+            n = self._oldest()
+            if not n:
+                return
+            old = self.turns[:n]
+            transcript = '\n'.join(f"{m['role'].upper()}: {m['content']}" for m in old)
+            try:
+                if not self._allowed():
+                    raise RuntimeError("disjoncteur ouvert")
+                with tracing.span('chat.fold', turns=n):
+                    resp = await retrying(lambda: self.client.chat.completions.create(
+                        model=self.summary_model,
+                        messages=[
+                            {"role": "system", "content": SUMMARY_PROMPT},
+                            {"role": "user", "content": f"Previous summary:\n{self.summary or '(none)'}\n\nNew exchanges:\n{transcript}"},
+                        ],
+                    ), self.deadline, RETRYABLE, self.attempts, self.breaker)
+                summary = resp.choices[0].message.content.strip()
+                if resp.usage is not None:
+                    self.ledger.add(self.summary_model, resp.usage, fold=True)
+                else:
+                    self.ledger.add(self.summary_model, fold=True, completion=count_tokens(summary),
+                                    prompt=count_tokens(SUMMARY_PROMPT + transcript))
+            except Exception as e:
+                print(f"[APOLLO] resume impossible: {e}", flush=True)
+                if message_tokens(self.turns) > HARD_LIMIT * self.budget:
+                    # pas de résumé : on coupe les plus anciens
+                    del self.turns[:n]
+                return
+            # pendant le résumé, seuls des échanges ont pu s'ajouter à la fin
+            if self.turns[:n] == old:
+                del self.turns[:n]
+                self.summary = summary
+                if self.transcript is not None:
+                    kept = sum(1 for m in self.turns if m["role"] == "assistant")
+                    self.transcript.fold(summary, kept)
+        finally:
+            self.folding = None
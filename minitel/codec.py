@@ -0,0 +1,271 @@
+"""
+Codec « minitel » : texte Unicode -> octets affichables par le Minitel.
+
+Le port est en 7 bits (7E1) : un é Latin-1 (0xE9) y arrive en 'i'. Tout
+passe donc par une seule table str.translate, complétée à la demande
+(__missing__) puis mémorisée :
+  - guillemets, tirets, espaces et points de suspension typographiques,
+  - compatibilité Unicode (NFKD : ligatures, chiffres en exposant...),
+  - lettres accentuées ramenées à leur lettre de base (é -> e),
+  - ou, accents G2 activés, lettres accentuées et quelques symboles
+    envoyés en séquences Vidéotex SS2 (0x19) + diacritique + lettre,
+  - contrôles hors CR/LF/TAB et caractères sans équivalent -> '?'.
+
+Deux tables par mode :
+  sanitize(s)  texte -> caractères d'écran, un par case (découpage en
+               lignes, écran virtuel)
+  encode(s)    texte -> octets envoyés (cells() : une case -> octets)
+
+  'Café'.encode('minitel')       b'Cafe'
+  'Café'.encode('minitel-g2')    b'Caf\\x19Be'
+  codecs.getincrementalencoder('minitel')()   pour un flux (accent
+      combinant arrivant dans le morceau suivant)
+
+configure(accents) choisit le mode par défaut (--accents) ; tous les
+Minitels n'affichent pas le jeu G2 dans le mode 80 colonnes.
+"""
+
+import re
+import codecs
+import unicodedata
+
+SS2 = '\x19'
+
+TRANSLIT_MAP = {
+    '\u201c':'"', '\u201d':'"', '\u2018':"'", '\u2019':"'", '\u2014':'-', '\u2013':'-',
+    '\u2022':'*', '\u2026':'...', '\u00a0':' ', '\u2009':' ', '\u202f':' ',
+    '\u00ab':'"', '\u00bb':'"', '\u201e':'"', '\u2039':"'", '\u203a':"'",
+    '\u2212':'-', '\u00b7':'.', '\u2044':'/',
+}
+
+# diacritiques du jeu G2 (caractère combinant -> code après SS2)
+DIACRITICS = {'\u0300': 'A', '\u0301': 'B', '\u0302': 'C', '\u0308': 'H', '\u0327': 'K'}
+
+# symboles du jeu G2
+G2_SYMBOLS = {
+    '£': '#', '§': "'", '←': ',', '↑': '-', '→': '.', '↓': '/', '°': '0',
+    '±': '1', '÷': '8', '¼': '<', '½': '=', '¾': '>', 'Œ': 'j', 'œ': 'z', 'ß': '{',
+}
+
+# sans G2 (ou hors G2) : équivalents ASCII
+FOLD = {
+    'Œ': 'OE', 'œ': 'oe', 'Æ': 'AE', 'æ': 'ae', 'ß': 'ss', 'Ø': 'O', 'ø': 'o',
+    'Ð': 'D', 'ð': 'd', 'Þ': 'Th', 'þ': 'th', 'Ł': 'L', 'ł': 'l', 'ı': 'i',
+    '£': 'L', '§': 'S', '°': 'o', '±': '+/-', '÷': '/', '×': 'x',
+    '←': '<-', '→': '->', '↑': '^', '↓': 'v', '©': '(c)', '®': '(r)',
+    '¡': '!', '¿': '?', '€': 'EUR', '¢': 'c', '¥': 'Y',
+}
+
+
+def _g2_wire():
+    """Case -> séquence G2 : lettres ASCII + un diacritique, symboles."""
+    wire = {ch: SS2 + code for ch, code in G2_SYMBOLS.items()}
+    for base in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ':
+        for mark, code in DIACRITICS.items():
+            composed = unicodedata.normalize('NFC', base + mark)
+            if len(composed) == 1:
+                wire[composed] = SS2 + code + base
+    return wire
+
+
+G2_WIRE = _g2_wire()
+G2_TEXT = {v: k for k, v in G2_WIRE.items()}
+_G2_SEQ = re.compile(SS2 + '(?:[ABCHK][A-Za-z]|[#\',\\-./018<=>jz{])')
+
+
+def _cell(ch, g2):
+    """Caractère(s) d'écran pour ch : ASCII, ou case G2 si g2."""
+    if ch in '\r\n\t':
+        return ch
+    o = ord(ch)
+    if o < 32 or o == 127 or 0x80 <= o < 0xA0:
+        return '?'
+    if o < 128:
+        return ch
+    if ch in TRANSLIT_MAP:
+        return TRANSLIT_MAP[ch]
+    if g2 and ch in G2_WIRE:
+        return ch
+    if ch in FOLD:
+        return FOLD[ch]
+    if unicodedata.combining(ch):
+        return ''                       # accent isolé : ignoré
+    decomposed = unicodedata.normalize('NFKD', ch)
+    if decomposed != ch:
+        if g2:
+            composed = unicodedata.normalize('NFC', decomposed)
+            if composed in G2_WIRE:     # compatibilité (ﬀ, ², ...) puis accent
+                return composed
+        return ''.join(_cell(c, g2) for c in decomposed)
+    return '?'
+
+
+class _Table(dict):
+    """Table str.translate remplie au premier passage de chaque caractère."""
+
+    def __init__(self, build):
+        super().__init__()
+        self.build = build
+
+    def __missing__(self, o):
+        out = self[o] = self.build(chr(o))
+        return out
+
+
+def _text(g2):
+    return _Table(lambda ch: _cell(ch, g2))
+
+
+def _wire(g2):
+    return _Table(lambda ch: ''.join(G2_WIRE.get(c, c) for c in _cell(ch, g2)))
+
+
+class _Cells(dict):
+    """Case de l'écran virtuel -> octets."""
+
+    def __init__(self, wire):
+        super().__init__()
+        self.wire = wire
+
+    def __missing__(self, ch):
+        out = self[ch] = ch.translate(self.wire).encode('latin-1')
+        return out
+
+
+_TABLES = {}   # g2 -> (texte, octets, cases)
+for _mode in (False, True):
+    _TABLES[_mode] = (_text(_mode), _wire(_mode))
+    _TABLES[_mode] += (_Cells(_TABLES[_mode][1]),)
+
+ACCENTS = False
+
+
+def configure(accents):
+    """Mode par défaut : accents G2 (True) ou lettres de base (False)."""
+    global ACCENTS
+    ACCENTS = bool(accents)
+
+
+def encoding():
+    return 'minitel-g2' if ACCENTS else 'minitel'
+
+
+def _g2(g2):
+    return ACCENTS if g2 is None else g2
+
+
+def _nfc(s):
+    # e + U+0301 -> é avant la table, comme en flux (_Pending)
+    if not s.isascii():
+        s = unicodedata.normalize('NFC', s)
+    return s
+
+
+def sanitize(s, g2=None):
+    """Texte prêt pour l'écran : un caractère par case."""
+    return _nfc(s).translate(_TABLES[_g2(g2)][0])
+
+
+def encode(s, g2=None):
+    """Octets à envoyer pour s."""
+    return _nfc(s).translate(_TABLES[_g2(g2)][1]).encode('latin-1')
+
+
+def cells(g2=None):
+    """Dictionnaire case -> octets (minitel/screen.py)."""
+    return _TABLES[_g2(g2)][2]
+
+
+def decode(data):
+    """Octets du Minitel -> texte (séquences G2 recomposées)."""
+    text = bytes(data).decode('latin-1')
+    if SS2 in text:
+        text = _G2_SEQ.sub(lambda m: G2_TEXT.get(m.group(0), '?'), text)
+    return text
+
+
+# ----- flux -----
+
+class _Pending:
+    """Garde la dernière lettre d'un morceau (et ses accents) : un accent
+    combinant peut arriver au début du suivant (e + U+0301 -> é)."""
+
+    def __init__(self):
+        self.pending = ''
+
+    def take(self, text, final):
+        text = self.pending + text
+        if final or not text:
+            self.pending = ''
+        else:
+            # dernière lettre et ses accents déjà arrivés
+            cut = len(text) - 1
+            while cut > 0 and unicodedata.combining(text[cut]):
+                cut -= 1
+            text, self.pending = text[:cut], text[cut:]
+        return _nfc(text)
+
+
+class IncrementalSanitizer(_Pending):
+    """sanitize() morceau par morceau ; sanitize('', True) en fin de flux."""
+
+    def __init__(self, g2=None):
+        super().__init__()
+        self.table = _TABLES[_g2(g2)][0]
+
+    def __call__(self, text, final=False):
+        return self.take(text, final).translate(self.table)
+
+
+def _codec(g2):
+    wire = _TABLES[g2][1]
+
+    def enc(text, errors='strict'):
+        return _nfc(text).translate(wire).encode('latin-1'), len(text)
+
+    def dec(data, errors='strict'):
+        return decode(data), len(data)
+
+    class IncrementalEncoder(codecs.IncrementalEncoder, _Pending):
+        def __init__(self, errors='strict'):
+            codecs.IncrementalEncoder.__init__(self, errors)
+            _Pending.__init__(self)
+
+        def encode(self, text, final=False):
+            return self.take(text, final).translate(wire).encode('latin-1')
+
+        def reset(self):
+            self.pending = ''
+
+    class IncrementalDecoder(codecs.IncrementalDecoder):
+        def __init__(self, errors='strict'):
+            super().__init__(errors)
+            self.pending = b''
+
+        def decode(self, data, final=False):
+            data = self.pending + bytes(data)
+            # séquence G2 coupée : on attend la suite
+            cut = data.rfind(b'\x19')
+            tail = data[cut + 1:] if cut >= 0 else None
+            if not final and tail is not None and (not tail or tail in (b'A', b'B', b'C', b'H', b'K')):
+                data, self.pending = data[:cut], data[cut:]
+            else:
+                self.pending = b''
+            return decode(data)
+
+        def reset(self):
+            self.pending = b''
+
+    return codecs.CodecInfo(name='minitel-g2' if g2 else 'minitel', encode=enc, decode=dec,
+                            incrementalencoder=IncrementalEncoder,
+                            incrementaldecoder=IncrementalDecoder)
+
+
+_CODECS = {'minitel': _codec(False), 'minitel_g2': _codec(True)}
+
+
+def _search(name):
+    return _CODECS.get(name.replace('-', '_'))
+
+
+codecs.register(_search)
@@ -0,0 +1,163 @@
+"""
+Hub : un seul processus pour plusieurs Minitels et terminaux de PC.
+
+Chaque terminal (port série, pty, connexion TCP) a son thread, son écran
+virtuel, sa boucle asyncio et sa session APOLLO (ChatCore, historique),
+comme un boot.py. Sont partagés : l'interpréteur, terminfo, les sons
+décodés, le cache de réponses, l'index du lore et un seul client OpenAI
+(minitel/pool.py) avec une limite globale de requêtes en vol (--concurrency)
+et de débit (--api-rate, requêtes par minute).
+
+Un terminal qui se déconnecte (port débranché, client TCP parti) libère
+sa session ; un port série ou un pty est relancé sur l'écran de départ.
+
+Usage:
+  python hub.py --serial /dev/ttyUSB0 --serial /dev/ttyUSB1 --baud 4800
+  python hub.py --pty 2 --listen 0.0.0.0:2323 --concurrency 3 --api-rate 30
+  (pty : screen /dev/pts/N ; TCP : nc <hôte> 2323, terminal en mode brut)
+"""
+
+import os
+import sys
+import glob
+import time
+import socket
+import threading
+
+from minitel import audio, backends, codec, terminfo, serial_writer, tracing, supervisor
+from minitel.cache import ResponseCache
+from minitel.pool import ApiPool, CONCURRENCY
+from minitel.port import open_port, open_pty, socket_port
+
+RETRY = 5.0   # secondes avant de rouvrir un port série en erreur
+
+
+def log(msg):
+    # une seule écriture : les lignes des threads ne s'entremêlent pas
+    sys.stdout.write(msg + '\n')
+    sys.stdout.flush()
+
+
+class Hub:
+    def __init__(self, args):
+        self.args = args
+        self.pool = ApiPool(args.concurrency, args.api_rate, backends.from_env(args.backend))
+        self.cache = None
+        if not args.no_cache:
+            self.cache = ResponseCache(os.path.join(supervisor.ROOT, args.cache_file),
+                                       ttl=args.cache_ttl, size=args.cache_size,
+                                       fuzzy=args.cache_fuzzy)
+        self.sessions = {}   # nom -> Context
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def spawn(self, name, target, *params):
+        threading.Thread(target=target, args=params, daemon=True, name=name).start()
+
+    def session(self, ser, name):
+        """Une session complète sur un port ; rend la main à la déconnexion."""
+        ctx = supervisor.Context(ser, self.args, name=name)
+        ctx.client = self.pool.client_for()
+        ctx.cache = self.cache
+        with self.lock:
+            self.sessions[name] = ctx
+        log(f"[HUB] {name} : session ouverte ({len(self.sessions)} terminaux)")
+        try:
+            supervisor.run(ctx, self.args.start)
+        except Exception as e:
+            if not self.stopping.is_set():
+                log(f"[HUB] {name} : fin de session ({e})")
+        finally:
+            with self.lock:
+                self.sessions.pop(name, None)
+            try: serial_writer.close(ser)
+            except Exception: pass
+            ctx.close()
+
+    # ----- points d'accès -----
+
+    def serve_serial(self, device):
+        while not self.stopping.is_set():
+            try:
+                ser = open_port(device, self.args.baud)
+            except Exception as e:
+                log(f"[HUB] {device} : ouverture impossible ({e})")
+                time.sleep(RETRY)
+                continue
+            self.session(ser, device)
+
+    def serve_pty(self, n):
+        port, path = open_pty(self.args.baud)
+        log(f"[HUB] pty{n} : {path}")
+        while not self.stopping.is_set():
+            self.session(port, f"pty{n}")
+            # session finie (scène terminée) : nouveau pty
+            port, path = open_pty(self.args.baud)
+            log(f"[HUB] pty{n} : {path}")
+
+    def serve_tcp(self, listen):
+        host, _, port = listen.rpartition(':')
+        server = socket.create_server((host or '0.0.0.0', int(port)))
+        log(f"[HUB] TCP en écoute sur {host or '0.0.0.0'}:{port}")
+        while not self.stopping.is_set():
+            conn, _ = server.accept()
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            ser = socket_port(conn, self.args.baud)
+            self.spawn(ser.port, self.session, ser, ser.port)
+
+    def start(self):
+        args = self.args
+        for device in args.serial or []:
+            self.spawn(device, self.serve_serial, device)
+        for n in range(1, args.pty + 1):
+            self.spawn(f"pty{n}", self.serve_pty, n)
+        if args.listen:
+            self.spawn('tcp', self.serve_tcp, args.listen)
+
+    def close(self):
+        self.stopping.set()
+        with self.lock:
+            sessions = list(self.sessions.values())
+        for ctx in sessions:
+            # débloque les lectures en cours : la session se termine seule
+            try: ctx.ser.close()
+            except Exception: pass
+        self.pool.close()
+
+
+def build_parser():
+    parser = supervisor.build_parser('boot')
+    parser.description = 'Hub multi-terminaux : Minitels, pty et TCP dans un seul processus'
+    parser.add_argument('--serial', action='append', help='port série d\'un Minitel (répétable)')
+    parser.add_argument('--pty', type=int, default=0, help='nombre de pty à ouvrir')
+    parser.add_argument('--listen', default=None, help='HÔTE:PORT des terminaux TCP')
+    parser.add_argument('--start', default='boot', choices=sorted(supervisor.SCENES),
+                        help='écran de départ de chaque terminal')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY,
+                        help='requêtes API simultanées, tous terminaux confondus')
+    parser.add_argument('--api-rate', type=float, default=0.0,
+                        help='requêtes API par minute, tous terminaux confondus (0 = libre)')
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    if not (args.serial or args.pty or args.listen):
+        args.serial = [args.device]
+    tracing.configure(args.trace, args.metrics_port)
+    terminfo.set_term(args.term or terminfo.TERMNAME)
+    codec.configure(args.accents)
+    audio.configure(args.audio)
+    audio.preload(sorted(glob.glob(os.path.join(supervisor.ROOT, '*.wav'))))
+
+    hub = Hub(args)
+    hub.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print('Exiting.')
+    finally:
+        hub.close()
+        audio.shutdown()
+        tracing.shutdown()
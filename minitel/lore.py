@@ -0,0 +1,120 @@
+"""
+Index des sections de prompt.txt : seul le lore utile part avec la question.
+
+Au chargement, le prompt est découpé en paragraphes (lignes vides). Un
+paragraphe dont la première ligne est un titre en capitales ("FORT
+NEBRASKA:", "BASE SUBLEVEL 02:", "BASE PERSONNEL"...) ouvre une section ;
+les autres paragraphes complètent la section en cours. Tout ce qui précède
+le premier titre (règles du jeu, contexte) forme le noyau, toujours envoyé,
+avec les sections de ALWAYS (identité, date, état actuel et limites
+d'APOLLO).
+
+Les autres sections sont indexées en mémoire (index inversé, score BM25)
+et seules les `k` meilleures pour la question partent avec elle.
+"""
+
+import re
+import math
+import unicodedata
+from collections import Counter
+
+ALWAYS = ('APOLLO', 'FORT NEBRASKA', 'OTHER INFO', 'RECENTLY', 'CAPABILITIES')
+TOP_K = 3
+CONTEXT_WEIGHT = 0.5   # poids de la question précédente (relances : "et son grade ?")
+MIN_RATIO = 0.3        # une section doit atteindre 30 % du meilleur score
+K1 = 1.2
+B = 0.75
+
+STOPWORDS = set("""
+a an and are as at be but by can do does for from has have how i in is it its
+me my of on or our so that the their them there these they this to us was we
+what when where which who why will with you your
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return [w for w in _WORD.findall(text) if w not in STOPWORDS]
+
+
+def heading(line):
+    """Titre de section ('FORT NEBRASKA') ou None."""
+    title = line.strip().lstrip('=').split(':', 1)[0].strip()
+    letters = [ch for ch in title if ch.isalpha()]
+    if len(letters) < 3 or title.upper() != title:
+        return None
+    return title
+
+
+class Section:
+    def __init__(self, title, text):
+        self.title = title
+        self.text = text
+        # le titre compte double
+        self.terms = Counter(tokenize(title) * 2 + tokenize(text))
+        self.length = sum(self.terms.values())
+
+
+def split_prompt(prompt):
+    """(noyau, [Section]) depuis le texte de prompt.txt."""
+    core, sections = [], []
+    title, body = None, []
+    for para in re.split(r'\n\s*\n', prompt.strip()):
+        first = para.strip().splitlines()[0] if para.strip() else ''
+        new = heading(first)
+        if new is not None:
+            if title is not None:
+                sections.append(Section(title, '\n\n'.join(body)))
+            title, body = new, [para.strip()]
+        elif title is None:
+            core.append(para.strip())
+        else:
+            body.append(para.strip())
+    if title is not None:
+        sections.append(Section(title, '\n\n'.join(body)))
+    return '\n\n'.join(core), sections
+
+
+class LoreIndex:
+    def __init__(self, prompt, k=TOP_K, always=ALWAYS):
+        core, sections = split_prompt(prompt)
+        pinned = [s for s in sections if s.title in always]
+        self.core = '\n\n'.join([core] + [s.text for s in pinned])
+        self.sections = [s for s in sections if s.title not in always]
+        self.k = k
+        # index inversé : terme -> [(section, fréquence)]
+        self.postings = {}
+        for i, s in enumerate(self.sections):
+            for term, tf in s.terms.items():
+                self.postings.setdefault(term, []).append((i, tf))
+        n = len(self.sections)
+        self.avg_length = sum(s.length for s in self.sections) / n if n else 0
+        self.idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+                    for t, p in self.postings.items()}
+
+    def search(self, query, context=''):
+        """[(score, Section)] des k meilleures sections pour query.
+
+        context (la question précédente) compte pour CONTEXT_WEIGHT.
+        """
+        scores = Counter()
+        self._score(scores, query, 1.0)
+        if context:
+            self._score(scores, context, CONTEXT_WEIGHT)
+        best = scores.most_common(self.k)
+        if not best:
+            return []
+        floor = best[0][1] * MIN_RATIO
+        return [(score, self.sections[i]) for i, score in best if score >= floor]
+
+    def _score(self, scores, text, weight):
+        for term in set(tokenize(text)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self.postings[term]:
+                norm = K1 * (1 - B + B * self.sections[i].length / self.avg_length)
+                scores[i] += weight * idf * tf * (K1 + 1) / (tf + norm)
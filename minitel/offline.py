@@ -0,0 +1,60 @@
+"""
+Réponses hors ligne d'APOLLO, dans le personnage.
+
+Quand l'API ne répond pas (disjoncteur ouvert, échéance dépassée), APOLLO
+répond tout de suite avec un des gabarits de offline.txt au lieu d'afficher
+l'erreur. Les gabarits sont séparés par une ligne vide et peuvent contenir
+{retry} (secondes avant le prochain essai) et {time} (heure du vaisseau).
+Ils sont servis à tour de rôle : deux questions de suite n'ont pas la même
+réponse.
+"""
+
+import time
+import itertools
+
+from minitel.text import read_text_lines
+
+DEFAULT = [
+    "COMMUNICATION ARRAY OFFLINE.\nNEXT HANDSHAKE IN {retry} SECONDS.",
+    "STATUS REPORT {time}\nCOMMUNICATIONS ... OFFLINE\nAPOLLO CORE ...... UNREACHABLE",
+]
+INTERRUPTED = "*** TRANSMISSION INTERRUPTED. COMMUNICATION ARRAY OFFLINE. ***"
+
+
+def load(path):
+    """Gabarits du fichier (blocs séparés par une ligne vide)."""
+    blocks, block = [], []
+    for line in read_text_lines(path) + ['']:
+        if line.strip():
+            block.append(line.rstrip())
+        elif block:
+            blocks.append('\n'.join(block))
+            block = []
+    return blocks
+
+
+class OfflineReplies:
+    def __init__(self, path=None):
+        templates = DEFAULT
+        if path:
+            try:
+                templates = load(path) or DEFAULT
+            except OSError:
+                pass
+        self.templates = templates
+        self.turn = itertools.cycle(templates)
+        self.served = 0
+
+    def reply(self, retry=0.0):
+        self.served += 1
+        values = {'retry': max(1, round(retry)), 'time': time.strftime('%H:%M')}
+        template = next(self.turn)
+        try:
+            return template.format(**values)
+        except (KeyError, IndexError, ValueError):
+            return template   # accolades inconnues : tel quel
+
+    def interrupted(self):
+        """Fin de réponse coupée par une panne en plein flux."""
+        self.served += 1
+        return INTERRUPTED
@@ -0,0 +1,58 @@
+"""
+Pagination d'un texte déjà découpé en lignes, dans les deux sens.
+
+L'index des pages est construit une fois par réponse ou par document.
+render(screen, n) renvoie les octets qui amènent la fenêtre à la page n,
+une trame par ligne (affichage synchronisé avec le son) : seules les
+différences avec la page affichée partent, via l'écran virtuel. Le flot de
+chaque changement de page (depuis la page affichée, à curseur égal) est
+mémorisé : SUITE, RETOUR ou un saut de page déjà vus sont rejoués sans
+recalcul.
+
+Usage:
+  pager = Pager(lines, top=4, bottom=23)
+  for data in pager.render(screen, 0): send(ser, data)
+"""
+
+
+class Pager:
+    def __init__(self, lines, top, bottom, left=1, width=None):
+        self.top = top
+        self.bottom = bottom
+        self.left = left
+        self.width = width
+        height = bottom - top + 1
+        self.pages = [lines[i:i + height] for i in range(0, len(lines), height)] or [[]]
+        self.current = None   # page affichée (None : fenêtre inconnue)
+        self.cache = {}       # (depuis, vers, curseur...) -> (trames, lignes, curseur, attribut)
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.pages)
+
+    def clamp(self, n):
+        return min(max(n, 0), len(self.pages) - 1)
+
+    def render(self, screen, n):
+        """Trames (une par ligne de la fenêtre) pour afficher la page n."""
+        rows = range(self.top, self.bottom + 1)
+        known = self.current is not None and screen.have is not None
+        key = (self.current, n, screen.cursor, screen.standout, screen.target)
+        hit = self.cache.get(key) if known else None
+        if hit is not None:
+            frames, lines, cursor, standout = hit
+            for r, line in zip(rows, lines):
+                screen.want[r - 1] = line[:]
+                screen.have[r - 1] = line[:]
+            screen.cursor, screen.standout = cursor, standout
+            self.hits += 1
+        else:
+            screen.clear_rows(self.top, self.bottom)
+            for i, line in enumerate(self.pages[n]):
+                screen.put(self.top + i, self.left, line[:self.width] if self.width else line)
+            frames = [screen.flush(r, r) for r in rows]
+            if known:
+                self.cache[key] = (frames, [screen.want[r - 1][:] for r in rows],
+                                   screen.cursor, screen.standout)
+        self.current = n
+        return frames
@@ -0,0 +1,147 @@
+"""
+Client OpenAI partagé par plusieurs terminaux (hub, minitel/hub.py).
+
+Chaque terminal a sa propre boucle asyncio dans son thread ; un client
+AsyncOpenAI (et ses connexions httpx) appartient à une seule boucle. Le
+pool garde donc un unique AsyncOpenAI dans un thread à lui, et chaque
+terminal reçoit un PooledClient qui y relaie ses appels
+(chat.completions.create, flux compris) par run_coroutine_threadsafe.
+Le client est celui du fournisseur choisi (minitel/backends.py).
+
+Limites globales, tous terminaux confondus :
+  concurrency  requêtes en vol au plus (un flux compte jusqu'à sa fermeture),
+               donc autant de connexions HTTP actives, gardées ouvertes
+  rate         requêtes par minute (seau à jetons, 0 = pas de limite)
+L'annulation côté terminal (ANNULATION) annule la requête dans le pool.
+"""
+
+import time
+import asyncio
+import threading
+
+from minitel import backends
+
+CONCURRENCY = 4
+
+
+class ApiPool:
+    def __init__(self, concurrency=CONCURRENCY, rate=0.0, backend=None):
+        self.backend = backend or backends.from_env()
+        self.concurrency = concurrency
+        self.rate = rate / 60.0                 # requêtes par seconde
+        self.tokens = float(concurrency)
+        self.last = time.monotonic()
+        self.active = 0                         # requêtes en vol (statistiques)
+        self.requests = 0
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True, name='api-pool')
+        self.thread.start()
+        self.client, self.slots = self.call_sync(self._setup())
+
+    async def _setup(self):
+        # créés dans la boucle du pool, à laquelle ils restent attachés
+        return self.backend.client(), asyncio.Semaphore(self.concurrency)
+
+    def client_for(self):
+        """Client à donner à un ChatCore (même interface qu'AsyncOpenAI)."""
+        return PooledClient(self)
+
+    async def call(self, coro):
+        """Exécute coro dans la boucle du pool, depuis la boucle d'un terminal."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    def call_sync(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        try:
+            self.call_sync(self.client.close())
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=2.0)
+
+    def stats(self):
+        return f"{self.requests} requetes, {self.active}/{self.concurrency} en vol"
+
+    # ----- dans la boucle du pool -----
+
+    async def create(self, kw):
+        await self._admit()
+        await self.slots.acquire()
+        self.active += 1
+        self.requests += 1
+        try:
+            resp = await self.client.chat.completions.create(**kw)
+        except BaseException:
+            self._release()
+            raise
+        if kw.get('stream'):
+            return PooledStream(self, resp)   # place rendue à la fermeture du flux
+        self._release()
+        return resp
+
+    def _release(self):
+        self.active -= 1
+        self.slots.release()
+
+    async def _admit(self):
+        if not self.rate:
+            return
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.concurrency, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class PooledClient:
+    """Façade client.chat.completions.create(...) d'un terminal vers le pool."""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    @property
+    def chat(self):
+        return self
+
+    @property
+    def completions(self):
+        return self
+
+    async def create(self, **kw):
+        return await self.pool.call(self.pool.create(kw))
+
+
+class PooledStream:
+    """Flux ouvert dans le pool, parcouru depuis la boucle du terminal."""
+
+    def __init__(self, pool, stream):
+        self.pool = pool
+        self.stream = stream
+        self.open = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.pool.call(self._next())
+
+    async def close(self):
+        await self.pool.call(self._close())
+
+    async def _next(self):
+        try:
+            return await self.stream.__anext__()
+        except BaseException:
+            await self._close()
+            raise
+
+    async def _close(self):
+        if self.open:
+            self.open = False
+            self.pool._release()
+            await self.stream.close()
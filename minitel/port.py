@@ -0,0 +1,106 @@
+"""
+Ouverture du port série du Minitel 1B (7E1, XON/XOFF).
+
+FdPort présente un pty ou une connexion TCP comme un port série (hub
+multi-terminaux, minitel/hub.py).
+"""
+
+import os
+import pty
+import tty
+import fcntl
+import select
+import struct
+import termios
+
+import serial
+
+SERIAL_DEVICE = '/dev/ttyUSB0'
+BAUD = 4800
+
+
+def open_port(device=SERIAL_DEVICE, baud=BAUD):
+    return serial.Serial(
+        device,
+        baudrate=baud,
+        bytesize=serial.SEVENBITS,
+        parity=serial.PARITY_EVEN,
+        stopbits=serial.STOPBITS_ONE,
+        xonxoff=True,
+        rtscts=False,
+        dsrdtr=False,
+        timeout=0.1,
+        write_timeout=1.0,
+        inter_byte_timeout=0.05,
+    )
+
+
+class FdPort:
+    """Descripteur (maître d'un pty, socket) avec l'interface de serial.Serial
+    utilisée par le programme : read avec délai, in_waiting, write, fileno.
+
+    baudrate et le tramage 7E1 ne servent qu'au cadencement de serial_writer :
+    un terminal de PC reçoit l'affichage au rythme d'un Minitel.
+    """
+    bytesize = 7
+    parity = 'E'
+    stopbits = 1
+    out_waiting = 0
+
+    def __init__(self, fd, name, baud=BAUD, timeout=0.1, keep=()):
+        self.fd = fd
+        self.port = name
+        self.baudrate = baud
+        self.timeout = timeout
+        self.keep = keep   # autres descripteurs à fermer avec le port
+
+    def fileno(self):
+        return self.fd
+
+    @property
+    def in_waiting(self):
+        return struct.unpack('i', fcntl.ioctl(self.fd, termios.FIONREAD, b'\0' * 4))[0]
+
+    def read(self, size=1):
+        """Jusqu'à size octets, b'' après `timeout` secondes sans rien."""
+        r, _, _ = select.select([self.fd], [], [], self.timeout)
+        if not r:
+            return b''
+        data = os.read(self.fd, size)
+        if not data:
+            raise ConnectionError(f"{self.port} : terminal deconnecte")
+        return data
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        for fd in (self.fd,) + tuple(self.keep):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def open_pty(baud=BAUD):
+    """Nouveau pty : (port côté programme, chemin de l'esclave à ouvrir).
+
+    L'esclave reste ouvert ici : un client (screen, picocom, minicom) peut
+    s'y connecter et s'en aller sans couper la session.
+    """
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    path = os.ttyname(slave)
+    return FdPort(master, path, baud, keep=(slave,)), path
+
+
+def socket_port(sock, baud=BAUD):
+    """Connexion TCP acceptée -> port (le port devient propriétaire du socket)."""
+    host, port = sock.getpeername()[:2]
+    return FdPort(sock.detach(), f"tcp:{host}:{port}", baud)
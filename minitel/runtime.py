@@ -0,0 +1,239 @@
+"""
+Clavier du Minitel : décodage des touches et lecture sans attente active.
+
+KeyDecoder transforme les octets reçus en touches : les touches de fonction
+du Minitel (ENVOI, RETOUR, SUITE, ANNULATION, CORRECTION, GUIDE,
+REPETITION, SOMMAIRE) arrivent sous forme de noms, le reste en caractères
+(accents G2 recomposés). Une séquence coupée entre deux lectures est gardée
+jusqu'à la suivante, ou rendue telle quelle après SEQ_TIMEOUT.
+
+Deux lecteurs, tous deux en attente sur le descripteur (select ou
+add_reader, aucun réveil périodique) et lisant tout ce qui est arrivé d'un
+coup (in_waiting) :
+  KeyReader  lecture bloquante pour les écrans synchrones (boot, menu),
+             un par session (ctx.keys) : la frappe anticipée passe d'un
+             écran à l'autre
+  Keyboard   asyncio.Queue pour APOLLO (add_reader, sinon un thread)
+Si la lecture échoue (port débranché, client TCP parti), l'erreur remonte
+et la scène s'arrête.
+"""
+
+import sys
+import time
+import select
+import asyncio
+import threading
+from collections import deque
+
+from minitel.codec import G2_TEXT
+
+ENVOI = 'ENVOI'
+RETOUR = 'RETOUR'
+SUITE = 'SUITE'
+ANNULATION = 'ANNULATION'
+CORRECTION = 'CORRECTION'
+GUIDE = 'GUIDE'
+REPETITION = 'REPETITION'
+SOMMAIRE = 'SOMMAIRE'
+
+SEQ_TIMEOUT = 0.05   # secondes : ESC seul (ou séquence inconnue) rendu tel quel
+WAKE = 5.0           # secondes : attente sans délai, port fermé détecté quand même
+
+SEQUENCES = {
+    # mode téléinformatique (terminfo minitel1b-80 : kent, kpp, knp, kcan, kbs, khlp, krfr)
+    b'\x1bOM': ENVOI,
+    b'\x1bOR': RETOUR,
+    b'\x1bOn': SUITE,
+    b'\x1bOQ': ANNULATION,
+    b'\x1bOl': CORRECTION,
+    b'\x1bOm': GUIDE,
+    b'\x1bOS': REPETITION,
+    # mode Vidéotex (40 colonnes) : SEP + code
+    b'\x13A': ENVOI,
+    b'\x13B': RETOUR,
+    b'\x13C': REPETITION,
+    b'\x13D': GUIDE,
+    b'\x13E': ANNULATION,
+    b'\x13F': SOMMAIRE,
+    b'\x13G': CORRECTION,
+    b'\x13H': SUITE,
+}
+SINGLE = {
+    b'\r': ENVOI,
+    b'\n': ENVOI,
+    b'\x18': ANNULATION,   # CAN
+    b'\x08': CORRECTION,
+    b'\x7f': CORRECTION,
+}
+# accents saisis au clavier (SS2 + diacritique + lettre)
+SEQUENCES.update({seq.encode('latin-1'): ch for seq, ch in G2_TEXT.items()})
+_PREFIXES = {seq[:n] for seq in SEQUENCES for n in range(1, len(seq))}
+_LEADS = {seq[0] for seq in SEQUENCES if len(seq) > 1} | {0x1b}
+
+
+class KeyDecoder:
+    def __init__(self, debug=False):
+        self.debug = debug
+        self.pending = b''
+
+    def feed(self, data):
+        """Octets reçus -> liste de touches."""
+        if self.debug:
+            sys.stdout.write(''.join(f"[RX 0x{b:02X}]" for b in data)); sys.stdout.flush()
+        buf = self.pending + data
+        keys = []
+        i, n = 0, len(buf)
+        while i < n:
+            if buf[i] in _LEADS:
+                j = i + 2
+                while j <= n and buf[i:j] in _PREFIXES:
+                    j += 1
+                seq = buf[i:j]
+                if seq in SEQUENCES:
+                    keys.append(SEQUENCES[seq])
+                    i = j
+                    continue
+                if j > n or (buf[i] == 0x1b and i + 3 > n):
+                    break           # séquence incomplète : attendre la suite
+                if buf[i] == 0x1b:
+                    # séquence inconnue : ESC + 2 octets, comme avant
+                    keys.append(buf[i:i + 3].decode('latin-1'))
+                    i += 3
+                    continue
+            b = buf[i:i + 1]
+            keys.append(SINGLE.get(b, b.decode('latin-1')))
+            i += 1
+        self.pending = buf[i:]
+        return keys
+
+    def flush(self):
+        """Séquence restée incomplète : rendue caractère par caractère."""
+        keys = [SINGLE.get(bytes([b]), chr(b)) for b in self.pending]
+        self.pending = b''
+        return keys
+
+
+def _fileno(ser):
+    try:
+        return ser.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+class KeyReader:
+    """Touches en lecture bloquante, sans attente active."""
+
+    def __init__(self, ser, debug=False):
+        self.ser = ser
+        self.decoder = KeyDecoder(debug)
+        self.keys = deque()
+        self.fd = _fileno(ser)
+
+    def ready(self):
+        """Une touche déjà reçue attend (saisie groupée : un seul affichage)."""
+        return bool(self.keys)
+
+    def get(self, timeout=None):
+        """Prochaine touche ; None si rien avant timeout secondes."""
+        end = None if timeout is None else time.monotonic() + timeout
+        while not self.keys:
+            wait = WAKE if end is None else max(0.0, end - time.monotonic())
+            if self.decoder.pending:
+                wait = min(wait, SEQ_TIMEOUT)
+            if not self._wait(wait):
+                if self.decoder.pending:
+                    self.keys.extend(self.decoder.flush())
+                elif end is not None and time.monotonic() >= end:
+                    return None
+                continue
+            data = self.ser.read(self.ser.in_waiting or 1)
+            if data:
+                self.keys.extend(self.decoder.feed(data))
+        return self.keys.popleft()
+
+    def take(self):
+        """Touches reçues pas encore lues (passage au clavier asyncio)."""
+        keys = list(self.keys)
+        self.keys.clear()
+        return keys
+
+    def _wait(self, timeout):
+        if self.fd is None:
+            return True     # pas de descripteur : read() attend son propre délai
+        r, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(r)
+
+
+class Keyboard:
+    def __init__(self, ser, debug=False, reader=None):
+        self.ser = ser
+        self.queue = asyncio.Queue()
+        # reprend la frappe anticipée et la séquence en cours du KeyReader
+        self.decoder = reader.decoder if reader is not None else KeyDecoder(debug)
+        for key in (reader.take() if reader is not None else ()):
+            self.queue.put_nowait(key)
+        self.loop = asyncio.get_running_loop()
+        self.expire = None
+        self.thread = None
+        self.closed = False
+        try:
+            self.fd = ser.fileno()
+            self.loop.add_reader(self.fd, self._readable)
+        except (AttributeError, OSError, NotImplementedError, ValueError):
+            self.fd = None
+            self.thread = threading.Thread(target=self._run_thread, daemon=True)
+            self.thread.start()
+
+    def close(self):
+        self.closed = True
+        if self.expire is not None:
+            self.expire.cancel()
+        if self.fd is not None:
+            self.loop.remove_reader(self.fd)
+            self.fd = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        key = await self.queue.get()
+        if isinstance(key, Exception):
+            raise key
+        return key
+
+    # ----- lecture -----
+
+    def _readable(self):
+        try:
+            data = self.ser.read(self.ser.in_waiting or 1)
+        except Exception as e:
+            self.close()
+            self.queue.put_nowait(e)
+            return
+        if data:
+            self._feed(data)
+
+    def _run_thread(self):
+        while not self.closed:
+            try:
+                data = self.ser.read(1)
+                if data and not self.closed:
+                    self.loop.call_soon_threadsafe(self._feed, data)
+            except Exception as e:
+                if not self.closed:
+                    self.loop.call_soon_threadsafe(self.queue.put_nowait, e)
+                return
+
+    def _feed(self, data):
+        if self.expire is not None:
+            self.expire.cancel()
+            self.expire = None
+        for key in self.decoder.feed(data):
+            self.queue.put_nowait(key)
+        if self.decoder.pending:
+            self.expire = self.loop.call_later(SEQ_TIMEOUT, self._expired)
+
+    def _expired(self):
+        self.expire = None
+        for key in self.decoder.flush():
+            self.queue.put_nowait(key)
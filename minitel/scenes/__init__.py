@@ -0,0 +1,7 @@
+"""
+Scènes du Minitel (boot, menu, boot APOLLO, APOLLO).
+
+Chaque module expose run(ctx) : la scène tourne sur le port partagé puis
+renvoie le nom de la scène suivante (None pour arrêter). Voir
+minitel/supervisor.py.
+"""
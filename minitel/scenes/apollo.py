@@ -0,0 +1,586 @@
+"""
+Scène APOLLO : conversation avec l'IA de bord.
+
+La boucle asyncio tourne sur la boucle persistante du superviseur (le
+client HTTP de ChatCore y garde ses connexions d'une visite à l'autre).
+/exit renvoie au menu. Commandes MJ : /cache (taux de réponses servies
+par le cache), /cache clear (vide le cache), /hedge (requêtes relancées
+vers le modèle de secours), /api (état du disjoncteur), /usage (tokens,
+coût et temps d'affichage de la session), /history (questions et
+réponses précédentes, lues dans le journal sans appel API, RETOUR pour
+remonter), /reset (nouvelle conversation).
+
+Le temps d'affichage des réponses est estimé sur la zone de réponse
+(ROW_CONTENT_START..ROW_CONTENT_END x CONTENT_WIDTH) et le débit ; avec
+--pages, leur longueur est plafonnée d'après les mêmes (minitel/budget.py).
+
+Spans (minitel/tracing.py) : apollo.key (touche -> écho en file),
+apollo.answer (question complète) et, dedans, chat.ask, text.sanitize,
+text.wrap, apollo.show_paged / apollo.show_streamed, serial.drain.
+"""
+
+import os
+import time
+import asyncio
+
+from minitel import assets, backends, breaker, tracing
+from minitel.audio import LoopPlayer
+from minitel.budget import OutputBudget
+from minitel.cache import ResponseCache
+from minitel.chat import ChatCore
+from minitel.codec import IncrementalSanitizer
+from minitel.offline import OfflineReplies
+from minitel.serial_writer import drain
+from minitel.terminfo import COLS, LINES, tput, seq_cup
+from minitel.text import sanitize_text, wrap_lines
+from minitel.stream import StreamReply
+from minitel.transcript import Transcript
+from minitel.pager import Pager
+from minitel.runtime import Keyboard, ENVOI, SUITE, RETOUR, ANNULATION, CORRECTION
+from minitel.scenes.common import send, emit, paint
+
+EXIT_COMMAND = '/exit'
+WARM_TIMEOUT = 8.0    # secondes, sous la durée du chargement d'apollo_boot
+HISTORY = 50          # échanges relus du journal par /history
+WAIT_STATUS = "[Attendez la fin de la reponse]"
+
+# --- Layout constants ---
+ROW_USER = 5          # [VOUS] ici
+ROW_ASSIST = ROW_USER + 2  # [APOLLO] deux lignes sous [VOUS]
+CONTENT_LEFT = 2
+CONTENT_RIGHT = 79     # 80 colonnes, on garde 1 colonne de marge
+CONTENT_WIDTH = CONTENT_RIGHT - CONTENT_LEFT + 1
+ROW_CONTENT_START = ROW_ASSIST + 1  # texte assistant commence sous le label
+ROW_CONTENT_END = 22   # on réserve la 23 pour statut et 24 pour la saisie
+ROW_STATUS = 23
+
+
+def playing(ctx, wav):
+    lp = LoopPlayer(ctx.path(wav)); lp.start()
+    return lp
+
+async def drained(ser):
+    await asyncio.to_thread(drain, ser)
+
+
+# No real multi-level highlight on Minitel via text attributes.
+# Keep a helper for border-only standout.
+
+def draw_border_two_lines(ctx, cols=COLS):
+    # Top and bottom borders in standout (side borders included)
+    for r in (1, 2):
+        ctx.screen.put(r, 1, ' ' * cols, standout=True)
+    paint(ctx)
+
+# Render layout once
+
+def highlight_chars(ctx, row, start_col, text, charset):
+    # Overlay standout for selected characters only
+    for i, ch in enumerate(text):
+        if ch in charset:
+            ctx.screen.put(row, start_col + i, ch, standout=True)
+    paint(ctx)
+
+def render_layout(ctx):
+    # premier affichage : gabarit précompilé (minitel/assets.py)
+    assets.layout(ctx, 'apollo', draw_layout, [__file__])
+    drain(ctx.ser)
+
+def draw_layout(ctx):
+    screen = ctx.screen
+    if screen.have is None:
+        # état du Minitel inconnu : init terminfo, le flush repartira d'un clear
+        init = tput('is2')
+        if init: emit(ctx, init)
+    screen.clear()
+
+    # Draw border-only highlight around the 2-line fixed zone
+    draw_border_two_lines(ctx, COLS)
+
+    # --- LIGNES 1 À 3 : titre, message, séparation ---
+
+    # Choix direct dans le code
+    HIGHLIGHT_LINE1 = True   # mettre False pour normal
+    HIGHLIGHT_LINE2 = True  # mettre True pour highlight
+
+    # ligne 1 : titre centré
+    title = '#  -  A.P.O.L.L.O -                       CENTRAL ARTIFICIAL INTELLIGENCE'
+    col = max(2, (COLS - len(title)) // 2 + 1)
+    screen.put(1, col, title[:COLS-2], standout=HIGHLIGHT_LINE1)
+    paint(ctx, 'typing_long.wav')
+
+    # ligne 2 : message
+    msg = '================================'
+    screen.put(2, 4, msg[:max(0, COLS-23)], standout=HIGHLIGHT_LINE2)
+    paint(ctx, 'typing_long.wav')
+
+    # ligne 3 : séparation
+    sep = '_' * (COLS - 2)
+    screen.put(3, 2, sep[:COLS-2])
+
+    # Zones d'affichage 4..23 déjà vides dans le modèle
+
+    # boîte de saisie en ligne 24
+    screen.put(LINES, 1, '[ENTER QUERY]'); screen.move(LINES, 15)
+    paint(ctx)
+
+# Replacer le cuseur sur la ligne [] (avec la frappe anticipée éventuelle)
+def reset_input_cursor(ctx, typed=''):
+    screen = ctx.screen
+    screen.clear_eol(LINES, 1)
+    screen.put(LINES, 1, '[ENTER QUERY]'); screen.put(LINES, 15, typed)
+    screen.move(LINES, 15 + len(typed))
+    paint(ctx)
+
+
+class ApolloSession:
+    """Boucle asyncio d'APOLLO.
+
+    Le clavier, la requête API (avec son affichage et ses sons) tournent en
+    tâches séparées : on peut taper la question suivante pendant une
+    réponse, et ANNULATION interrompt la requête en cours (la connexion
+    HTTP est libérée par l'annulation de la tâche).
+    """
+
+    def __init__(self, ctx, chat, debug=False, stream=False):
+        self.ctx = ctx
+        self.ser = ctx.ser
+        self.screen = ctx.screen
+        self.chat = chat
+        self.debug = debug
+        self.stream = stream
+        self.max_input = COLS - 15
+        self.buffer = []
+        self.request = None   # tâche de la requête en cours
+        self.pager = None     # Future en attente de SUITE / RETOUR / numéro / Q
+        self.pages = None     # Pager de la dernière réponse (RETOUR après la fin)
+        self.exit = False     # /exit tapé : retour au menu
+
+    async def run(self):
+        keyboard = Keyboard(self.ser, debug=self.debug, reader=self.ctx.keys)
+        self.screen.move(LINES, 15); paint(self.ctx)
+        try:
+            async for key in keyboard:
+                with tracing.span('apollo.key'):
+                    self.on_key(key)
+                if self.exit:
+                    break
+        finally:
+            keyboard.close()
+            if self.busy():
+                self.request.cancel()
+
+    def busy(self):
+        return self.request is not None and not self.request.done()
+
+    # ----- clavier -----
+
+    def on_key(self, key):
+        screen = self.screen
+        if key == ANNULATION:
+            if self.busy():
+                self.request.cancel()
+            return
+
+        # pagination en attente : SUITE (ou ENVOI), RETOUR, numéro + ENVOI, Q = stop
+        if self.pager is not None and not self.pager.done():
+            typed = ''.join(self.buffer).strip()
+            if key == ENVOI and typed.isdigit():
+                self.clear_input()
+                self.pager.set_result(int(typed) - 1)
+                return
+            if key in (ENVOI, SUITE, RETOUR):
+                self.pager.set_result(RETOUR if key == RETOUR else SUITE)
+                return
+            if key in ('q', 'Q'):
+                self.pager.set_result(None)
+                return
+
+        # réponse affichée : RETOUR / SUITE la feuillettent, depuis le cache
+        if key in (RETOUR, SUITE) and not self.busy() and self.pages is not None:
+            n = self.pages.current + (1 if key == SUITE else -1)
+            if 0 <= n < len(self.pages):
+                self.request = asyncio.ensure_future(self.paginate(self.pages, n))
+            return
+
+        # ENVOI
+        if key == ENVOI:
+            if self.busy():
+                # la question tapée d'avance reste sur la ligne de saisie :
+                # ENVOI à nouveau une fois la réponse affichée
+                if self.buffer:
+                    self.screen.clear_eol(ROW_STATUS, CONTENT_LEFT)
+                    self.screen.put(ROW_STATUS, CONTENT_LEFT, WAIT_STATUS)
+                    paint(self.ctx)
+                return
+            user_text = ''.join(self.buffer).strip()
+            self.clear_input()
+            if user_text.lower() == EXIT_COMMAND:
+                self.exit = True
+            elif user_text.lower() == '/history':
+                self.request = asyncio.ensure_future(self.history())
+            elif user_text.startswith('/'):
+                self.command(user_text.lower().split())
+            elif user_text:
+                self.request = asyncio.ensure_future(self.traced_answer(user_text))
+            return
+
+        # RETOUR ARRIÈRE
+        if key == CORRECTION:
+            if self.buffer:
+                self.buffer.pop()
+                col = 15 + len(self.buffer)
+                screen.put(LINES, col, ' ')
+                if not self.busy():
+                    screen.move(LINES, col)
+                paint(self.ctx)
+            return
+
+        # imprimables
+        if len(key) == 1 and 32 <= ord(key) <= 126 and len(self.buffer) < self.max_input:
+            screen.put(LINES, 15 + len(self.buffer), key)
+            self.buffer.append(key)
+            if not self.busy():
+                screen.move(LINES, 15 + len(self.buffer))
+            paint(self.ctx)
+
+    def clear_input(self):
+        # nettoie la ligne d'entrée
+        self.screen.clear_eol(LINES, 15); self.screen.move(LINES, 15)
+        self.buffer = []
+        paint(self.ctx)
+
+    def command(self, words):
+        """Commandes MJ (/cache, /cache clear, /hedge, /api, /usage, /reset), réponse sur la ligne de statut."""
+        cache = self.chat.cache
+        if words == ['/reset']:
+            self.chat.reset()
+            status = "[NOUVELLE CONVERSATION]"
+        elif words[0] == '/cache' and cache is None:
+            status = "[CACHE DESACTIVE]"
+        elif words == ['/cache', 'clear']:
+            cache.clear()
+            status = "[CACHE VIDE]"
+        elif words == ['/cache']:
+            status = f"[CACHE] {cache.stats()}"
+        elif words == ['/hedge']:
+            status = f"[RELANCE] {self.chat.hedge_stats()}"
+        elif words == ['/api']:
+            status = f"[API] {self.chat.breaker.stats()}, {self.chat.offline.served} reponses hors ligne"
+        elif words == ['/usage']:
+            status = f"[COMPTES] {self.chat.ledger.stats()}"
+        else:
+            status = "[COMMANDE INCONNUE]"
+        self.screen.clear_eol(ROW_STATUS, CONTENT_LEFT)
+        self.screen.put(ROW_STATUS, CONTENT_LEFT, status[:CONTENT_WIDTH])
+        paint(self.ctx)
+
+    async def next_page(self, n=None, total=None):
+        """Statut de pagination puis attente : SUITE, RETOUR, numéro de page
+        (0-based) ou None si le joueur a tapé Q."""
+        self.screen.clear_eol(ROW_STATUS, CONTENT_LEFT)
+        if total is None:
+            # réponse en flux : la suite seulement
+            status = "[Suite: ENVOI]  [Stop: Q]  [Annuler: ANNULATION]"
+        else:
+            status = f"[PAGE {n + 1}/{total}]  Suite: ENVOI  Precedente: RETOUR  Page: N ENVOI  Stop: Q"
+        self.screen.put(ROW_STATUS, CONTENT_LEFT, status[:CONTENT_WIDTH])
+        paint(self.ctx)
+        self.pager = asyncio.get_running_loop().create_future()
+        try:
+            return await self.pager
+        finally:
+            self.pager = None
+
+    # ----- requête -----
+
+    async def traced_answer(self, user_text):
+        with tracing.span('apollo.answer', stream=self.stream, chars=len(user_text)):
+            await self.answer(user_text)
+
+    async def answer(self, user_text):
+        screen = self.screen
+        # 1) Ligne [VOUS] + question, côte à côte, une ligne plus haut (ROW_USER)
+        screen.clear_eol(ROW_USER, CONTENT_LEFT)
+        # question sur la même ligne, tronquée si trop longue
+        screen.put(ROW_USER, CONTENT_LEFT, "[YOU] " + sanitize_text(user_text)[:CONTENT_WIDTH - len("[YOU] ")])
+
+        # 2) Label [APOLLO] deux lignes dessous
+        self.pages = None
+        screen.clear_eol(ROW_STATUS, 1)
+        screen.clear_eol(ROW_ASSIST, CONTENT_LEFT)
+        screen.put(ROW_ASSIST, CONTENT_LEFT, "[APOLLO] ")
+        # pendant la réponse, le curseur reste où l'écran l'a laissé
+        screen.target = None
+        paint(self.ctx)
+
+        reply = None
+        try:
+            if self.stream:
+                # 3) Appel API en flux, affiché au fil des tokens
+                reply = StreamReply(self.chat.ask_stream(user_text), CONTENT_WIDTH,
+                                    sanitize=IncrementalSanitizer())
+                ttfc = await self.show_streamed(reply)
+                if reply.error is not None:
+                    # pannes d'API déjà servies hors ligne par ask_stream : ici, un bug
+                    print(f"[APOLLO] lecture du flux impossible : {reply.error!r}", flush=True)
+                    await self.show_paged(wrap_lines(sanitize_text(self.chat.offline.reply()),
+                                                     CONTENT_WIDTH))
+                if ttfc is not None:
+                    tracing.record('apollo.ttft', reply.ttft)
+                    tracing.record('apollo.ttfc', ttfc)
+                    print(f"[APOLLO] premier token {reply.ttft * 1000:.0f} ms, "
+                          f"premier caractere {ttfc * 1000:.0f} ms")
+            else:
+                # 3) Appel API + pagination de la réponse
+                lp = playing(self.ctx, 'subtle_long_type.wav')
+                try:
+                    # pannes d'API : réponse hors ligne de ChatCore
+                    text = await self.chat.ask(user_text)
+                finally:
+                    lp.stop_now()
+                with tracing.span('text.sanitize', chars=len(text)):
+                    text = sanitize_text(text)
+                # texte assistant paginé sous le label
+                with tracing.span('text.wrap'):
+                    lines = wrap_lines(text, CONTENT_WIDTH)
+                await self.show_paged(lines)
+        except asyncio.CancelledError:
+            if reply is not None:
+                reply.cancel()
+            screen.clear_eol(ROW_STATUS, CONTENT_LEFT)
+            screen.put(ROW_STATUS, CONTENT_LEFT, "[REQUETE ANNULEE]")
+        finally:
+            if screen.text(ROW_STATUS).strip() == WAIT_STATUS:
+                screen.clear_eol(ROW_STATUS, CONTENT_LEFT)   # réponse finie : plus d'attente
+            reset_input_cursor(self.ctx, ''.join(self.buffer))
+
+    async def show_paged(self, lines, row_start=ROW_CONTENT_START, row_end=ROW_CONTENT_END, left_col=CONTENT_LEFT):
+        """Affiche lines avec pagination. ENVOI pour continuer, Q pour quitter l’affichage."""
+        with tracing.span('apollo.show_paged', lines=len(lines)):
+            await self._show_paged(lines, row_start, row_end, left_col)
+
+    async def _show_paged(self, lines, row_start, row_end, left_col, start=0):
+        # index des pages construit une fois : RETOUR et sauts sans recalcul
+        self.pages = Pager(lines, row_start, row_end, left_col, CONTENT_WIDTH)
+        await self.paginate(self.pages, self.pages.clamp(start))
+
+    async def history(self):
+        """Échanges précédents, lus dans le journal (aucun appel API) ;
+        on arrive sur les plus récents, RETOUR remonte."""
+        screen, transcript = self.screen, self.chat.transcript
+        self.pages = None
+        screen.clear_eol(ROW_STATUS, 1)
+        if transcript is None:
+            screen.put(ROW_STATUS, CONTENT_LEFT, "[JOURNAL DESACTIVE]")
+            paint(self.ctx)
+            return
+        screen.target = None
+        try:
+            await self._history(screen, transcript)
+        finally:
+            reset_input_cursor(self.ctx, ''.join(self.buffer))
+
+    async def _history(self, screen, transcript):
+        with tracing.span('apollo.history') as sp:
+            exchanges = []
+            for pair in transcript.exchanges():
+                exchanges.append(pair)
+                if len(exchanges) == HISTORY:
+                    break
+            lines = []
+            for question, reply in reversed(exchanges):
+                lines += wrap_lines('> ' + sanitize_text(question), CONTENT_WIDTH)
+                lines += wrap_lines(sanitize_text(reply), CONTENT_WIDTH) + ['']
+            sp.set(exchanges=len(exchanges))
+        screen.clear_eol(ROW_USER, CONTENT_LEFT)
+        screen.put(ROW_USER, CONTENT_LEFT, f"[HISTORIQUE] {len(exchanges)} echanges")
+        screen.clear_eol(ROW_ASSIST, CONTENT_LEFT)
+        if not lines:
+            screen.clear_rows(ROW_CONTENT_START, ROW_CONTENT_END)
+            paint(self.ctx)
+            return
+        await self._show_paged(lines[:-1], ROW_ASSIST, ROW_CONTENT_END, CONTENT_LEFT, start=len(lines))
+
+    async def paginate(self, pager, n):
+        """Page n, puis SUITE / RETOUR / numéro jusqu'à la dernière page (ou Q)."""
+        while True:
+            await self.show_page(pager, n)
+            if n == len(pager) - 1:
+                break
+            action = await self.next_page(n, len(pager))
+            if action is None:
+                break
+            n = pager.clamp(n + 1 if action == SUITE else n - 1 if action == RETOUR else action)
+        # fin, efface statut (RETOUR reste possible jusqu'à la question suivante)
+        self.screen.clear_eol(ROW_STATUS, 1)
+        if len(pager) > 1:
+            self.screen.put(ROW_STATUS, CONTENT_LEFT,
+                            f"[PAGE {n + 1}/{len(pager)}]  Precedente: RETOUR")
+        paint(self.ctx)
+
+    async def show_page(self, pager, n):
+        ser = self.ser
+        # ligne à ligne : seules les cases qui changent partent
+        lp = playing(self.ctx, 'typing_long.wav')
+        try:
+            with tracing.span('apollo.page', page=n) as sp:
+                sent = 0
+                for data in pager.render(self.screen, n):
+                    if data:
+                        send(ser, data)
+                        sent += len(data)
+                sp.set(bytes=sent)
+                await drained(ser)
+        finally:
+            lp.stop_now()
+
+    async def show_streamed(self, reply, row_start=ROW_CONTENT_START, row_end=ROW_CONTENT_END, left_col=CONTENT_LEFT):
+        """Affiche une réponse StreamReply au fil des tokens dans la fenêtre.
+
+        Quand la fenêtre est pleine, on passe à la pagination [Suite: ENVOI]
+        pendant que le reste du flux continue d'arriver en arrière-plan.
+        Renvoie le délai jusqu'au premier caractère affiché (secondes).
+        """
+        with tracing.span('apollo.show_streamed'):
+            return await self._show_streamed(reply, row_start, row_end, left_col)
+
+    async def _show_streamed(self, reply, row_start, row_end, left_col):
+        ser, screen = self.ser, self.screen
+        lp = playing(self.ctx, 'subtle_long_type.wav')   # attente du premier token
+        typing = False
+        ttfc = None
+        complete = False
+        try:
+            screen.clear_rows(row_start, row_end); paint(self.ctx)
+            shown = 0          # lignes terminées déjà posées
+            row = row_start
+            partial = ''
+            while True:
+                lines, partial, done = await reply.changed(shown, partial)
+                if not typing and (len(lines) > shown or partial):
+                    lp.stop_now()
+                    lp = playing(self.ctx, 'typing_long.wav')
+                    typing = True
+                while shown < len(lines) and row <= row_end:
+                    screen.clear_eol(row, left_col); screen.put(row, left_col, lines[shown][:CONTENT_WIDTH])
+                    row += 1; shown += 1
+                if row <= row_end:
+                    screen.clear_eol(row, left_col); screen.put(row, left_col, partial[:CONTENT_WIDTH])
+                paint(self.ctx)
+                if ttfc is None and (shown or partial):
+                    ttfc = time.monotonic() - reply.t_start
+                if done and shown == len(lines):
+                    complete = True
+                    break
+                if row > row_end:
+                    # fenêtre pleine : y a-t-il une suite ?
+                    lines, partial, done = await reply.changed(shown, '')
+                    if done and shown == len(lines):
+                        complete = True
+                        break
+                    await drained(ser)
+                    lp.stop_now()
+                    lp = playing(self.ctx, 'subtle_long_type.wav')
+                    typing = False
+                    if await self.next_page() is None:
+                        reply.cancel()
+                        break
+                    screen.clear_eol(ROW_STATUS, 1)
+                    screen.clear_rows(row_start, row_end)
+                    row = row_start
+                    partial = None   # forcer le réaffichage de la ligne en cours
+            await drained(ser)
+        finally:
+            lp.stop_now()
+        screen.clear_eol(ROW_STATUS, 1)
+        if complete:
+            # réponse entière : RETOUR revient sur les pages déjà passées
+            self.pages = Pager(reply.lines, row_start, row_end, left_col, CONTENT_WIDTH)
+            self.pages.current = max(len(reply.lines) - 1, 0) // (row_end - row_start + 1)
+            if len(self.pages) > 1:
+                screen.put(ROW_STATUS, CONTENT_LEFT,
+                           f"[PAGE {self.pages.current + 1}/{len(self.pages)}]  Precedente: RETOUR")
+        paint(self.ctx)
+        return ttfc
+
+
+def ensure_chat(ctx):
+    """Le ChatCore du terminal, créé une seule fois : l'historique survit
+    aux retours au menu."""
+    args = ctx.args
+    if ctx.chat is None:
+        if ctx.cache is None and not args.no_cache:
+            ctx.cache = ResponseCache(ctx.path(args.cache_file), ttl=args.cache_ttl,
+                                      size=args.cache_size, fuzzy=args.cache_fuzzy)
+        transcript = None if args.no_transcript else Transcript(transcript_path(ctx))
+        backend = backends.from_env(args.backend)
+        model = backend.model(args.model)
+        print(f"[APOLLO] fournisseur {backend.describe()}, modele {model}", flush=True)
+        # zone de réponse et débit : temps d'affichage, plafond avec --pages
+        output = OutputBudget(ROW_CONTENT_END - ROW_CONTENT_START + 1, CONTENT_WIDTH,
+                              pages=args.pages, baud=args.baud, max_render=args.max_render)
+        if args.pages > 0:
+            print(f"[APOLLO] longueur maximale {output.describe()}", flush=True)
+        ctx.chat = ChatCore(model=model, prompt_file=ctx.path(args.prompt_file),
+                            budget=args.history_tokens, cache=ctx.cache,
+                            lore_k=args.lore_k, lore_debug=args.lore_debug,
+                            client=ctx.client, transcript=transcript,
+                            hedge_model=args.hedge_model, hedge_after=args.hedge_after,
+                            deadline=args.api_deadline, attempts=args.api_attempts,
+                            breaker=breaker.shared(args.breaker_failures, args.breaker_cooldown),
+                            offline=OfflineReplies(ctx.path(args.offline_file)),
+                            backend=backend, max_tokens=args.max_tokens,
+                            output=output, price=args.price)
+    return ctx.chat
+
+
+def transcript_path(ctx):
+    """Un journal par terminal : transcript.jsonl, transcript-pty0.jsonl..."""
+    path = ctx.path(ctx.args.transcript_file)
+    if ctx.name:
+        root, ext = os.path.splitext(path)
+        slug = ''.join(ch if ch.isalnum() else '_' for ch in ctx.name).strip('_')
+        path = f"{root}-{slug}{ext}"
+    return path
+
+
+def warm(ctx):
+    """Préchauffage (thread lancé par apollo_boot) : ChatCore, tokenizer,
+    connexion à l'API, sur la boucle du terminal encore inutilisée."""
+    t0 = time.monotonic()
+    with tracing.span('warm.chat'):
+        chat = ensure_chat(ctx)
+    with tracing.span('warm.terminfo'):
+        # positions de la fenêtre de réponse (repli tput : un fork chacune)
+        for r in range(ROW_USER, ROW_STATUS + 1):
+            for c in range(CONTENT_LEFT, CONTENT_RIGHT + 1):
+                seq_cup(r, c)
+    t1 = time.monotonic()
+    try:
+        with tracing.span('warm.connect', prime=ctx.args.prime):
+            ctx.loop.run_until_complete(asyncio.wait_for(chat.warm(ctx.args.prime), WARM_TIMEOUT))
+        status = 'ok'
+    except Exception as e:
+        status = f"echec ({e.__class__.__name__})"   # la première question paiera la connexion
+    print(f"[APOLLO] prechauffage : preparation {(t1 - t0) * 1000:.0f} ms, "
+          f"connexion {(time.monotonic() - t1) * 1000:.0f} ms, {status}", flush=True)
+
+
+def run(ctx):
+    args = ctx.args
+    if ctx.warmup is not None:
+        # le préchauffage utilise la boucle : on attend qu'il la rende
+        ctx.warmup.join()
+        ctx.warmup = None
+    ensure_chat(ctx)
+
+    async def session():
+        render_layout(ctx)
+        print('Layout sent to Minitel. Entering input loop. /exit to return to menu.')
+        await ApolloSession(ctx, ctx.chat, debug=args.debug, stream=args.stream).run()
+
+    ctx.loop.run_until_complete(session())
+    if ctx.chat.cache is not None:
+        print(f"[CACHE] {ctx.chat.cache.stats()}")
+    return 'menu'
@@ -0,0 +1,76 @@
+"""
+Scène de démarrage d'APOLLO : logo, LAUNCH ? (Y/N), boot.txt, chargement.
+
+y -> APOLLO, n/no/non -> retour au menu.
+
+Pendant l'animation, un thread prépare APOLLO (import d'openai, ChatCore,
+prompt et tokenizer, connexion à l'API ; voir apollo.warm) : la première
+question ne coûte pas plus que les suivantes.
+"""
+
+import importlib
+import threading
+
+from minitel.audio import play_once
+from minitel.serial_writer import drain
+from minitel.terminfo import LINES, seq_clear, seq_cup, seq_el
+from minitel.scenes.common import send, read_line, scroll_text, loading_bar
+
+PROMPT = "LAUNCH ? (Y/N) : "
+
+
+def clear_screen(ser):
+    send(ser, seq_clear())
+
+
+def ask_boot(ctx):
+    ser = ctx.ser
+    send(ser, seq_cup(LINES,1)); send(ser, seq_el())
+    send(ser, seq_cup(LINES,1)); send(ser, PROMPT)
+    ans = read_line(ctx, echo=True, maxlen=4).strip().lower()
+    return ans
+
+
+def start_warmup(ctx):
+    if ctx.args.no_warm or (ctx.warmup is not None and ctx.warmup.is_alive()):
+        return
+    def target():
+        # import dans le thread : openai n'est chargé qu'en allant vers APOLLO
+        importlib.import_module('minitel.scenes.apollo').warm(ctx)
+    ctx.warmup = threading.Thread(target=target, daemon=True, name='apollo-warmup')
+    ctx.warmup.start()
+
+
+def run(ctx):
+    ser, args = ctx.ser, ctx.args
+    start_warmup(ctx)
+    while True:
+        # 1) Nettoyer + son de boot + logo avec son de frappe
+        clear_screen(ser)
+        play_once(ctx.path(args.boot_snd))
+        scroll_text(ser, ctx.path(args.apollo_logo), ctx.path(args.type_snd), "[1.txt introuvable]")
+
+        # 2) Prompt
+        ans = ask_boot(ctx)
+
+        # 3) Retour au menu si N
+        if ans in ('n', 'no', 'non'):
+            ctx.screen.invalidate()
+            return 'menu'
+
+        if ans == 'y':
+            # Nettoie + beep
+            clear_screen(ser)
+            drain(ser)
+            play_once(ctx.path(args.beep_snd))
+            # 4) boot.txt défilant avec le même son de frappe
+            scroll_text(ser, ctx.path(args.boottxt), ctx.path(args.type_snd), "[boot.txt introuvable]")
+            # 5) Chargement
+            loading_bar(ser, ctx.path(args.subtlelong_snd), seconds=10)
+            # 6) Son final puis APOLLO
+            play_once(ctx.path(args.final_snd))
+            ctx.screen.invalidate()
+            return 'apollo'
+
+        # Réponse invalide => réafficher le prompt
+        send(ser, seq_cup(LINES,1)); send(ser, seq_el())
@@ -0,0 +1,78 @@
+"""
+Scène de démarrage : art.txt, BOOT ? (Y/N), logo défilant, chargement.
+
+Y -> menu. Toute autre réponse réaffiche l'écran de boot.
+"""
+
+import os
+
+from minitel import assets, codec
+from minitel.assets import read_or
+from minitel.text import safe_line
+from minitel.audio import play_once
+from minitel.serial_writer import drain
+from minitel.terminfo import COLS, LINES, seq_clear, seq_cup, seq_el
+from minitel.scenes.common import send, read_line, scroll_text, loading_bar
+
+PROMPT = "BOOT ? (Y/N) : "
+
+
+def clear_screen(ser):
+    send(ser, seq_clear())
+
+
+def art_bytes(art_path):
+    lines = read_or(art_path, "[art.txt introuvable]")
+    # écrire sur 1..(LINES-1), couper à COLS
+    top = 1
+    bottom = LINES - 1
+    out = []
+    for r in range(top, bottom+1):
+        ln = lines[r - top] if r - top < len(lines) else ""
+        ln = safe_line(ln)[:COLS]
+        out.append(seq_cup(r, 1) + seq_el() + codec.encode(ln))
+    return out
+
+
+def show_art(ser, art_path):
+    # écran précompilé (minitel/assets.py) : une seule écriture
+    send(ser, assets.blob('art-' + os.path.basename(art_path), [art_path],
+                          lambda: art_bytes(art_path)))
+
+
+def ask_boot(ctx):
+    ser = ctx.ser
+    send(ser, seq_cup(LINES,1)); send(ser, seq_el())
+    send(ser, seq_cup(LINES,1)); send(ser, PROMPT)
+    ans = read_line(ctx, echo=True, maxlen=3).strip().upper()
+    return ans
+
+
+def run(ctx):
+    ser, args = ctx.ser, ctx.args
+    while True:
+        # 1) Nettoyer l'écran + son de boot
+        clear_screen(ser)
+        show_art(ser, ctx.path(args.art))
+        drain(ser)
+        play_once(ctx.path(args.boot_snd))
+
+        # 2) Prompt BOOT ? (Y/N)
+        if ask_boot(ctx) == 'Y':
+            # Nettoyer + beep choisi
+            clear_screen(ser)
+            drain(ser)
+            play_once(ctx.path(args.beep_snd))
+
+            # Défilement logo avec bruit de frappe en boucle
+            scroll_text(ser, ctx.path(args.logo), ctx.path(args.type_snd), "[logo.txt introuvable]")
+
+            # Chargement sur dernière ligne avec subtle-long-type en boucle
+            loading_bar(ser, ctx.path(args.subtlelong_snd), seconds=2)
+
+            # Son final puis menu
+            play_once(ctx.path(args.final_snd))
+            # écran dessiné en direct : le menu repartira d'un clear
+            ctx.screen.invalidate()
+            return 'menu'
+        # Toute réponse différente de Y => redémarrage immédiat
@@ -0,0 +1,135 @@
+"""
+Utilitaires communs aux scènes : envoi, réaffichage, saisie, animations.
+"""
+
+import os
+import time
+
+from minitel import assets, codec, serial_writer
+from minitel.audio import LoopPlayer
+from minitel.serial_writer import drain
+from minitel.runtime import ENVOI, ANNULATION, CORRECTION
+from minitel.scroll import Scroller
+from minitel.terminfo import COLS, LINES, seq_cup, seq_civis, seq_cnorm
+from minitel.assets import read_or
+from minitel.text import safe_line
+
+SCROLL_DELAY = 0.1  # secondes entre lignes lors du défilement
+
+
+def send(ser, data):
+    if isinstance(data, str):
+        data = codec.encode(data)
+    serial_writer.send(ser, data)   # file cadencée sur --baud
+
+
+def emit(ctx, data, wav=None):
+    """Envoie data, avec un son de frappe le temps de l'écriture.
+
+    Pendant la compilation d'un gabarit (minitel/assets.py), rien ne part :
+    les octets et le son sont enregistrés.
+    """
+    if ctx.recording is not None:
+        ctx.recording.append((wav, bytes(data)))
+    elif wav:
+        lp = LoopPlayer(ctx.path(wav)); lp.start()
+        send(ctx.ser, data)
+        drain(ctx.ser)
+        lp.stop_now()
+    else:
+        send(ctx.ser, data)
+
+
+def paint(ctx, wav=None, top=1, bottom=None):
+    """Envoie les différences écran (avec un son de frappe s'il y a quelque chose)."""
+    data = ctx.screen.flush(top, bottom)
+    if data:
+        emit(ctx, data, wav)
+
+
+def read_line(ctx, echo=True, maxlen=16):
+    ser, buf = ctx.ser, []
+    while True:
+        key = ctx.keys.get()
+        if key == ENVOI:
+            return ''.join(buf)
+        if key == CORRECTION:
+            if buf:
+                buf.pop()
+                if echo:
+                    send(ser, '\b \b')
+            continue
+        if key == ANNULATION:
+            if echo and buf:
+                send(ser, '\b' * len(buf) + ' ' * len(buf) + '\b' * len(buf))
+            buf = []
+            continue
+        if len(key) == 1 and 32 <= ord(key) <= 126 and len(buf) < maxlen:
+            buf.append(key)
+            if echo: send(ser, key)
+
+
+def wait_key(ctx, *names):
+    """Attend l'une des touches names (ENVOI...), renvoie laquelle."""
+    while True:
+        key = ctx.keys.get()
+        if key in names:
+            return key
+
+
+def wait_enter(ctx):
+    wait_key(ctx, ENVOI)
+
+
+# ---------- Défilement générique d'un fichier texte avec son ----------
+def scroll_frames(path, not_found_msg, method=None):
+    """Trames du défilement : nettoyage de la fenêtre, puis une par ligne."""
+    lines = read_or(path, not_found_msg)
+
+    # Fenêtre 1..(LINES-1), on garde la dernière ligne libre ;
+    # défilement natif du terminal si possible (minitel/scroll.py)
+    scroller = Scroller(1, LINES - 1, method)
+    out = [scroller.start() + seq_civis()]
+    for raw in lines:
+        out.append(scroller.line(codec.encode(safe_line(raw)[:COLS])))
+    out.append(scroller.end() + seq_cnorm())
+    return out
+
+
+def scroll_text(ser, path, typing_wav, not_found_msg):
+    # trames précompilées (minitel/assets.py), rejouées au rythme du son
+    frames = assets.frames('scroll-' + os.path.basename(path), [path],
+                           lambda: scroll_frames(path, not_found_msg))
+    send(ser, frames[0])
+    lp = LoopPlayer(typing_wav)
+    lp.start()
+
+    for frame in frames[1:-1]:
+        send(ser, frame)
+        time.sleep(SCROLL_DELAY)
+
+    drain(ser)
+    lp.stop_now()
+    send(ser, frames[-1])
+
+
+# ---------- Barre de chargement ----------
+def loading_bar(ser, rattle_wav, seconds=10):
+    lp = LoopPlayer(rattle_wav)
+    lp.start()
+    start = time.time()
+    bar_len = COLS
+    last_pct = -1
+    while True:
+        elapsed = time.time() - start
+        if elapsed > seconds: break
+        pct = int((elapsed/seconds)*100)
+        if pct != last_pct:
+            filled = int((pct/100.0)*bar_len)
+            bar = ('#'*filled).ljust(bar_len)
+            send(ser, seq_cup(LINES,1)); send(ser, bar[:COLS])
+            last_pct = pct
+        time.sleep(0.05)
+    send(ser, seq_cup(LINES,1)); send(ser, '#' * COLS)
+    drain(ser)
+    lp.stop_now()
@@ -0,0 +1,311 @@
+"""
+Menu SEEGSON : en-tête, options 1 à 5, saisie en ligne 24.
+
+'1' -> boot d'APOLLO, '2' à '5' paginent un fichier texte.
+L'écran virtuel est partagé avec APOLLO : au retour, seules les
+différences entre les deux mises en page partent sur la ligne.
+"""
+
+import time
+
+from minitel import assets
+from minitel.audio import LoopPlayer
+from minitel.serial_writer import drain
+from minitel.terminfo import COLS, LINES, tput, seq_civis, seq_cnorm
+from minitel.text import safe_line, read_text_lines
+from minitel.pager import Pager
+from minitel.runtime import ENVOI, SUITE, RETOUR, ANNULATION, CORRECTION
+from minitel.scenes.common import send, emit, paint, wait_enter, SCROLL_DELAY
+
+# Fichiers associés aux options
+FILES = {
+    '2': '2.txt',
+    '3': '3.txt',
+    '4': '4.txt',
+    '5': '5.txt',
+}
+
+MODES = {
+    '2': 'paged',  # défilement auto
+    '3': 'paged',   # pagination par Entrée
+    '4': 'paged',
+    '5': 'paged',
+}
+
+# ----- Utilitaires d'écran -----
+
+def clear_window(ctx, top=4, bottom=23):
+    ctx.screen.clear_rows(top, bottom)
+    paint(ctx)
+
+def show_footer_message(ctx, text):
+    ctx.screen.clear_eol(LINES, 1); ctx.screen.put(LINES, 1, text[:COLS-2])
+    paint(ctx)
+
+# ------ Pagination "suite" -----
+
+def paged_file(ctx, filename):
+    ser, screen = ctx.ser, ctx.screen
+    path = ctx.path(filename)
+    try:
+        lines = assets.text_lines(path)   # nettoyées une fois, cache disque
+    except OSError:
+        show_status(ctx, f"Fichier introuvable: {filename}")
+        return
+
+    # index des pages construit une fois : RETOUR et sauts sans recalcul
+    pager = Pager(lines, 4, 23, 1, COLS)
+    n = 0
+
+    while True:
+        # >>> son de “dactylo” pendant l’écriture de page
+        lp = LoopPlayer(ctx.path('loud_type_start.wav')); lp.start()
+        for data in pager.render(screen, n):   # seules les cases qui changent
+            if data:
+                send(ser, data)
+                time.sleep(0.02)        # petite pause après chaque ligne
+        drain(ser)
+        lp.stop_now()  # <<< stop une fois la page rendue
+
+        last = n == len(pager) - 1
+        if last:
+            prompt = "[FIN. ENTREE: revenir  RETOUR: page precedente]"
+        else:
+            prompt = f"[PAGE {n + 1}/{len(pager)}] ENTREE: suite  RETOUR: precedente  N+ENTREE: page"
+        action = page_key(ctx, prompt)
+        if action == ENVOI and last:
+            render_layout(ctx)
+            return
+        if action in (ENVOI, SUITE):
+            n = pager.clamp(n + 1)
+        elif action == RETOUR:
+            n = pager.clamp(n - 1)
+        else:
+            n = pager.clamp(action)
+
+
+def page_key(ctx, prompt):
+    """Pied de page puis attente : ENVOI, SUITE, RETOUR ou un numéro de
+    page tapé puis ENVOI (renvoyé 0-based)."""
+    show_footer_message(ctx, prompt)
+    col = min(len(prompt), COLS - 6) + 2
+    digits = ''
+    while True:
+        key = ctx.keys.get()
+        if key in (SUITE, RETOUR):
+            return key
+        if key == ENVOI:
+            return int(digits) - 1 if digits else ENVOI
+        if key == CORRECTION:
+            digits = digits[:-1]
+        elif key == ANNULATION:
+            digits = ''
+        elif key.isdigit() and len(key) == 1 and len(digits) < 3:
+            digits += key
+        else:
+            continue
+        ctx.screen.clear_eol(LINES, col); ctx.screen.put(LINES, col, digits)
+        paint(ctx)
+
+# ----- UI helpers -----
+TITLE = '#  -  SEEGSON BIOS 5.3.09.63                                             '
+BANNER = '============================'
+ITEMS = {
+    7: "1 - A.P.O.L.L.O",
+    8: "2 - POWER STATUS",
+    9: "3 - HVAC",
+    10:"4 - LIGHTNING",
+    11:"5 - CONTAINMENT PROTOCOL",
+}
+
+def draw_border_two_lines(ctx, cols=COLS):
+    for r in (1, 2):
+        ctx.screen.put(r, 1, ' ' * cols, standout=True)
+    paint(ctx)
+
+def render_header(ctx):
+    screen = ctx.screen
+    if screen.have is None:
+        # état du Minitel inconnu : init terminfo, le flush repartira d'un clear
+        init = tput('is2')
+        if init:
+            emit(ctx, init)
+    screen.clear()
+    draw_border_two_lines(ctx, COLS)
+
+    # L1 titre
+    put_title(screen)
+    paint(ctx, 'typing_long.wav')
+
+    # L2 message
+    put_banner(screen)
+    paint(ctx, 'typing_long.wav')
+
+    # L3 séparation
+    put_separator(screen)
+
+def put_title(screen):
+    col = max(2, (COLS - len(TITLE)) // 2 + 1)
+    screen.put(1, col, TITLE[:COLS-2], standout=True)
+
+def put_banner(screen):
+    screen.put(2, 4, BANNER[:max(0, COLS-23)], standout=True)
+
+def put_separator(screen):
+    screen.put(3, 2, ('_' * (COLS - 2))[:COLS-2])
+
+def render_menu(ctx):
+    for row in range(7, 13):
+        ctx.screen.clear_eol(row, 4)
+        ctx.screen.put(row, 4, ITEMS.get(row, '')[:COLS-8])
+        paint(ctx, 'typing_long.wav', row, row)
+
+def render_input_box(ctx):
+    ctx.screen.clear_eol(LINES, 1)
+    ctx.screen.put(LINES, 1, '[ENTER QUERY]')
+    ctx.screen.move(LINES, 15)
+    paint(ctx)
+
+def draw_layout(ctx):
+    if ctx.screen.have is not None:
+        redraw_layout(ctx)
+        return
+    render_header(ctx)
+    render_menu(ctx)
+    render_input_box(ctx)
+
+def redraw_layout(ctx):
+    """Retour d'une autre page : le modèle du menu est construit en entier
+    sans effacer l'écran, puis seules les différences partent, par bandes
+    au rythme du son de frappe."""
+    screen = ctx.screen
+    for r in (1, 2):
+        screen.put(r, 1, ' ' * COLS, standout=True)
+    put_title(screen)
+    put_banner(screen)
+    screen.clear_rows(3, LINES)
+    put_separator(screen)
+    for row, item in ITEMS.items():
+        screen.put(row, 4, item[:COLS-8])
+    screen.put(LINES, 1, '[ENTER QUERY]')
+    screen.target = None   # curseur placé une fois, au dernier flush
+    paint(ctx, 'typing_long.wav', 1, 2)
+    for row in ITEMS:
+        paint(ctx, 'typing_long.wav', row, row)
+    screen.move(LINES, 15)
+    paint(ctx)
+
+def render_layout(ctx):
+    # premier affichage : gabarit précompilé (minitel/assets.py)
+    assets.layout(ctx, 'menu', draw_layout, [__file__])
+
+def show_status(ctx, text, row=6):
+    ctx.screen.clear_eol(row, 1); ctx.screen.put(row, 1, safe_line(text)[:COLS-2])
+    paint(ctx)
+
+# ----- actions -----
+
+def scroll_file(ctx, filename):
+    ser, screen = ctx.ser, ctx.screen
+    try:
+        lines = read_text_lines(ctx.path(filename))
+    except OSError:
+        show_status(ctx, f"Fichier introuvable: {filename}")
+        return
+
+    top, bottom = 4, 23          # fenêtre 4–23
+    window = bottom - top + 1    # 20
+
+    # Nettoyer la fenêtre une fois
+    screen.clear_rows(top, bottom, 2)
+    paint(ctx)
+
+    # Masquer le curseur pendant l’animation
+    send(ser, seq_civis())
+    screen.forget_cursor()
+
+    filled = 0
+    # >>> son de “dactylo” pendant tout le défilement
+    lp = LoopPlayer(ctx.path('loud_type_start.wav')); lp.start()
+
+    for ln in lines:
+        txt = ln[:COLS-2]
+
+        if filled < window:
+            # Remplissage initial: écrire à la suite
+            row = top + filled
+            filled += 1
+        else:
+            # Défilement: supprimer ligne 4 puis écrire en bas (23)
+            send(ser, screen.delete_line(top))
+            row = bottom
+        screen.clear_eol(row, 2); screen.put(row, 2, txt)
+        paint(ctx, top=row, bottom=row)
+
+        time.sleep(SCROLL_DELAY)
+    drain(ser)
+    lp.stop_now()  # <<< stop quand le défilement est terminé
+
+    # Message fin + attente Entrée
+    screen.clear_eol(bottom, 2); screen.put(bottom, 2, "[FIN. Appuyez ENTREE pour revenir]")
+    paint(ctx)
+    send(ser, seq_cnorm())
+    screen.forget_cursor()
+    wait_enter(ctx)
+    render_layout(ctx)
+
+# ----- boucle d'entrée -----
+def process_query(ctx, q):
+    """Exécute la commande, renvoie la scène suivante (ou None pour rester)."""
+    q = q.strip()
+    if q == '1':
+        return 'apollo_boot'
+    if q in FILES:
+        mode = MODES.get(q, 'paged')
+        if mode == 'scroll':
+            scroll_file(ctx, FILES[q])
+        else:
+            paged_file(ctx, FILES[q])
+    else:
+        show_status(ctx, f"Commande inconnue: {q}")
+    return None
+
+def input_loop(ctx):
+    ser, screen, keys = ctx.ser, ctx.screen, ctx.keys
+    max_input = COLS - 15
+    buffer = []
+    col = 15
+    screen.move(LINES, col); paint(ctx)
+    while True:
+        key = keys.get()
+
+        if key == ENVOI:
+            query = ''.join(buffer)
+            # efface l’écho
+            screen.clear_eol(LINES, 15); screen.move(LINES, 15)
+            paint(ctx)
+            buffer = []
+            scene = process_query(ctx, query)
+            if scene:
+                drain(ser)
+                return scene
+            continue
+
+        if key in (CORRECTION, ANNULATION):
+            if buffer:
+                del buffer[-1 if key == CORRECTION else 0:]
+                col = 15 + len(buffer)
+                screen.clear_eol(LINES, col); screen.move(LINES, col)
+        elif len(key) == 1 and 32 <= ord(key) <= 126 and len(buffer) < max_input:
+            screen.put(LINES, 15 + len(buffer), key)
+            buffer.append(key)
+            screen.move(LINES, 15 + len(buffer))
+        else:
+            continue   # ignorer le reste
+        # saisie groupée (collage, frappe rapide) : un seul envoi
+        if not keys.ready():
+            paint(ctx)
+
+def run(ctx):
+    render_layout(ctx)
+    return input_loop(ctx)
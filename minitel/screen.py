@@ -0,0 +1,217 @@
+"""
+Écran virtuel 80x24 avec réaffichage différentiel.
+
+Le dessin se fait dans un modèle (caractère + inverse vidéo par case).
+flush() compare ce modèle à ce que le Minitel affiche réellement et renvoie
+le flot d'octets minimal pour l'y amener : seules les cases qui diffèrent
+partent sur la ligne, avec le déplacement le plus court (cup, CR, CR LF,
+BS) et `el` quand c'est moins cher que des espaces. Si l'état physique est
+inconnu, ou si un effacement complet coûte moins cher, on repart d'un clear.
+
+Usage:
+  screen = Screen()
+  screen.clear_rows(4, 23); screen.put(4, 2, "TEXTE"); screen.move(24, 15)
+  send(ser, screen.flush())
+"""
+
+from minitel import codec
+from minitel.terminfo import (COLS, LINES, seq_cup, seq_clear, seq_el,
+                              seq_smso, seq_rmso, seq_dl1)
+
+BLANK = (' ', False)
+
+
+def _blank_rows(rows, cols):
+    return [[BLANK] * cols for _ in range(rows)]
+
+
+class Screen:
+    def __init__(self, rows=LINES, cols=COLS):
+        self.rows = rows
+        self.cols = cols
+        self.want = _blank_rows(rows, cols)   # modèle
+        self.have = None                      # Minitel (None = inconnu)
+        self.cursor = None                    # curseur physique (row, col)
+        self.standout = None                  # attribut physique courant
+        self.target = None                    # curseur voulu après flush
+
+    # ----- état physique -----
+
+    def invalidate(self):
+        """Le Minitel a pu être modifié hors de l'écran virtuel."""
+        self.have = None
+        self.cursor = None
+        self.standout = None
+
+    def forget_cursor(self):
+        """Octets envoyés en direct : on ne sait plus où est le curseur."""
+        self.cursor = None
+
+    def snapshot(self):
+        """Modèle et curseur, sérialisables (gabarits de minitel/assets.py)."""
+        return {'text': [''.join(ch for ch, _ in line) for line in self.want],
+                'standout': [''.join('1' if so else '0' for _, so in line) for line in self.want],
+                'cursor': self.cursor, 'attr': self.standout, 'target': self.target}
+
+    def restore(self, state):
+        """Le flot d'un gabarit vient d'être envoyé : le Minitel affiche state."""
+        self.want = [[(ch, so == '1') for ch, so in zip(text, attrs)]
+                     for text, attrs in zip(state['text'], state['standout'])]
+        self.have = [line[:] for line in self.want]
+        self.cursor = tuple(state['cursor']) if state['cursor'] else None
+        self.standout = state['attr']
+        self.target = tuple(state['target']) if state['target'] else None
+
+    # ----- dessin dans le modèle -----
+
+    def clear(self):
+        self.want = _blank_rows(self.rows, self.cols)
+
+    def clear_rows(self, top, bottom, col=1):
+        for r in range(top, bottom + 1):
+            self.clear_eol(r, col)
+
+    def clear_eol(self, row, col=1):
+        line = self.want[row - 1]
+        for c in range(col - 1, self.cols):
+            line[c] = BLANK
+
+    def put(self, row, col, text, standout=False):
+        """Écrit text en (row, col), tronqué au bord droit."""
+        if not 1 <= row <= self.rows:
+            return
+        line = self.want[row - 1]
+        c = col - 1
+        for ch in text:
+            if c >= self.cols:
+                break
+            if c >= 0:
+                line[c] = (ch, standout)
+            c += 1
+
+    def move(self, row, col):
+        """Position du curseur à laisser après le prochain flush."""
+        self.target = (row, col)
+
+    def text(self, row):
+        return ''.join(ch for ch, _ in self.want[row - 1])
+
+    def delete_line(self, row):
+        """dl1 physique en `row` : le bas de l'écran remonte d'une ligne.
+
+        Le décalage s'applique au modèle et à l'état connu du Minitel, les
+        différences en attente restent donc valables.
+        """
+        out = _move(self.cursor, row, 1) + seq_dl1()
+        for grid in (self.want, self.have):
+            if grid is not None:
+                del grid[row - 1]
+                grid.append([BLANK] * self.cols)
+        self.cursor = (row, 1)
+        return out
+
+    # ----- émission -----
+
+    def flush(self, top=1, bottom=None):
+        """Octets à envoyer pour que le Minitel corresponde au modèle.
+
+        top/bottom limitent l'émission à une bande de lignes (affichage
+        ligne à ligne synchronisé avec le son) ; le reste attend le
+        prochain flush.
+        """
+        partial = bottom is not None
+        bottom = bottom or self.rows
+        if self.have is None:
+            out, cursor, so = self._repaint()
+            partial = False
+        else:
+            out, cursor, so = self._paint(self.have, self.cursor, self.standout, top, bottom)
+            if not partial and len(out) > 2 * self.cols:
+                # beaucoup de changements : un clear est peut-être moins cher
+                full = self._repaint()
+                if len(full[0]) < len(out):
+                    out, cursor, so = full
+        if self.target is not None and cursor != self.target:
+            out += _move(cursor, *self.target)
+            cursor = self.target
+        self.cursor, self.standout = cursor, so
+        if partial:
+            for r in range(top - 1, bottom):
+                self.have[r] = self.want[r][:]
+        else:
+            self.have = [line[:] for line in self.want]
+        return bytes(out)
+
+    def _repaint(self):
+        out = bytearray(seq_clear())
+        body, cursor, so = self._paint(_blank_rows(self.rows, self.cols), (1, 1), None)
+        out += body
+        return out, cursor, so
+
+    def _paint(self, have, cursor, so, top=1, bottom=None):
+        out = bytearray()
+        el = seq_el()
+        cells = codec.cells()   # case -> octets (accents G2 ou non)
+        for r in range(top - 1, bottom or self.rows):
+            old, new = have[r], self.want[r]
+            changed = [c for c in range(self.cols) if old[c] != new[c]]
+            if not changed:
+                continue
+            # fin de ligne vide dans le modèle : `el` au lieu d'espaces
+            tail = self.cols
+            while tail > 0 and new[tail - 1] == BLANK:
+                tail -= 1
+            tail_changed = [c for c in changed if c >= tail]
+            use_el = bool(tail_changed) and len(el) < tail_changed[-1] - tail_changed[0] + 1
+            if use_el:
+                changed = [c for c in changed if c < tail]
+
+            for a, b in _runs(r + 1, changed):
+                out += _move(cursor, r + 1, a + 1)
+                for c in range(a, b + 1):
+                    ch, attr = new[c]
+                    if attr != so:
+                        out += seq_smso() if attr else seq_rmso()
+                        so = attr
+                    out += cells[ch]
+                # au-delà de la dernière colonne, position dépendante du terminal
+                cursor = (r + 1, b + 2) if b + 1 < self.cols else None
+            if use_el:
+                out += _move(cursor, r + 1, tail_changed[0] + 1)
+                cursor = (r + 1, tail_changed[0] + 1)
+                if so is not False:
+                    out += seq_rmso()
+                    so = False
+                out += el
+        if so:
+            out += seq_rmso()
+            so = False
+        return out, cursor, so
+
+
+def _runs(row, changed):
+    """Regroupe les cases modifiées : réécrire un petit trou inchangé
+    coûte moins cher qu'un nouveau cup."""
+    runs = []
+    for c in changed:
+        if runs and c - runs[-1][1] - 1 < len(seq_cup(row, c + 1)):
+            runs[-1][1] = c
+        else:
+            runs.append([c, c])
+    return runs
+
+
+def _move(cursor, row, col):
+    """Déplacement le plus court depuis cursor (None = inconnu)."""
+    if cursor == (row, col):
+        return b''
+    best = seq_cup(row, col)
+    if cursor is not None:
+        crow, ccol = cursor
+        if col == 1 and crow == row:
+            best = b'\r'
+        elif col == 1 and crow + 1 == row:
+            best = b'\r\n'
+        elif crow == row and 0 < ccol - col < len(best):
+            best = b'\b' * (ccol - col)
+    return best
@@ -0,0 +1,79 @@
+"""
+Défilement de texte ligne à ligne dans une fenêtre top..bottom.
+
+Comme tout terminal qui a `ind`, le Minitel fait défiler l'écran quand le
+curseur descend depuis la dernière ligne : une nouvelle ligne entre avec un
+seul NEL, au lieu de cup(top) + dl1 + cup(bottom) + el. Méthode retenue
+selon la fenêtre et les capacités terminfo :
+  native  fenêtre jusqu'à la dernière ligne de l'écran, top = 1 : NEL
+  region  zone de défilement (`csr`) si l'entrée en a une : NEL en bas de
+          la zone, lignes hors zone intactes
+  below   pas de `csr` (Minitel), fenêtre 1..bottom au-dessus de lignes
+          vides (ligne 24 gardée libre) : on descend en bas, NEL, puis on
+          remonte (cuu1) ; les lignes vides remontent avec le reste
+  dl1     repli : cup(top) + dl1 + cup(bottom) + el
+
+Usage:
+  scroller = Scroller(1, LINES - 1)
+  frames = [scroller.start()] + [scroller.line(t) for t in lines] + [scroller.end()]
+"""
+
+from minitel.terminfo import LINES, tput, seq_cup, seq_el, seq_dl1, seq_nel
+
+
+def method_for(top, bottom, rows=LINES):
+    """Méthode de défilement disponible pour la fenêtre top..bottom."""
+    nel = tput('nel') or (tput('cr') and tput('ind'))
+    if top == 1 and bottom == rows and nel:
+        return 'native'
+    if tput('csr') and nel:
+        return 'region'
+    if top == 1 and nel and tput('cuu1') and tput('cud1'):
+        return 'below'
+    return 'dl1'
+
+
+class Scroller:
+    def __init__(self, top, bottom, method=None, rows=LINES):
+        self.top = top
+        self.bottom = bottom
+        self.rows = rows
+        self.method = method or method_for(top, bottom, rows)
+        self.filled = 0
+        self.nel = seq_nel() if tput('nel') else tput('cr') + tput('ind')
+
+    def start(self):
+        """Nettoie la fenêtre (et les lignes du dessous qui défilent avec)."""
+        last = self.rows if self.method == 'below' else self.bottom
+        out = b''.join(seq_cup(r, 1) + seq_el() for r in range(self.top, last + 1))
+        if self.method == 'region':
+            out += tput('csr', self.top - 1, self.bottom - 1)
+        return out
+
+    def line(self, data):
+        """Octets pour faire entrer la ligne data (octets) en bas de la fenêtre."""
+        window = self.bottom - self.top + 1
+        if self.filled < window:
+            row = self.top + self.filled
+            self.filled += 1
+            # fenêtre vide : pas de `el` ; ligne suivante par CR LF
+            move = seq_cup(row, 1) if self.filled == 1 or self.method == 'dl1' else b'\r\n'
+            if self.method == 'dl1':
+                move += seq_el()
+            return move + data
+        if self.method == 'native':
+            return self.nel + data
+        if self.method == 'below':
+            below = self.rows - self.bottom
+            return tput('cud1') * below + self.nel + tput('cuu1') * below + data
+        if self.method == 'region':
+            return self.nel + data
+        # supprimer la première ligne puis écrire en bas
+        return (seq_cup(self.top, 1) + seq_dl1() +
+                seq_cup(self.bottom, 1) + seq_el() + data)
+
+    def end(self):
+        """Rétablit la zone de défilement complète (région)."""
+        if self.method == 'region':
+            return tput('csr', 0, self.rows - 1)
+        return b''
@@ -0,0 +1,164 @@
+"""
+Écriture série asynchrone, cadencée sur le débit réel de la ligne.
+
+Un thread d'écriture par port, alimenté par une file de memoryview (aucune
+copie des tampons à découper). Le débit est limité par un seau à jetons
+calculé depuis --baud et le tramage (7E1 = 1 start + 7 données + 1 parité
++ 1 stop = 10 bits par caractère). On ne s'arrête que si le Minitel envoie
+XOFF : le driver tty (xonxoff=True) bloque alors la sortie et la file
+d'attente du noyau (out_waiting) ne se vide plus.
+
+Si une écriture échoue (adaptateur USB débranché...), le reste de la file
+est abandonné et l'erreur est relevée par le send() ou le drain() suivant :
+l'écran virtuel ne correspond plus au Minitel, la scène ne doit pas
+continuer comme si de rien n'était.
+
+Usage:
+  send(ser, data)   # met en file et rend la main tout de suite
+  drain(ser)        # attend que tout soit réellement parti
+  close(ser)        # vide puis arrête le thread, ferme le port
+"""
+
+import time
+import queue
+import threading
+
+from minitel import tracing
+
+BURST = 32   # octets max d'avance dans le tampon du noyau
+
+
+def frame_bits(ser):
+    """Bits sur la ligne par caractère (start + données + parité + stop)."""
+    bits = 1 + int(getattr(ser, 'bytesize', 8))
+    if getattr(ser, 'parity', 'N') not in ('N', None):
+        bits += 1
+    return bits + float(getattr(ser, 'stopbits', 1))
+
+
+class SerialWriter:
+    def __init__(self, ser, baud=None, burst=BURST):
+        self.ser = ser
+        self.rate = (baud or ser.baudrate) / frame_bits(ser)   # octets/s
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+        self.error = None
+        self.sent = 0
+        self.on_first = None   # rappel au prochain octet écrit (voir arm)
+        self.q = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True,
+                                       name=f'serial-writer {getattr(ser, "port", "")}')
+        self.thread.start()
+
+    def write(self, data):
+        """Met data en file (bytes, bytearray ou memoryview) et rend la main."""
+        self.check()
+        if data:
+            self.q.put(memoryview(data))
+
+    def drain(self):
+        """Attend que la file et le tampon du port soient vides."""
+        with tracing.span('serial.drain', queued=self.q.qsize()):
+            self.q.join()
+            self.check()
+            try:
+                self.ser.flush()   # tcdrain : jusqu'au dernier bit
+            except Exception:
+                pass
+
+    def check(self):
+        """Relève l'erreur d'écriture du thread, s'il y en a eu une."""
+        if self.error is not None:
+            raise self.error
+
+    def arm(self, callback):
+        """callback(t) sera appelé (thread d'écriture) au prochain octet parti."""
+        self.on_first = callback
+
+    def close(self):
+        self.q.put(None)
+        self.thread.join()
+
+    # ----- thread d'écriture -----
+
+    def _run(self):
+        while True:
+            view = self.q.get()
+            try:
+                if view is None:
+                    return
+                while view and self.error is None:   # après une erreur : file abandonnée
+                    n = self._take(len(view))
+                    self.ser.write(view[:n])
+                    self.sent += n
+                    view = view[n:]
+                    if self.on_first is not None:
+                        callback, self.on_first = self.on_first, None
+                        callback(time.monotonic())
+            except Exception as e:
+                # relevée par send() / drain() ; le thread survit pour vider la file
+                if self.error is None:
+                    print(f"[SERIE] ecriture impossible sur {getattr(self.ser, 'port', '?')} : "
+                          f"{e.__class__.__name__}: {e}", flush=True)
+                self.error = e
+            finally:
+                self.q.task_done()
+
+    def _take(self, want):
+        """Attend des jetons, renvoie le nombre d'octets autorisés."""
+        need = min(want, self.burst)
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens >= need and not self._stalled():
+                n = min(want, int(self.tokens))
+                self.tokens -= n
+                return n
+            time.sleep(max(need - self.tokens, 1.0) / self.rate)
+
+    def _stalled(self):
+        # XOFF reçu : le noyau garde nos octets, inutile d'en empiler d'autres
+        try:
+            return self.ser.out_waiting > self.burst
+        except Exception:
+            return False
+
+
+_writers = {}
+_lock = threading.Lock()
+
+
+def writer_for(ser):
+    """Le writer du port (créé au premier envoi)."""
+    w = _writers.get(id(ser))
+    if w is None or w.ser is not ser:
+        with _lock:
+            w = _writers.get(id(ser))
+            if w is None or w.ser is not ser:
+                w = _writers[id(ser)] = SerialWriter(ser)
+    return w
+
+
+def send(ser, data):
+    writer_for(ser).write(data)
+
+
+def drain(ser):
+    w = _writers.get(id(ser))
+    if w is not None and w.ser is ser:
+        w.drain()
+
+
+def close(ser):
+    """Vide la file, arrête le thread puis ferme le port."""
+    w = _writers.pop(id(ser), None)
+    if w is not None and w.ser is ser:
+        try:
+            w.drain()
+        finally:
+            w.close()
+            ser.close()
+    else:
+        ser.close()
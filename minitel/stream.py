@@ -0,0 +1,172 @@
+"""
+Réponses en flux : découpage en lignes au fil des tokens.
+
+LineWrapper reproduit textwrap.wrap appliqué paragraphe par paragraphe
+(comme wrap_lines) mais de façon incrémentale : chaque morceau reçu rend les
+lignes terminées, la ligne en cours reste lisible via `partial`.
+Comme le texte final est strip()é, les blancs et sauts de ligne de tête
+sont ignorés et ceux de fin ne produisent pas de lignes vides.
+
+StreamReply consomme un itérateur asynchrone de morceaux dans sa propre
+tâche : l'affichage lit les lignes disponibles pendant que la suite continue
+d'arriver, y compris quand l'écran attend [Suite: ENVOI].
+"""
+
+import time
+import asyncio
+
+
+class LineWrapper:
+    def __init__(self, width):
+        self.width = width
+        self.line = ''          # ligne en construction
+        self.space = ''         # blancs en attente entre deux mots
+        self.chunk = ''         # mot ou suite de blancs en cours
+        self.started = False    # premier caractère non blanc vu
+        self.para_start = True  # début de paragraphe (indentation gardée)
+        self.newlines = 0       # sauts de ligne pas encore appliqués
+
+    def feed(self, text):
+        """Ajoute du texte, renvoie les lignes terminées."""
+        out = []
+        for ch in text:
+            if ch == '\r':
+                continue
+            if ch == '\n':
+                if self.started:
+                    self._commit(out)
+                    self.newlines += 1
+                continue
+            if ch == '\t':
+                ch = ' '
+            if ch == ' ' and not self.started:
+                continue
+            if ch != ' ':
+                self.started = True
+                if self.newlines:
+                    self._new_paragraphs(out)
+            if self.chunk and (ch == ' ') != (self.chunk[0] == ' '):
+                self._commit(out)
+            self.chunk += ch
+        return out
+
+    def close(self):
+        """Fin du flux : renvoie les dernières lignes."""
+        out = []
+        if self.chunk and self.chunk[0] != ' ':
+            self._commit(out)
+        if self.started:
+            out.append(self.line)
+        else:
+            out.append('')
+        self.line = ''
+        return out
+
+    @property
+    def partial(self):
+        """Ligne en cours telle qu'elle s'afficherait maintenant."""
+        if self.newlines:
+            return self.line
+        if self.chunk and self.chunk[0] != ' ':
+            cand = self.line + self.space + self.chunk if self.line else self.space + self.chunk
+            if len(cand) <= self.width:
+                return cand
+        return self.line
+
+    def _new_paragraphs(self, out):
+        # self.chunk contient l'éventuelle indentation du nouveau paragraphe
+        out.append(self.line)
+        out.extend([''] * (self.newlines - 1))
+        self.line = ''
+        self.space = ''
+        self.newlines = 0
+        self.para_start = True
+
+    def _commit(self, out):
+        chunk, self.chunk = self.chunk, ''
+        if not chunk:
+            return
+        if chunk[0] == ' ':
+            # blancs : gardés seulement en début de paragraphe ou entre mots
+            if self.line or self.para_start:
+                self.space = chunk
+            return
+        cand = self.line + self.space + chunk
+        if len(cand) <= self.width:
+            self.line = cand
+        else:
+            if self.line:
+                out.append(self.line)
+            self.line = chunk
+            while len(self.line) > self.width:
+                out.append(self.line[:self.width])
+                self.line = self.line[self.width:]
+        self.space = ''
+        self.para_start = False
+
+
+class StreamReply:
+    """Consomme un flux asynchrone de morceaux de texte et l'enveloppe.
+
+    La lecture tourne dans sa propre tâche asyncio : l'affichage attend les
+    lignes avec changed() pendant que la suite continue d'arriver.
+    cancel() abandonne le flux (et donc la connexion HTTP).
+    """
+
+    def __init__(self, chunks, width, sanitize=None):
+        self.wrapper = LineWrapper(width)
+        self.sanitize = sanitize
+        self.lines = []
+        self.partial = ''
+        self.done = False
+        self.error = None
+        self.t_start = time.monotonic()
+        self.t_first_token = None
+        self._event = asyncio.Event()
+        self.task = asyncio.ensure_future(self._run(chunks))
+
+    async def _run(self, chunks):
+        try:
+            async for delta in chunks:
+                if self.sanitize:
+                    delta = self.sanitize(delta)
+                if self.t_first_token is None:
+                    self.t_first_token = time.monotonic()
+                self.lines.extend(self.wrapper.feed(delta))
+                self.partial = self.wrapper.partial
+                self._event.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            await chunks.aclose()
+            if self.sanitize:
+                # fin de flux : caractère gardé par un nettoyage incrémental
+                tail = self.sanitize('', True)
+                if tail:
+                    self.lines.extend(self.wrapper.feed(tail))
+            self.lines.extend(self.wrapper.close())
+            self.partial = ''
+            self.done = True
+            self._event.set()
+
+    async def changed(self, nlines, partial):
+        """Attend qu'il y ait plus que (nlines, partial) ou la fin du flux.
+
+        Renvoie (lignes, ligne en cours, terminé).
+        """
+        while not (self.done or len(self.lines) > nlines or self.partial != partial):
+            self._event.clear()
+            await self._event.wait()
+        return list(self.lines), self.partial, self.done
+
+    def cancel(self):
+        self.task.cancel()
+
+    @property
+    def ttft(self):
+        """Délai jusqu'au premier token de l'API (secondes)."""
+        if self.t_first_token is None:
+            return None
+        return self.t_first_token - self.t_start
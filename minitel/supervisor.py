@@ -0,0 +1,198 @@
+"""
+Superviseur : un seul processus possède le port série et enchaîne les scènes.
+
+Remplace la chaîne boot.py -> terminal.py -> apollo-boot.py -> apollo-gpt.py
+(un interpréteur et une réouverture du port par écran). Les scènes
+partagent le port et son thread d'écriture, l'écran virtuel, la boucle
+asyncio et le ChatCore (historique, connexions HTTP).
+
+Chaque transition est chronométrée jusqu'au premier octet de la scène
+suivante sur la ligne, et journalisée sur la sortie standard :
+  [SUPERVISEUR] menu -> apollo_boot : premier octet 4 ms
+
+Avec --trace / --metrics-port, transitions et scènes sont aussi tracées
+(minitel/tracing.py).
+
+Usage:
+  python boot.py --device /dev/ttyUSB0 --baud 4800 --term minitel1b-80
+  python boot.py --trace spans.jsonl --metrics-port 9108
+"""
+
+import os
+import glob
+import time
+import asyncio
+import argparse
+import importlib
+
+from minitel import audio, budget, codec, terminfo, serial_writer, tracing
+from minitel.port import SERIAL_DEVICE, BAUD, open_port
+from minitel.runtime import KeyReader
+from minitel.screen import Screen
+from minitel.terminfo import COLS, LINES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# importées à la première visite (openai n'est chargé qu'avec APOLLO)
+SCENES = {
+    'boot': 'minitel.scenes.boot',
+    'menu': 'minitel.scenes.menu',
+    'apollo_boot': 'minitel.scenes.apollo_boot',
+    'apollo': 'minitel.scenes.apollo',
+}
+
+
+class Context:
+    """État partagé par les scènes."""
+
+    def __init__(self, ser, args, name=None):
+        self.ser = ser
+        self.args = args
+        self.name = name                       # terminal (hub), préfixe des logs
+        self.screen = Screen(LINES, COLS)
+        self.keys = KeyReader(ser, args.debug)     # clavier des écrans synchrones
+        self.chat = None                       # ChatCore, créé par APOLLO
+        self.client = None                     # client API partagé (hub)
+        self.cache = None                      # ResponseCache, partagé par le hub
+        self.warmup = None                     # thread de préchauffage d'APOLLO
+        self.recording = None                  # gabarit en compilation (assets)
+        self.loop = asyncio.new_event_loop()   # gardée d'une scène à l'autre
+
+    def path(self, name):
+        """Fichiers (textes, sons, prompt) relatifs au dossier du projet."""
+        return os.path.join(ROOT, name)
+
+    def close(self):
+        if self.warmup is not None:
+            self.warmup.join(timeout=1.0)
+        if not self.loop.is_running():   # préchauffage bloqué sur le réseau
+            self.loop.close()
+        if self.chat is not None:
+            self.chat.usage_report(self.name)
+            if self.chat.transcript is not None:
+                self.chat.transcript.close()
+
+
+def build_parser(start):
+    parser = argparse.ArgumentParser(description='Minitel 1B : boot, menu et APOLLO')
+    parser.add_argument('--device', default=SERIAL_DEVICE)
+    parser.add_argument('--baud', type=int, default=BAUD)
+    parser.add_argument('--term', default=None)
+    parser.add_argument('--debug', action='store_true')
+    parser.add_argument('--accents', action='store_true',
+                        help='lettres accentuées en séquences G2 (sinon e pour é)')
+    parser.add_argument('--audio', default=os.environ.get('MINITEL_AUDIO', 'aplay'),
+                        help="sortie son : aplay, null ou file:sortie.wav")
+    parser.add_argument('--trace', default=os.environ.get('MINITEL_TRACE'),
+                        help='journal JSONL des durées par étape')
+    parser.add_argument('--metrics-port', type=int, default=0,
+                        help='sert les histogrammes sur http://127.0.0.1:PORT/metrics')
+    # sons et textes des écrans de boot
+    parser.add_argument('--boot-snd', default='boot.wav')
+    parser.add_argument('--beep-snd', default='beep.wav')
+    parser.add_argument('--type-snd', default='typing_long.wav')
+    parser.add_argument('--subtlelong-snd', default='subtle_long_type.wav')
+    parser.add_argument('--final-snd', default='horn.wav')
+    parser.add_argument('--art', default='art.txt')
+    if start == 'apollo_boot':
+        # compatibilité : --logo de apollo-boot.py désigne le logo d'APOLLO
+        parser.add_argument('--logo', dest='apollo_logo', default='1.txt')
+        parser.add_argument('--boot-logo', dest='logo', default='logo.txt')
+    else:
+        parser.add_argument('--logo', default='logo.txt')
+        parser.add_argument('--apollo-logo', default='1.txt')
+    parser.add_argument('--boottxt', default='boot.txt')
+    # APOLLO
+    parser.add_argument('--backend', default=None,
+                        help='openai, local ou mock (sinon APOLLO_BACKEND du .env, puis openai)')
+    parser.add_argument('--model', default=None,
+                        help='modèle (défaut : gpt-5-mini, LOCAL_MODEL en local)')
+    parser.add_argument('--max-tokens', type=int, default=0,
+                        help="longueur maximale d'une réponse en tokens (0 = libre, ou d'après --pages)")
+    parser.add_argument('--pages', type=int, default=0,
+                        help="plafonne les réponses à N pages d'écran (0 = longueur libre)")
+    parser.add_argument('--max-render', type=float, default=60.0,
+                        help="avec --pages : secondes d'affichage au plus par réponse, au débit --baud")
+    parser.add_argument('--price', type=budget.parse_price, default=None,
+                        help="prix IN,CACHED,OUT en $ par million de tokens (sinon celui du modèle)")
+    parser.add_argument('--prompt-file', default='prompt.txt')
+    parser.add_argument('--history-tokens', type=int, default=2000,
+                        help="budget de tokens des échanges récents (au-delà : résumé)")
+    parser.add_argument('--lore-k', type=int, default=3,
+                        help='sections de prompt.txt envoyées par question (0 = prompt complet)')
+    parser.add_argument('--lore-debug', action='store_true', help='affiche les sections retenues')
+    parser.add_argument('--cache-file', default='apollo_cache.json')
+    parser.add_argument('--cache-ttl', type=float, default=7 * 24 * 3600, help='secondes')
+    parser.add_argument('--cache-size', type=int, default=500)
+    parser.add_argument('--cache-fuzzy', type=float, default=0.0,
+                        help='similarité mini (0-1) pour servir une question proche, 0 = exacte')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--transcript-file', default='transcript.jsonl',
+                        help='journal des conversations (reprise au redémarrage, /history)')
+    parser.add_argument('--no-transcript', action='store_true')
+    parser.add_argument('--stream', action='store_true', help='affiche la réponse au fil des tokens')
+    parser.add_argument('--hedge-model', default=None,
+                        help='modèle de secours relancé si --model tarde (ex. gpt-4.1-nano)')
+    parser.add_argument('--hedge-after', type=float, default=1.5,
+                        help='secondes sans premier token avant la relance')
+    parser.add_argument('--api-deadline', type=float, default=60.0,
+                        help="secondes par requête, relances comprises (premier token en flux)")
+    parser.add_argument('--api-attempts', type=int, default=3, help='essais au plus par requête')
+    parser.add_argument('--breaker-failures', type=int, default=3,
+                        help="échecs consécutifs avant de couper l'API (réponses hors ligne)")
+    parser.add_argument('--breaker-cooldown', type=float, default=30.0,
+                        help="secondes coupée avant un nouvel essai")
+    parser.add_argument('--offline-file', default='offline.txt',
+                        help='réponses hors ligne, blocs séparés par une ligne vide')
+    parser.add_argument('--no-warm', action='store_true',
+                        help="pas de préchauffage d'APOLLO pendant son écran de boot")
+    parser.add_argument('--prime', action='store_true',
+                        help='préchauffage avec une mini-requête (amorce le cache de prompt)')
+    return parser
+
+
+def log_transition(ctx, prev, name):
+    """Chronomètre la transition jusqu'au premier octet de la scène `name`."""
+    t0 = time.monotonic()
+
+    def first_byte(t):
+        tracing.record(f'transition.{name}', t - t0, src=prev or 'start')
+        who = f" {ctx.name}" if ctx.name else ''
+        print(f"[SUPERVISEUR{who}] {prev or 'start'} -> {name} : premier octet {(t - t0) * 1000:.0f} ms",
+              flush=True)
+
+    serial_writer.writer_for(ctx.ser).arm(first_byte)
+
+
+def run(ctx, start='boot'):
+    """Enchaîne les scènes jusqu'à ce que l'une renvoie None."""
+    prev, name = None, start
+    while name is not None:
+        log_transition(ctx, prev, name)
+        with tracing.span(f'scene.{name}'):
+            scene = importlib.import_module(SCENES[name])
+            prev, name = name, scene.run(ctx)
+
+
+def main(start='boot'):
+    args = build_parser(start).parse_args()
+    tracing.configure(args.trace, args.metrics_port)
+    terminfo.set_term(args.term or terminfo.TERMNAME)
+    codec.configure(args.accents)
+
+    # tous les sons décodés une fois, avant le premier écran
+    audio.configure(args.audio)
+    audio.preload(sorted(glob.glob(os.path.join(ROOT, '*.wav'))))
+
+    ser = open_port(args.device, args.baud)
+    ctx = Context(ser, args)
+    try:
+        run(ctx, start)
+    except KeyboardInterrupt:
+        print('Exiting.')
+    finally:
+        try: serial_writer.close(ser)
+        except: pass
+        ctx.close()
+        audio.shutdown()
+        tracing.shutdown()
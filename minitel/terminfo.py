@@ -0,0 +1,185 @@
+"""
+Cache terminfo en mémoire.
+
+L'entrée (minitel1b-80 par défaut) est chargée une seule fois via
+curses.setupterm/tigetstr/tparm, puis chaque chaîne est mémorisée :
+plus aucun fork de `tput` par séquence d'échappement.
+Les cup(row, col) de toute la grille 80x24 sont précalculés.
+
+Si curses ne trouve pas l'entrée (ou si une autre entrée est déjà chargée
+dans le processus, setupterm n'étant effectif qu'une fois), on retombe sur
+`tput`, mais un seul appel par chaîne distincte.
+Les replis ANSI des anciens helpers sont conservés.
+"""
+
+import os
+import re
+import subprocess
+
+from minitel import tracing
+
+try:
+    import curses
+except ImportError:  # pas de curses (Windows...)
+    curses = None
+
+TERMNAME = os.environ.get('MINITEL_TERM', 'minitel1b-80')
+COLS = 80
+LINES = 24
+
+# padding terminfo ($<5>, $<2*/>) : tput le consomme, tparm le laisse passer
+_PADDING = re.compile(rb'\$<[0-9.]+[*/]*>')
+
+# replis si la capacité n'existe pas (identiques aux anciens seq_*)
+FALLBACKS = {
+    'clear': b"\x1b[2J\x1b[H",
+    'smso':  b"\x1b[7m",
+    'rmso':  b"\x1b[27m",
+    'el':    b"\x1b[K",
+    'dl1':   b"\x1b[M",
+    'nel':   b"\x1bE",
+    'civis': b"",
+    'cnorm': b"",
+}
+
+_curses_term = None   # entrée effectivement chargée par setupterm
+
+
+def _setupterm(term):
+    """Charge l'entrée via curses. Renvoie True si elle est utilisable."""
+    global _curses_term
+    if curses is None:
+        return False
+    if _curses_term is not None:
+        # setupterm n'est pris en compte qu'une fois par processus
+        return _curses_term == term
+    fd = os.open(os.devnull, os.O_WRONLY)
+    try:
+        curses.setupterm(term, fd)
+    except curses.error:
+        return False
+    finally:
+        os.close(fd)
+    _curses_term = term
+    return True
+
+
+def _tput_subprocess(term, name, *args):
+    cmd = ['tput', '-T', term, name]
+    if args:
+        cmd += [str(a) for a in args]
+    try:
+        with tracing.span('terminfo.tput', cap=name):
+            return subprocess.check_output(cmd, stderr=subprocess.DEVNULL)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return b''
+
+
+class Terminfo:
+    """Capacités d'une entrée terminfo, mémorisées."""
+
+    def __init__(self, term=TERMNAME):
+        self.term = term
+        self.native = _setupterm(term)
+        self._strings = {}
+        self._params = {}
+        self._grid = None
+
+    def get(self, name):
+        """Chaîne brute de la capacité (b'' si absente)."""
+        s = self._strings.get(name)
+        if s is None:
+            if self.native:
+                s = curses.tigetstr(name) or b''
+                s = _PADDING.sub(b'', s)
+            else:
+                s = _tput_subprocess(self.term, name)
+            self._strings[name] = s
+        return s
+
+    def param(self, name, *args):
+        """Capacité paramétrée (cup, dl, cub...), mémorisée par arguments."""
+        key = (name,) + args
+        s = self._params.get(key)
+        if s is None:
+            if self.native:
+                raw = self.get(name)
+                s = curses.tparm(raw, *args) if raw else b''
+                s = _PADDING.sub(b'', s)
+            else:
+                s = _tput_subprocess(self.term, name, *args)
+            self._params[key] = s
+        return s
+
+    def cup(self, row, col):
+        """Positionnement 1-based, repli ANSI si pas de cup."""
+        if self._grid is None and self.native:
+            self._grid = [[self._cup(r, c) for c in range(1, COLS + 1)]
+                          for r in range(1, LINES + 1)]
+        if self._grid is not None and 1 <= row <= LINES and 1 <= col <= COLS:
+            return self._grid[row - 1][col - 1]
+        # via tput, précalculer 1920 positions coûterait 1920 forks :
+        # le cache se remplit au fil des appels
+        return self._cup(row, col)
+
+    def _cup(self, row, col):
+        s = self.param('cup', row - 1, col - 1)
+        return s if s else f"\x1b[{row};{col}H".encode()
+
+    def seq(self, name):
+        """Capacité simple avec repli ANSI."""
+        return self.get(name) or FALLBACKS.get(name, b'')
+
+
+_current = None
+
+
+def set_term(name):
+    """Choisit l'entrée terminfo (à appeler après lecture de --term)."""
+    global TERMNAME, _current
+    TERMNAME = name
+    if _current is not None and _current.term != name:
+        _current = None
+
+
+def caps():
+    """Moteur partagé pour TERMNAME, chargé au premier usage."""
+    global _current
+    if _current is None:
+        _current = Terminfo(TERMNAME)
+    return _current
+
+
+# ----- API compatible avec les anciens helpers -----
+
+def tput(name, *args):
+    if args:
+        return caps().param(name, *args)
+    return caps().get(name)
+
+def seq_cup(row, col):
+    return caps().cup(row, col)
+
+def seq_clear():
+    return caps().seq('clear')
+
+def seq_smso():
+    return caps().seq('smso')
+
+def seq_rmso():
+    return caps().seq('rmso')
+
+def seq_el():
+    return caps().seq('el')
+
+def seq_dl1():
+    return caps().seq('dl1')
+
+def seq_nel():
+    return caps().seq('nel')
+
+def seq_civis():
+    return caps().seq('civis')
+
+def seq_cnorm():
+    return caps().seq('cnorm')
@@ -0,0 +1,36 @@
+"""
+Nettoyage et découpage du texte pour le Minitel (80 colonnes).
+"""
+
+import textwrap
+
+from minitel import codec
+
+
+# Sanitize
+def sanitize_text(s: str) -> str:
+    # une seule table (minitel/codec.py) : typographie, accents, contrôles
+    return codec.sanitize(s)
+
+
+def safe_line(s: str) -> str:
+    # ligne de fichier texte : même table
+    return codec.sanitize(s)
+
+
+def wrap_lines(text, width):
+    out = []
+    for para in text.split('\n'):
+        out.extend(textwrap.wrap(para, width=width) or [''])
+    return out
+
+
+def read_text_lines(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    # fichiers en UTF-8 (© des logos) ; Latin-1 pour les anciens
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        text = data.decode('latin-1')
+    return text.splitlines()
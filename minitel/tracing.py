@@ -0,0 +1,241 @@
+"""
+Traces de latence par étape.
+
+Des spans (durées nommées) entourent chaque étape du pipeline : touche ->
+requête API -> nettoyage / découpage du texte -> écran -> port série, plus
+les transitions de scène et les forks de tput. Chaque span fermé est :
+  - écrit en JSONL (--trace FICHIER), une ligne par span :
+      {"ts": 1760000000.12, "span": "chat.ask", "ms": 812.4, "parent": "apollo.answer"}
+  - ajouté à un histogramme glissant (WINDOW dernières mesures par nom)
+    dont p50 / p95 / p99 sont affichés sur SIGUSR1 (kill -USR1 <pid>), en
+    fin de session, et servis au format texte Prometheus sur
+    http://127.0.0.1:<port>/metrics (--metrics-port).
+
+Désactivé (par défaut), span() rend un objet vide partagé : un test de
+booléen et deux appels de méthode vides par span.
+
+Usage:
+  with tracing.span('chat.ask', model=model):
+      ...
+  tracing.record('transition.menu', seconds)   # durée mesurée ailleurs
+  tracing.gauge('breaker_state', lambda: 2)     # valeur lue à chaque export
+"""
+
+import json
+import time
+import signal
+import threading
+import contextvars
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+WINDOW = 1000        # mesures gardées par span pour les quantiles
+QUANTILES = (0.5, 0.95, 0.99)
+
+enabled = False
+_file = None
+_server = None
+_lock = threading.Lock()    # spans venus d'autres threads (série, audio)
+_stats = {}                 # nom -> Histogram
+_gauges = {}                # nom -> (fonction, aide)
+_current = contextvars.ContextVar('span', default=None)
+
+
+class Histogram:
+    """Fenêtre glissante des dernières durées, plus totaux depuis le début."""
+
+    def __init__(self, window=WINDOW):
+        self.values = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.values.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def quantiles(self, qs=QUANTILES):
+        values = sorted(self.values)
+        if not values:
+            return [0.0 for _ in qs]
+        return [values[min(len(values) - 1, int(len(values) * q))] for q in qs]
+
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _Noop()
+
+
+class Span:
+    __slots__ = ('name', 'attrs', 'parent', 't0', 'wall', 'token')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.parent = _current.get()
+        self.token = _current.set(self.name)
+        self.wall = time.time()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.t0
+        try:
+            _current.reset(self.token)
+        except ValueError:
+            pass   # fermé dans un autre contexte (générateur asynchrone)
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        _emit(self.name, seconds, self.wall, self.parent, self.attrs)
+        return False
+
+    def set(self, **attrs):
+        """Ajoute des attributs connus en cours de route (octets, cache...)."""
+        self.attrs.update(attrs)
+
+
+def span(name, **attrs):
+    """Context manager chronométrant une étape (objet vide si désactivé)."""
+    if not enabled:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def record(name, seconds, **attrs):
+    """Enregistre une durée déjà mesurée (premier octet, premier token...)."""
+    if enabled:
+        _emit(name, seconds, time.time() - seconds, _current.get(), attrs)
+
+
+def gauge(name, fn, help=''):
+    """Valeur instantanée (état du disjoncteur...), lue par fn() à l'export."""
+    with _lock:
+        _gauges[name] = (fn, help)
+
+
+def _gauge_values():
+    with _lock:
+        gauges = sorted(_gauges.items())
+    return [(name, fn(), help) for name, (fn, help) in gauges]
+
+
+def _emit(name, seconds, wall, parent, attrs):
+    with _lock:
+        h = _stats.get(name)
+        if h is None:
+            h = _stats[name] = Histogram()
+        h.add(seconds)
+        if _file is not None:
+            line = {'ts': round(wall, 6), 'span': name, 'ms': round(seconds * 1000, 3)}
+            if parent:
+                line['parent'] = parent
+            line.update(attrs)
+            _file.write(json.dumps(line, default=str) + '\n')
+
+
+# ----- export -----
+
+def summary():
+    """Tableau texte : nombre, p50 / p95 / p99 et cumul par span (ms)."""
+    with _lock:
+        rows = [(name, h.count, h.quantiles(), h.total) for name, h in sorted(_stats.items())]
+    out = [f"{'span':<28} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'total':>10}"]
+    for name, count, qs, total in rows:
+        out.append(f"{name:<28} {count:>6} " + ' '.join(f"{q * 1000:>9.1f}" for q in qs)
+                   + f" {total * 1000:>10.0f}")
+    for name, value, _ in _gauge_values():
+        out.append(f"{name:<28} {value:>6}")
+    return '\n'.join(out)
+
+
+def metrics_text():
+    """Histogrammes au format d'exposition texte de Prometheus (summary)."""
+    with _lock:
+        rows = [(name, h.count, h.quantiles(), h.total) for name, h in sorted(_stats.items())]
+    out = ['# HELP minitel_span_seconds Stage latency over the last %d samples.' % WINDOW,
+           '# TYPE minitel_span_seconds summary']
+    for name, count, qs, total in rows:
+        for q, v in zip(QUANTILES, qs):
+            out.append(f'minitel_span_seconds{{span="{name}",quantile="{q}"}} {v:.6f}')
+        out.append(f'minitel_span_seconds_sum{{span="{name}"}} {total:.6f}')
+        out.append(f'minitel_span_seconds_count{{span="{name}"}} {count}')
+    for name, value, help in _gauge_values():
+        out += [f'# HELP minitel_{name} {help}', f'# TYPE minitel_{name} gauge',
+                f'minitel_{name} {value}']
+    return '\n'.join(out) + '\n'
+
+
+def dump():
+    """Affiche les histogrammes sur la console."""
+    print('[TRACE]\n' + summary(), flush=True)
+    if _file is not None:
+        with _lock:
+            _file.flush()
+
+
+def _on_signal(*_):
+    # hors du gestionnaire : le fil principal est peut-être en plein print
+    threading.Thread(target=dump, daemon=True).start()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        data = metrics_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def configure(path=None, port=0):
+    """Active les traces si un fichier JSONL ou un port de métriques est donné."""
+    global enabled, _file, _server
+    if not path and not port:
+        return
+    if path:
+        _file = open(path, 'a', encoding='utf-8', buffering=1)
+    if port:
+        _server = ThreadingHTTPServer(('127.0.0.1', port), _MetricsHandler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, daemon=True, name='metrics').start()
+        print(f"[TRACE] metriques sur http://127.0.0.1:{port}/metrics", flush=True)
+    if hasattr(signal, 'SIGUSR1') and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGUSR1, _on_signal)
+    enabled = True
+
+
+def shutdown():
+    """Fin de session : résumé sur la console, fichier et serveur fermés."""
+    global enabled, _file, _server
+    if not enabled:
+        return
+    dump()
+    enabled = False
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
+    with _lock:
+        if _file is not None:
+            _file.close()
+            _file = None
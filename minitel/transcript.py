@@ -0,0 +1,168 @@
+"""
+Journal des conversations d'APOLLO, en ajout seul sur disque.
+
+Chaque échange (question, réponse) est ajouté en fin de `transcript.jsonl`,
+une ligne JSON par enregistrement :
+  {"t": ..., "q": "...", "a": "..."}          échange
+  {"t": ..., "summary": "...", "upto": n}     résumé glissant (échanges <= n)
+  {"t": ..., "reset": true}                   nouvelle conversation (/reset)
+
+Un index à côté (`transcript.jsonl.idx`) donne pour chaque enregistrement,
+en taille fixe : sa position dans le journal, le numéro du dernier résumé et
+celui du début de la conversation. Au démarrage, la reprise lit la dernière
+entrée de l'index puis remonte seulement les échanges postérieurs au résumé,
+sans relire tout le journal : un redémarrage (systemd, câble débranché) ne
+coûte que quelques ms quelle que soit la taille du journal.
+
+Un enregistrement est écrit avant son entrée d'index ; à l'ouverture, une
+ligne incomplète (arrêt brutal pendant l'écriture) est coupée et l'index
+reconstruit si besoin.
+
+Usage:
+  log = Transcript('transcript.jsonl')
+  summary, exchanges = log.context()     # exchanges : du plus récent au plus ancien
+  log.add(question, reponse)
+"""
+
+import os
+import json
+import time
+import struct
+import threading
+
+ENTRY = struct.Struct('<Qqq')   # position, dernier résumé, début de conversation
+
+
+class Transcript:
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + '.idx'
+        self.lock = threading.Lock()
+        self.count = 0        # enregistrements
+        self.summary = -1     # numéro du dernier résumé
+        self.start = 0        # premier enregistrement de la conversation
+        self._open()
+
+    def __len__(self):
+        return self.count
+
+    # ----- ajout -----
+
+    def add(self, question, reply):
+        self._append({'t': time.time(), 'q': question, 'a': reply})
+
+    def fold(self, summary, kept):
+        """Résumé glissant : tout sauf les `kept` derniers échanges y est replié."""
+        with self.lock:
+            upto = self.count - 1
+            for n in range(self.count - 1, self.start - 1, -1):
+                if kept <= 0:
+                    break
+                if 'q' in self._read(n):
+                    kept -= 1
+                    upto = n - 1
+        self._append({'t': time.time(), 'summary': summary, 'upto': upto}, summary=True)
+
+    def reset(self):
+        """Nouvelle conversation : la reprise s'arrêtera ici."""
+        self._append({'t': time.time(), 'reset': True}, reset=True)
+
+    # ----- lecture -----
+
+    def context(self):
+        """Résumé et échanges (question, réponse) de la conversation en cours,
+        postérieurs au résumé, du plus récent au plus ancien (générateur)."""
+        with self.lock:
+            summary, floor = '', self.start
+            if self.summary >= self.start:
+                rec = self._read(self.summary)
+                summary, floor = rec['summary'], max(floor, rec['upto'] + 1)
+        return summary, self.exchanges(floor)
+
+    def exchanges(self, floor=0):
+        """(question, réponse) du plus récent au plus ancien, jusqu'au
+        numéro floor, toutes conversations confondues."""
+        with self.lock:
+            last = self.count - 1
+        for n in range(last, floor - 1, -1):
+            with self.lock:
+                rec = self._read(n)
+            if 'q' in rec:
+                yield rec['q'], rec['a']
+
+    # ----- interne -----
+
+    def _append(self, record, summary=False, reset=False):
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with self.lock:
+            try:
+                offset = self.log.seek(0, os.SEEK_END)
+                self.log.write(line)
+                self.log.flush()
+                n = self.count
+                if summary:
+                    self.summary = n
+                if reset:
+                    self.start = n + 1
+                self.index.write(ENTRY.pack(offset, self.summary, self.start))
+                self.index.flush()
+                self.count += 1
+            except OSError as e:
+                print(f"[TRANSCRIPT] ecriture impossible: {e}", flush=True)
+
+    def _offset(self, n):
+        self.index.seek(n * ENTRY.size)
+        return ENTRY.unpack(self.index.read(ENTRY.size))[0]
+
+    def _read(self, n):
+        self.log.seek(self._offset(n))
+        return json.loads(self.log.readline())
+
+    def _open(self):
+        self.log = open(self.path, 'a+b')
+        self.index = open(self.index_path, 'a+b')
+        size = self.log.seek(0, os.SEEK_END)
+        indexed = self.index.seek(0, os.SEEK_END)
+        count = indexed // ENTRY.size
+        if count and indexed == count * ENTRY.size:
+            self.index.seek((count - 1) * ENTRY.size)
+            offset, self.summary, self.start = ENTRY.unpack(self.index.read(ENTRY.size))
+            self.log.seek(offset)
+            end = offset + len(self.log.readline())
+            if offset < size and end == size:
+                self.count = count
+                return
+        if size or indexed:
+            self._rebuild()
+
+    def _rebuild(self):
+        """Index absent ou en retard sur le journal : relecture complète."""
+        self.log.seek(0)
+        entries, good, n = [], 0, 0
+        self.summary, self.start = -1, 0
+        for line in self.log:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                break   # ligne coupée : fin du journal utilisable
+            if not line.endswith(b'\n'):
+                break
+            if 'summary' in rec:
+                self.summary = n
+            if rec.get('reset'):
+                self.start = n + 1
+            entries.append(ENTRY.pack(good, self.summary, self.start))
+            good += len(line)
+            n += 1
+        self.log.truncate(good)
+        self.index.truncate(0)
+        self.index.write(b''.join(entries))
+        self.index.flush()
+        self.log.flush()
+        self.count = n
+        print(f"[TRANSCRIPT] index reconstruit ({n} enregistrements)", flush=True)
+
+    def close(self):
+        with self.lock:
+            self.log.close()
+            self.index.close()